@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Benchmark: gfx:render_svg served from a pre-rasterized icon atlas.
+
+Builds an atlas of Lucide icons at button sizes with
+``invariant_gfx.icon_atlas.build_icon_atlas``, then renders every icon at
+every size two ways:
+- ``render_svg`` with no atlas loaded, which parses and rasterizes with cairosvg
+- ``render_svg`` after ``load_icon_atlas``, which serves the memory-mapped
+  raster
+
+Every raster is checked to be byte-identical between the two paths before the
+timings are reported.
+
+Usage:
+    uv run python benchmarks/icon_atlas.py
+    uv run python benchmarks/icon_atlas.py --icons 200 --sizes 72 144 --repeat 20
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from justmyresource import get_default_registry
+
+from invariant_gfx import icon_atlas
+from invariant_gfx.icon_atlas import build_icon_atlas, load_icon_atlas
+from invariant_gfx.ops.render_svg import render_svg
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark icon atlas hits against rendering with cairosvg"
+    )
+    parser.add_argument(
+        "--icons",
+        type=int,
+        default=50,
+        help="Number of Lucide icons in the atlas (default: 50)",
+    )
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=int,
+        default=[48, 72, 96, 144],
+        help="Icon sizes in pixels (default: 48 72 96 144)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Times each icon is rendered per size (default: 5)",
+    )
+    args = parser.parse_args()
+
+    registry = get_default_registry()
+    names = [
+        f"lucide:{info.name}"
+        for info in registry.list_resources(pack="lucide")
+        if info.content_type == "image/svg+xml"
+    ][: args.icons]
+    svgs = [registry.get_resource(name).data for name in names]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        atlas_path = Path(tmp) / "icons.atlas"
+        start = time.perf_counter()
+        rasters = build_icon_atlas(atlas_path, args.sizes, icons=names)
+        build_time = time.perf_counter() - start
+        print(
+            f"Built {rasters} rasters in {build_time:.2f}s "
+            f"({atlas_path.stat().st_size / 1024:.0f} KiB)\n"
+        )
+
+        expected = {
+            (i, size): render_svg(svg, size, size).image.tobytes()
+            for i, svg in enumerate(svgs)
+            for size in args.sizes
+        }
+        load_icon_atlas(atlas_path)
+        for (i, size), pixels in expected.items():
+            if render_svg(svgs[i], size, size).image.tobytes() != pixels:
+                raise SystemExit(f"{names[i]} at {size}px: output differs")
+
+        print(
+            f"{'size':>5} {'renders':>8} {'cairosvg':>11} {'atlas':>11} {'speedup':>9}"
+        )
+        entries = dict(icon_atlas._ATLAS_ENTRIES)
+        for size in args.sizes:
+            renders = len(svgs) * args.repeat
+
+            icon_atlas._ATLAS_ENTRIES.clear()
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                for svg in svgs:
+                    render_svg(svg, size, size)
+            render_time = time.perf_counter() - start
+
+            icon_atlas._ATLAS_ENTRIES.update(entries)
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                for svg in svgs:
+                    render_svg(svg, size, size)
+            atlas_time = time.perf_counter() - start
+
+            print(
+                f"{size:>5} {renders:>8} "
+                f"{render_time * 1000:>9.1f}ms {atlas_time * 1000:>9.1f}ms "
+                f"{render_time / atlas_time:>8.2f}x"
+            )
+
+        icon_atlas._ATLAS_ENTRIES.clear()
+
+    print("\n✓ All atlas rasters byte-identical to render_svg")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Benchmark: multiline text measurement, scratch ImageDraw vs font metrics.
+
+Measures a set of wrapped multiline strings (the kind gfx:packed_text probes at
+every candidate size) two ways, both uncached:
+- ``ImageDraw.textbbox`` on a throwaway 1x1 image, the previous path
+- ``invariant_gfx.ops.render_text._multiline_bbox``, which computes the same
+  box from per-line font metrics without allocating an image (only the
+  line-spacing probe is cached; each line is laid out every time)
+
+Every string is checked to give an identical box before the timings are
+reported.
+
+Usage:
+    uv run python benchmarks/multiline_measure.py
+    uv run python benchmarks/multiline_measure.py --font "DejaVu Sans" --sizes 12 36 --strings 5000
+"""
+
+import argparse
+import random
+import time
+
+from PIL import Image, ImageDraw
+
+from invariant_gfx.ops.render_text import (
+    _cached_text_bbox,
+    _load_font,
+    _multiline_bbox,
+)
+
+WORDS = (
+    "momentary lapse of reason wish you were here comfortably numb "
+    "breathe time money us and them brain damage eclipse echoes"
+).split()
+
+
+def reference_bbox(text: str, pil_font) -> tuple[int, int, int, int]:
+    """The scratch-image measurement gfx:render_text used before."""
+    temp_image = Image.new("RGBA", (1, 1), (0, 0, 0, 0))
+    temp_draw = ImageDraw.Draw(temp_image)
+    return temp_draw.textbbox((0, 0), text, font=pil_font)
+
+
+def wrapped_strings(count: int, seed: int) -> list[str]:
+    """Deterministic 2-4 line strings of song-title words."""
+    rng = random.Random(seed)
+    strings = []
+    for _ in range(count):
+        lines = [
+            " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 3)))
+            for _ in range(rng.randint(2, 4))
+        ]
+        strings.append("\n".join(lines))
+    return strings
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark metric-based multiline measurement against ImageDraw"
+    )
+    parser.add_argument(
+        "--font", default="Inter", help="Font family to measure with (default: Inter)"
+    )
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=int,
+        default=[12, 24, 48],
+        help="Font sizes in points (default: 12 24 48)",
+    )
+    parser.add_argument(
+        "--strings",
+        type=int,
+        default=3000,
+        help="Number of strings measured per size (default: 3000)",
+    )
+    args = parser.parse_args()
+
+    strings = wrapped_strings(args.strings, seed=1)
+
+    print(
+        f"{'size':>5} {'strings':>8} {'ImageDraw':>11} {'metrics':>11} {'speedup':>9}"
+    )
+    for size in args.sizes:
+        pil_font = _load_font(args.font, size)
+
+        for text in strings:
+            if _multiline_bbox(text, pil_font) != reference_bbox(text, pil_font):
+                raise SystemExit(f"{text!r} at size {size}: bbox differs")
+
+        start = time.perf_counter()
+        for text in strings:
+            reference_bbox(text, pil_font)
+        reference_time = time.perf_counter() - start
+
+        _cached_text_bbox.cache_clear()
+        start = time.perf_counter()
+        for text in strings:
+            _multiline_bbox(text, pil_font)
+        metrics_time = time.perf_counter() - start
+
+        print(
+            f"{size:>5} {len(strings):>8} "
+            f"{reference_time * 1000:>9.1f}ms {metrics_time * 1000:>9.1f}ms "
+            f"{reference_time / metrics_time:>8.2f}x"
+        )
+
+    print("\n✓ All bounding boxes identical to ImageDraw.textbbox")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""Benchmark: gfx:render_shape against gfx:render_svg of a shapes builder.
+
+Renders each shape primitive (filled and stroked) two ways:
+- an ``invariant_gfx.shapes`` builder followed by ``render_svg``, which
+  formats the SVG, parses it with cairosvg and rasterizes it with cairo
+- ``render_shape`` with the same geometry, which rasterizes the outline's
+  exact pixel coverage directly into a Pillow image
+
+The SVG parse cache is cleared before every SVG render, since a graph only
+renders a shape on a cache miss, when its geometry is new. Every primitive is
+checked to match the SVG path within the bounds the parity tests use, on
+premultiplied pixels, before the timings are reported.
+
+Usage:
+    uv run python benchmarks/render_shape.py
+    uv run python benchmarks/render_shape.py --sizes 72 144 --repeat 200
+"""
+
+import argparse
+import time
+
+from PIL import ImageChops, ImageFilter, ImageStat
+
+from invariant_gfx import shapes
+from invariant_gfx.ops.render_shape import render_shape
+from invariant_gfx.ops.render_svg import _parsed_tree, render_svg
+
+FILL = (40, 120, 220, 255)
+STROKE = (20, 20, 20, 255)
+STROKE_WIDTH = 2
+# Premultiplied levels, as in tests/test_op_render_shape.py.
+MAX_DIFF = {"straight": 16, "curved": 24}
+MAX_LOCAL_DIFF = 8
+MAX_MEAN_DIFF = 0.2
+CURVED_SHAPES = {"rounded_rect", "circle", "ellipse", "arc"}
+
+# name: (shape, geometry, builder)
+PRIMITIVES = {
+    "rect": (
+        "rect",
+        {"width": 64, "height": 40, "x": 4, "y": 4},
+        lambda: shapes.rect(
+            64, 40, x=4, y=4, fill=FILL, stroke=STROKE, stroke_width=STROKE_WIDTH
+        ),
+    ),
+    "rounded_rect": (
+        "rounded_rect",
+        {"width": 64, "height": 40, "rx": 10},
+        lambda: shapes.rounded_rect(
+            64, 40, 10, fill=FILL, stroke=STROKE, stroke_width=STROKE_WIDTH
+        ),
+    ),
+    "circle": (
+        "circle",
+        {"cx": 32, "cy": 32, "r": 30},
+        lambda: shapes.circle(
+            32, 32, 30, fill=FILL, stroke=STROKE, stroke_width=STROKE_WIDTH
+        ),
+    ),
+    "ellipse": (
+        "ellipse",
+        {"cx": 32, "cy": 20, "rx": 32, "ry": 20},
+        lambda: shapes.ellipse(
+            32, 20, 32, 20, fill=FILL, stroke=STROKE, stroke_width=STROKE_WIDTH
+        ),
+    ),
+    "line": (
+        "line",
+        {"x1": 4, "y1": 60, "x2": 60, "y2": 4},
+        lambda: shapes.line(4, 60, 60, 4, stroke=STROKE, stroke_width=STROKE_WIDTH),
+    ),
+    "polygon": (
+        "polygon",
+        {"points": [[0, 0], [64, 10], [40, 60], [16, 40]]},
+        lambda: shapes.polygon(
+            [(0, 0), (64, 10), (40, 60), (16, 40)],
+            fill=FILL,
+            stroke=STROKE,
+            stroke_width=STROKE_WIDTH,
+        ),
+    ),
+    "arc": (
+        "arc",
+        {"cx": 32, "cy": 32, "r": 30, "start_angle": -90, "end_angle": 180},
+        lambda: shapes.arc(
+            32, 32, 30, -90, 180, fill=FILL, stroke=STROKE, stroke_width=STROKE_WIDTH
+        ),
+    ),
+}
+
+
+def svg_render(builder, size: int):
+    """The builder + gfx:render_svg path, parsing as on a graph cache miss."""
+    _parsed_tree.cache_clear()
+    return render_svg(builder(), size, size).image
+
+
+def native_render(shape: str, geometry: dict, size: int):
+    """The gfx:render_shape path."""
+    fill = None if shape == "line" else FILL
+    return render_shape(
+        shape,
+        (size, size),
+        geometry,
+        fill=fill,
+        stroke=STROKE,
+        stroke_width=STROKE_WIDTH,
+    ).image
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark gfx:render_shape against shapes + gfx:render_svg"
+    )
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=int,
+        default=[48, 96, 256],
+        help="Raster sizes in pixels (default: 48 96 256)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=100,
+        help="Times each primitive is rendered per size (default: 100)",
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'primitive':>13} {'size':>5} {'svg':>10} {'native':>10} "
+        f"{'speedup':>8} {'diff':>6}"
+    )
+    for name, (shape, geometry, builder) in PRIMITIVES.items():
+        for size in args.sizes:
+            expected = svg_render(builder, size)
+            actual = native_render(shape, geometry, size)
+            actual, expected = actual.convert("RGBa"), expected.convert("RGBa")
+            delta = ImageChops.difference(actual, expected)
+            diff = sum(ImageStat.Stat(delta).mean) / 4
+            if diff > MAX_MEAN_DIFF:
+                raise SystemExit(
+                    f"{name} at {size}px: mean difference {diff:.2f} from render_svg"
+                )
+            peak = max(high for _, high in delta.getextrema())
+            bound = MAX_DIFF["curved" if shape in CURVED_SHAPES else "straight"]
+            local = ImageChops.difference(
+                actual.filter(ImageFilter.BoxBlur(1)),
+                expected.filter(ImageFilter.BoxBlur(1)),
+            )
+            local_peak = max(high for _, high in local.getextrema())
+            if peak > bound or local_peak > MAX_LOCAL_DIFF:
+                raise SystemExit(
+                    f"{name} at {size}px: pixel difference {peak} "
+                    f"({local_peak} over 3x3) from render_svg"
+                )
+
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                svg_render(builder, size)
+            svg_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                native_render(shape, geometry, size)
+            native_time = time.perf_counter() - start
+
+            print(
+                f"{name:>13} {size:>5} "
+                f"{svg_time / args.repeat * 1e3:>8.3f}ms "
+                f"{native_time / args.repeat * 1e3:>8.3f}ms "
+                f"{svg_time / native_time:>7.2f}x {diff:>6.3f}"
+            )
+
+    print("\n✓ All primitives within the parity bounds of render_svg")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
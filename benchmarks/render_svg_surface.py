@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Benchmark: gfx:render_svg pixel readback, PNG round trip vs cairo surface.
+
+Renders a set of Lucide icons (the kind a Stream Deck page or dashboard
+rasterizes per key) two ways:
+- ``cairosvg.svg2png`` followed by ``Image.open`` on the PNG bytes, the
+  previous path, which deflates and then inflates every icon
+- ``invariant_gfx.ops.render_svg._render_surface`` and ``_surface_to_image``,
+  which read the cairo ARGB32 surface directly and unpremultiply it
+
+Every icon is checked to be byte-identical between the two paths before the
+timings are reported. The SVG parse and cairo rasterization are shared by both
+paths, so the difference is the PNG encode/decode alone.
+
+Usage:
+    uv run python benchmarks/render_svg_surface.py
+    uv run python benchmarks/render_svg_surface.py --sizes 72 144 --repeat 50
+"""
+
+import argparse
+import time
+from io import BytesIO
+
+import cairosvg
+from justmyresource import get_default_registry
+from PIL import Image
+
+from invariant_gfx.ops.render_svg import _render_surface, _surface_to_image
+
+ICONS = (
+    "thermometer",
+    "sun",
+    "cloud-rain",
+    "wifi",
+    "battery-charging",
+    "volume-2",
+    "play",
+    "pause",
+    "mic",
+    "camera",
+    "bell",
+    "settings",
+)
+
+
+def reference_render(svg_bytes: bytes, size: int) -> Image.Image:
+    """The svg2png round trip gfx:render_svg used before."""
+    png_bytes = cairosvg.svg2png(
+        bytestring=svg_bytes, output_width=size, output_height=size
+    )
+    return Image.open(BytesIO(png_bytes)).convert("RGBA")
+
+
+def surface_render(svg_bytes: bytes, size: int) -> Image.Image:
+    """The direct surface readback gfx:render_svg uses now."""
+    return _surface_to_image(_render_surface(svg_bytes, size, size))
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark direct cairo surface readback against svg2png + decode"
+    )
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=int,
+        default=[48, 96, 256],
+        help="Icon sizes in pixels (default: 48 96 256)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=20,
+        help="Times each icon is rendered per size (default: 20)",
+    )
+    args = parser.parse_args()
+
+    registry = get_default_registry()
+    icons = [registry.get_resource(f"lucide:{name}").data for name in ICONS]
+
+    print(
+        f"{'size':>5} {'renders':>8} {'svg2png':>11} {'surface':>11} {'per icon':>10}"
+    )
+    for size in args.sizes:
+        for name, svg_bytes in zip(ICONS, icons):
+            expected = reference_render(svg_bytes, size)
+            actual = surface_render(svg_bytes, size)
+            if actual.tobytes() != expected.tobytes():
+                raise SystemExit(f"lucide:{name} at {size}px: output differs")
+
+        renders = len(icons) * args.repeat
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for svg_bytes in icons:
+                reference_render(svg_bytes, size)
+        reference_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for svg_bytes in icons:
+                surface_render(svg_bytes, size)
+        surface_time = time.perf_counter() - start
+
+        saved_us = (reference_time - surface_time) / renders * 1e6
+        print(
+            f"{size:>5} {renders:>8} "
+            f"{reference_time * 1000:>9.1f}ms {surface_time * 1000:>9.1f}ms "
+            f"{saved_us:>8.0f}us"
+        )
+
+    print("\n✓ All icons byte-identical to svg2png output")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
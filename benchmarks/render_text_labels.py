@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Benchmark: gfx:render_text on rapidly changing numeric labels.
+
+Renders a stream of clock, percentage and temperature labels (the kind a
+Stream Deck key or dashboard tile redraws every tick) two ways:
+- drawing each string with ``ImageDraw.text``, the pre-atlas path
+- ``invariant_gfx.ops.render_text._render_at_size``, which assembles single
+  lines from the per-font glyph atlas
+
+Every label is checked to be byte-identical between the two paths before the
+timings are reported.
+
+Usage:
+    uv run python benchmarks/render_text_labels.py
+    uv run python benchmarks/render_text_labels.py --font "DejaVu Sans" --sizes 16 48 --labels 5000
+"""
+
+import argparse
+import random
+import time
+
+from PIL import Image, ImageDraw
+
+from invariant_gfx.ops.render_text import _load_font, _render_at_size, _text_bbox
+
+COLOR = (255, 255, 255, 255)
+
+
+def reference_render(text: str, pil_font, color) -> Image.Image:
+    """The ImageDraw-based render gfx:render_text used before the glyph atlas."""
+    bbox = _text_bbox(text, pil_font)
+    width = max(0, bbox[2] - bbox[0]) + 4
+    height = max(0, bbox[3] - bbox[1]) + 4
+    image = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    draw.text((2 - bbox[0], 2 - bbox[1]), text, font=pil_font, fill=color)
+    return image
+
+
+def numeric_labels(count: int, seed: int) -> list[str]:
+    """Deterministic mix of clock, percentage and temperature readouts."""
+    rng = random.Random(seed)
+    labels = []
+    for i in range(count):
+        kind = i % 3
+        if kind == 0:
+            seconds = rng.randrange(24 * 3600)
+            labels.append(
+                f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+            )
+        elif kind == 1:
+            labels.append(f"{rng.uniform(0, 100):.1f}%")
+        else:
+            labels.append(f"{rng.uniform(-30, 45):+.1f}°C")
+    return labels
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark glyph-atlas text rendering against ImageDraw.text"
+    )
+    parser.add_argument(
+        "--font", default="Inter", help="Font family to render with (default: Inter)"
+    )
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=int,
+        default=[14, 32, 72],
+        help="Font sizes in points (default: 14 32 72)",
+    )
+    parser.add_argument(
+        "--labels",
+        type=int,
+        default=3000,
+        help="Number of labels rendered per size (default: 3000)",
+    )
+    args = parser.parse_args()
+
+    labels = numeric_labels(args.labels, seed=1)
+
+    print(f"{'size':>5} {'labels':>7} {'ImageDraw':>11} {'atlas':>11} {'speedup':>9}")
+    for size in args.sizes:
+        pil_font = _load_font(args.font, size)
+
+        for text in labels:
+            expected = reference_render(text, pil_font, COLOR)
+            actual = _render_at_size(text, pil_font, COLOR).image
+            if actual.tobytes() != expected.tobytes():
+                raise SystemExit(f"{text!r} at size {size}: output differs")
+
+        start = time.perf_counter()
+        for text in labels:
+            reference_render(text, pil_font, COLOR)
+        reference_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for text in labels:
+            _render_at_size(text, pil_font, COLOR)
+        atlas_time = time.perf_counter() - start
+
+        print(
+            f"{size:>5} {len(labels):>7} "
+            f"{reference_time * 1000:>9.1f}ms {atlas_time * 1000:>9.1f}ms "
+            f"{reference_time / atlas_time:>8.2f}x"
+        )
+
+    print("\n✓ All labels byte-identical to ImageDraw.text")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
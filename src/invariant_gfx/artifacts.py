@@ -1,6 +1,15 @@
 """Artifact types for Invariant GFX."""
 
 import hashlib
+import importlib
+import mmap
+import os
+import struct
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable
+from functools import lru_cache
 from io import BytesIO
 from pathlib import Path
 from typing import BinaryIO
@@ -8,72 +17,520 @@ from typing import BinaryIO
 from invariant.protocol import ICacheable
 from PIL import Image
 
+# Prefix of the Image/MaskArtifact identity digest. Bump the version whenever the
+# hashed layout changes so digests from different schemes never collide.
+_IMAGE_HASH_VERSION = b"invariant-gfx:image:v2"
+
+# Stream payload formats. "png" writes the canonical PNG; the others write a
+# small header followed by RGBA pixels, either raw or compressed.
+IMAGE_STREAM_FORMATS = ("png", "raw", "lz4", "zstd")
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_PIXEL_MAGIC = b"IGFX"
+_PIXEL_HEADER = struct.Struct(">4sBBII")  # magic, version, codec, width, height
+_PIXEL_HEADER_VERSION = 2  # the header is followed by a 32-byte identity digest
+_PIXEL_DIGEST_SIZE = 32
+_PIXEL_CODECS = {"raw": 0, "lz4": 1, "zstd": 2}
+# Optional module and distribution behind each compressed codec.
+_CODEC_MODULES = {"lz4": ("lz4.frame", "lz4"), "zstd": ("zstandard", "zstandard")}
+
 
 class ImageArtifact(ICacheable):
     """Universal visual primitive passed between nodes.
 
-    Wraps a PIL.Image standardized to RGBA mode. Serialized as canonical PNG.
+    Wraps a PIL.Image standardized to RGBA mode. Identity is hashed over the raw
+    pixels. Serialized as canonical PNG by default; set ``stream_format`` to
+    "raw", "lz4" or "zstd" to trade disk space for faster store reads. Any
+    format is readable regardless of the current setting. The compressed
+    formats need the ``codecs`` extra; without it they are written as "raw".
+
+    Artifacts loaded with ``from_stream`` are lazy: only the header is parsed,
+    so ``width``, ``height`` and (for pixel payloads) the stable hash are known
+    immediately, and pixels are decoded on first access to ``image``.
+
+    An artifact may also be created from a premultiplied "RGBa" image, as the
+    compositing ops do when called with ``premultiplied=True``. The
+    premultiplied pixels are handed to the next compositing op as-is via
+    ``premultiplied_image``; ``image``, hashing and serialization see straight
+    RGBA, converted once on first use.
+
+    The canonical PNG produced by serialization is cached on the artifact.
+    ``png_cache_budget`` bounds those caches process-wide: ``None`` keeps them
+    all, ``0`` releases each encoding as soon as it has been written, and a
+    positive byte count keeps the most recently used encodings within budget.
     """
 
+    stream_format: str = "png"
+    png_cache_budget: int | None = None
+
     def __init__(self, image: Image.Image) -> None:
         """Initialize with a PIL Image.
 
         Args:
-            image: PIL Image to wrap. Will be normalized to RGBA mode.
+            image: PIL Image to wrap. Will be normalized to RGBA mode, except
+                that premultiplied "RGBa" images are kept and unpremultiplied
+                lazily.
+        """
+        self._image: Image.Image | None = None
+        self._premultiplied: Image.Image | None = None
+        self._decode: Callable[[], Image.Image] | None = None
+        if image.mode == "RGBa":
+            self._premultiplied = image
+            self._decode = lambda: image.convert("RGBA")
+        else:
+            # Normalize to RGBA mode
+            if image.mode != "RGBA":
+                image = image.convert("RGBA")
+            self._image = image
+        self._size: tuple[int, int] = image.size
+        self._pending_nbytes = 0
+        self._png_cache: bytes | None = None
+        self._hash_cache: str | None = None
+
+    @classmethod
+    def _deferred(
+        cls,
+        size: tuple[int, int],
+        decode: Callable[[], Image.Image],
+        stable_hash: str | None = None,
+        png_bytes: bytes | None = None,
+        pending_nbytes: int = 0,
+    ) -> "ImageArtifact":
+        """Create an artifact whose pixels are produced by ``decode`` on first use.
+
+        ``pending_nbytes`` is the size of any encoded payload held by ``decode``
+        (and not already kept as ``png_bytes``); it is released once decoded.
         """
-        # Normalize to RGBA mode
+        artifact = cls.__new__(cls)
+        artifact._image = None
+        artifact._premultiplied = None
+        artifact._decode = decode
+        artifact._size = size
+        artifact._pending_nbytes = pending_nbytes
+        artifact._png_cache = png_bytes
+        artifact._hash_cache = stable_hash
+        return artifact
+
+    @property
+    def image(self) -> Image.Image:
+        """The wrapped RGBA PIL image, decoded on first access if loaded lazily."""
+        if self._image is None:
+            image = self._decode()
+            if image.mode != "RGBA":
+                image = image.convert("RGBA")
+            if image.size != self._size:
+                raise ValueError(
+                    f"decoded image is {image.size[0]}x{image.size[1]}, "
+                    f"header promised {self._size[0]}x{self._size[1]}"
+                )
+            self._image = image
+            self._decode = None
+            self._pending_nbytes = 0
+            if self._png_cache is not None:
+                # The source PNG is now an ordinary cached encoding
+                _retain_png(self, self._png_cache)
+        return self._image
+
+    @image.setter
+    def image(self, image: Image.Image) -> None:
         if image.mode != "RGBA":
             image = image.convert("RGBA")
+        self._image = image
+        self._premultiplied = None
+        self._decode = None
+        self._size = image.size
+        self._pending_nbytes = 0
+        _release_png(self)
+        self._hash_cache = None
+
+    @property
+    def premultiplied_image(self) -> Image.Image:
+        """The pixels as a premultiplied "RGBa" PIL image, converted once and kept."""
+        if self._premultiplied is None:
+            self._premultiplied = self.image.convert("RGBa")
+        return self._premultiplied
+
+    @property
+    def is_decoded(self) -> bool:
+        """Whether pixel data has been decoded (always True unless loaded lazily)."""
+        return self._image is not None
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes currently held: decoded pixel buffers plus cached encodings.
+
+        Counts the straight and premultiplied pixel buffers that have been
+        materialized, the canonical PNG cache, and an undecoded stream payload.
+        The figure grows as lazy views are decoded or encoded.
+        """
+        total = self._pending_nbytes
+        if self._image is not None:
+            total += _image_nbytes(self._image)
+        if self._premultiplied is not None:
+            total += _image_nbytes(self._premultiplied)
+        if self._png_cache is not None:
+            total += len(self._png_cache)
+        return total
+
+    @property
+    def width(self) -> int:
+        """Image width in pixels."""
+        return self._size[0]
+
+    @property
+    def height(self) -> int:
+        """Image height in pixels."""
+        return self._size[1]
+
+    def get_stable_hash(self) -> str:
+        """SHA-256 hash of the versioned (mode, width, height, raw RGBA bytes) tuple.
+
+        Hashing never PNG-encodes; the canonical PNG is only produced when the
+        artifact is serialized.
+        """
+        if self._hash_cache is None:
+            self._hash_cache = _hash_pixels(self.image)
+        return self._hash_cache
+
+    def to_stream(self, stream: BinaryIO) -> None:
+        """Serialize as an 8-byte length prefix followed by a ``stream_format`` payload."""
+        if self.stream_format == "png":
+            payload = self._to_canonical_png()
+        elif self.stream_format in _PIXEL_CODECS:
+            payload = self._to_pixel_payload(_writable_codec(self.stream_format))
+        else:
+            raise ValueError(
+                f"stream_format must be one of {IMAGE_STREAM_FORMATS}, "
+                f"got {self.stream_format!r}"
+            )
+        stream.write(len(payload).to_bytes(8, byteorder="big"))
+        stream.write(payload)
+
+    def to_file(self, path: Path | str) -> None:
+        """Write the image artifact as a canonical PNG file."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(self._to_canonical_png())
+
+    def to_raw_file(self, path: Path | str) -> None:
+        """Write a header plus uncompressed RGBA pixels for ``from_raw_file``.
+
+        The file is written beside the target and renamed into place, so
+        processes mapping the same path never see a partially written file.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(self._to_pixel_payload("raw"))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def from_raw_file(cls, path: Path | str) -> "ImageArtifact":
+        """Memory-map a file written by ``to_raw_file`` without copying pixels.
+
+        The image is a read-only view onto the mapped file, so processes that
+        load the same file share it through the page cache. Pillow copies the
+        pixels on the first in-place modification.
+        """
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        codec_id, width, height, stable_hash, offset = _parse_pixel_header(mapped)
+        if codec_id != _PIXEL_CODECS["raw"]:
+            raise ValueError(f"{path} holds compressed pixels and cannot be mapped")
+        _check_pixel_length(len(mapped) - offset, width, height)
+        if width == 0 or height == 0:
+            artifact = cls(Image.new("RGBA", (width, height)))
+        else:
+            view = memoryview(mapped)[offset:]
+            artifact = cls(
+                Image.frombuffer("RGBA", (width, height), view, "raw", "RGBA", 0, 1)
+            )
+        artifact._hash_cache = stable_hash
+        return artifact
+
+    @classmethod
+    def from_stream(cls, stream: BinaryIO) -> "ImageArtifact":
+        """Deserialize lazily from a PNG or pixel payload, detected from its leading bytes.
+
+        Only the header is parsed here. A PNG payload is kept as the canonical
+        PNG cache, so re-serializing it as PNG never decodes the pixels.
+        """
+        length = int.from_bytes(stream.read(8), byteorder="big")
+        payload = stream.read(length)
+        if payload.startswith(_PNG_SIGNATURE):
+            return cls._deferred(
+                _png_size(payload),
+                lambda: Image.open(BytesIO(payload)).convert("RGBA"),
+                png_bytes=payload,
+            )
+        if payload.startswith(_PIXEL_MAGIC):
+            codec_id, width, height, stable_hash, offset = _parse_pixel_header(payload)
+            return cls._deferred(
+                (width, height),
+                lambda: _decode_pixels(payload, codec_id, width, height, offset),
+                stable_hash=stable_hash,
+                pending_nbytes=len(payload),
+            )
+        raise ValueError("ImageArtifact stream payload is neither PNG nor pixel data")
+
+    def _to_canonical_png(self) -> bytes:
+        """Convert to canonical PNG (level 1, no metadata)."""
+        png_bytes = self._png_cache
+        if png_bytes is not None:
+            _touch_png(self)
+            return png_bytes
+
+        buffer = BytesIO()
+        self.image.save(buffer, format="PNG", compress_level=1, optimize=False)
+        png_bytes = buffer.getvalue()
+        _retain_png(self, png_bytes)
+        return png_bytes
+
+    def _to_pixel_payload(self, codec: str) -> bytes:
+        """Encode the header, identity digest and raw or compressed RGBA pixels."""
+        header = _PIXEL_HEADER.pack(
+            _PIXEL_MAGIC,
+            _PIXEL_HEADER_VERSION,
+            _PIXEL_CODECS[codec],
+            self.width,
+            self.height,
+        )
+        digest = bytes.fromhex(self.get_stable_hash())
+        return header + digest + _compress_pixels(codec, self.image.tobytes())
+
+
+class MaskArtifact(ICacheable):
+    """Single-band coverage mask passed between alpha-only ops.
+
+    Wraps a PIL.Image standardized to "L" mode (one byte per pixel), a quarter of
+    the memory of an equivalent RGBA ImageArtifact. Produced by
+    ``gfx:extract_alpha`` with ``as_mask=True`` and accepted natively by the
+    alpha ops, ``gfx:colorize`` and the mask input of ``gfx:mask_alpha``.
+    Identity is hashed over the raw pixels; serialized as canonical PNG.
+    """
+
+    def __init__(self, image: Image.Image) -> None:
+        """Initialize with a PIL Image.
+
+        Args:
+            image: PIL Image to wrap. Will be normalized to "L" mode.
+        """
+        if image.mode != "L":
+            image = image.convert("L")
         self.image = image
-        self._png_cache: bytes | None = None
         self._hash_cache: str | None = None
 
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the single-band pixel buffer."""
+        return _image_nbytes(self.image)
+
     @property
     def width(self) -> int:
-        """Image width in pixels."""
+        """Mask width in pixels."""
         return self.image.width
 
     @property
     def height(self) -> int:
-        """Image height in pixels."""
+        """Mask height in pixels."""
         return self.image.height
 
     def get_stable_hash(self) -> str:
-        """SHA-256 hash of canonical PNG bytes."""
+        """SHA-256 hash of the versioned (mode, width, height, raw bytes) tuple."""
         if self._hash_cache is None:
-            png_bytes = self._to_canonical_png()
-            self._hash_cache = hashlib.sha256(png_bytes).hexdigest()
+            self._hash_cache = _hash_pixels(self.image)
         return self._hash_cache
 
     def to_stream(self, stream: BinaryIO) -> None:
-        """Serialize as canonical PNG."""
+        """Serialize as canonical PNG with an 8-byte length prefix."""
         png_bytes = self._to_canonical_png()
         stream.write(len(png_bytes).to_bytes(8, byteorder="big"))
         stream.write(png_bytes)
 
     def to_file(self, path: Path | str) -> None:
-        """Write the image artifact as a canonical PNG file."""
+        """Write the mask as a canonical grayscale PNG file."""
         path = Path(path)
         path.parent.mkdir(parents=True, exist_ok=True)
         path.write_bytes(self._to_canonical_png())
 
     @classmethod
-    def from_stream(cls, stream: BinaryIO) -> "ImageArtifact":
+    def from_stream(cls, stream: BinaryIO) -> "MaskArtifact":
         """Deserialize from canonical PNG."""
         length = int.from_bytes(stream.read(8), byteorder="big")
         png_bytes = stream.read(length)
-        image = Image.open(BytesIO(png_bytes))
-        return cls(image.convert("RGBA"))
+        return cls(Image.open(BytesIO(png_bytes)).convert("L"))
 
     def _to_canonical_png(self) -> bytes:
         """Convert to canonical PNG (level 1, no metadata)."""
-        if self._png_cache is not None:
-            return self._png_cache
-
         buffer = BytesIO()
         self.image.save(buffer, format="PNG", compress_level=1, optimize=False)
-        self._png_cache = buffer.getvalue()
-        return self._png_cache
+        return buffer.getvalue()
+
+
+# Process-wide LRU of retained canonical PNG encodings, used when
+# ImageArtifact.png_cache_budget is set. Entries hold weak references so the
+# registry never keeps an artifact alive.
+_PNG_CACHE_LOCK = threading.RLock()
+_PNG_CACHE_ENTRIES: OrderedDict[int, tuple[weakref.ref, int]] = OrderedDict()
+_PNG_CACHE_TOTAL = 0
+
+
+def _retain_png(artifact: ImageArtifact, png_bytes: bytes) -> None:
+    """Keep png_bytes as the artifact's PNG cache if the budget allows."""
+    global _PNG_CACHE_TOTAL
+    budget = artifact.png_cache_budget
+    if budget is None:
+        artifact._png_cache = png_bytes
+        return
+    with _PNG_CACHE_LOCK:
+        _release_png(artifact)
+        if len(png_bytes) > budget:
+            return
+        artifact._png_cache = png_bytes
+        key = id(artifact)
+        _PNG_CACHE_ENTRIES[key] = (
+            weakref.ref(artifact, lambda _ref, key=key: _forget_png(key)),
+            len(png_bytes),
+        )
+        _PNG_CACHE_TOTAL += len(png_bytes)
+        while _PNG_CACHE_TOTAL > budget:
+            _, (ref, size) = _PNG_CACHE_ENTRIES.popitem(last=False)
+            _PNG_CACHE_TOTAL -= size
+            evicted = ref()
+            if evicted is not None:
+                evicted._png_cache = None
+
+
+def _touch_png(artifact: ImageArtifact) -> None:
+    """Mark the artifact's PNG cache as most recently used."""
+    with _PNG_CACHE_LOCK:
+        if id(artifact) in _PNG_CACHE_ENTRIES:
+            _PNG_CACHE_ENTRIES.move_to_end(id(artifact))
+
+
+def _release_png(artifact: ImageArtifact) -> None:
+    """Drop the artifact's PNG cache and its budget entry, if any."""
+    artifact._png_cache = None
+    _forget_png(id(artifact))
+
+
+def _forget_png(key: int) -> None:
+    """Remove a budget entry (also the weakref callback for collected artifacts)."""
+    global _PNG_CACHE_TOTAL
+    with _PNG_CACHE_LOCK:
+        entry = _PNG_CACHE_ENTRIES.pop(key, None)
+        if entry is not None:
+            _PNG_CACHE_TOTAL -= entry[1]
+
+
+def _image_nbytes(image: Image.Image) -> int:
+    """Size of an 8-bit-per-band PIL image's pixel buffer."""
+    return image.width * image.height * len(image.getbands())
+
+
+def _hash_pixels(image: Image.Image) -> str:
+    """SHA-256 over the version tag, mode, dimensions and raw pixel bytes."""
+    digest = hashlib.sha256(_IMAGE_HASH_VERSION)
+    digest.update(b"\0" + image.mode.encode("ascii") + b"\0")
+    digest.update(image.width.to_bytes(4, byteorder="big"))
+    digest.update(image.height.to_bytes(4, byteorder="big"))
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+def _compress_pixels(codec: str, data: bytes) -> bytes:
+    """Compress pixel bytes with an optional codec ("raw" is passthrough)."""
+    if codec == "raw":
+        return data
+    if codec == "lz4":
+        return _import_codec(*_CODEC_MODULES["lz4"]).compress(data)
+    return _import_codec(*_CODEC_MODULES["zstd"]).ZstdCompressor().compress(data)
+
+
+def _decompress_pixels(codec_id: int, data: bytes) -> bytes:
+    """Inverse of ``_compress_pixels`` keyed by the header codec id."""
+    if codec_id == _PIXEL_CODECS["raw"]:
+        return data
+    if codec_id == _PIXEL_CODECS["lz4"]:
+        return _import_codec(*_CODEC_MODULES["lz4"]).decompress(data)
+    if codec_id == _PIXEL_CODECS["zstd"]:
+        return (
+            _import_codec(*_CODEC_MODULES["zstd"]).ZstdDecompressor().decompress(data)
+        )
+    raise ValueError(f"unknown ImageArtifact pixel codec id {codec_id}")
+
+
+@lru_cache(maxsize=None)
+def _writable_codec(codec: str) -> str:
+    """Return ``codec``, or "raw" when its optional module is not installed.
+
+    Payloads record their codec in the header, so entries written as "raw"
+    read back the same way once the codec is installed.
+    """
+    if codec in _CODEC_MODULES:
+        try:
+            importlib.import_module(_CODEC_MODULES[codec][0])
+        except ImportError:
+            return "raw"
+    return codec
+
+
+def _import_codec(module: str, package: str):
+    """Import an optional compression module or explain how to install it."""
+    try:
+        return importlib.import_module(module)
+    except ImportError as e:
+        raise ValueError(
+            f"ImageArtifact codec requires the optional '{package}' package "
+            "(install invariant-gfx[codecs])"
+        ) from e
+
+
+def _parse_pixel_header(
+    payload: bytes | mmap.mmap,
+) -> tuple[int, int, int, str, int]:
+    """Validate a pixel payload header.
+
+    Returns:
+        ``(codec_id, width, height, stable_hash, pixel_offset)``.
+    """
+    if len(payload) < _PIXEL_HEADER.size:
+        raise ValueError("ImageArtifact pixel payload is truncated")
+    magic, version, codec_id, width, height = _PIXEL_HEADER.unpack_from(payload)
+    if magic != _PIXEL_MAGIC:
+        raise ValueError("ImageArtifact pixel payload has no IGFX header")
+    if version != _PIXEL_HEADER_VERSION:
+        raise ValueError(f"unsupported ImageArtifact pixel payload version {version}")
+    offset = _PIXEL_HEADER.size + _PIXEL_DIGEST_SIZE
+    if len(payload) < offset:
+        raise ValueError("ImageArtifact pixel payload is truncated")
+    stable_hash = bytes(payload[_PIXEL_HEADER.size : offset]).hex()
+    return codec_id, width, height, stable_hash, offset
+
+
+def _check_pixel_length(length: int, width: int, height: int) -> None:
+    """Ensure a decoded pixel buffer matches the header dimensions."""
+    if length != width * height * 4:
+        raise ValueError(
+            f"ImageArtifact pixel payload has {length} bytes, "
+            f"expected {width * height * 4} for {width}x{height} RGBA"
+        )
+
+
+def _decode_pixels(
+    payload: bytes, codec_id: int, width: int, height: int, offset: int
+) -> Image.Image:
+    """Decode the pixels of a payload written by ``ImageArtifact._to_pixel_payload``."""
+    data = _decompress_pixels(codec_id, memoryview(payload)[offset:])
+    _check_pixel_length(len(data), width, height)
+    return Image.frombytes("RGBA", (width, height), data)
+
+
+def _png_size(payload: bytes) -> tuple[int, int]:
+    """Read width and height from a PNG's IHDR chunk without decoding pixels."""
+    if len(payload) < 24 or payload[12:16] != b"IHDR":
+        raise ValueError("ImageArtifact PNG payload has no IHDR chunk")
+    width, height = struct.unpack_from(">II", payload, 16)
+    return width, height
 
 
 class BlobArtifact(ICacheable):
@@ -92,6 +549,11 @@ class BlobArtifact(ICacheable):
         self.data = data
         self.content_type = content_type
 
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the payload."""
+        return len(self.data)
+
     def get_stable_hash(self) -> str:
         """SHA-256 hash of raw bytes."""
         return hashlib.sha256(self.data).hexdigest()
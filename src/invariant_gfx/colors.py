@@ -0,0 +1,25 @@
+"""Color helpers shared by the rendering ops and the icon atlas."""
+
+from PIL import Image
+
+
+def validate_color(color: tuple[int, int, int, int]) -> None:
+    """Validate an RGBA color param.
+
+    Raises:
+        ValueError: If color is not a tuple/list of 4 ints in range 0-255.
+    """
+    if not isinstance(color, (tuple, list)) or len(color) != 4:
+        raise ValueError(
+            f"color must be a tuple/list of 4 RGBA values, got {type(color)}"
+        )
+
+    r, g, b, a = color
+    if not all(isinstance(c, int) and 0 <= c <= 255 for c in (r, g, b, a)):
+        raise ValueError(f"color values must be int in range 0-255, got {color}")
+
+
+def colored_alpha(alpha: Image.Image, color: tuple[int, int, int]) -> Image.Image:
+    """Straight RGBA image of one color, fully transparent pixels all zero."""
+    channels = [alpha.point([0] + [value] * 255) for value in color]
+    return Image.merge("RGBA", (*channels, alpha))
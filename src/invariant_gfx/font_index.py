@@ -0,0 +1,174 @@
+"""Persistent font-resolution index.
+
+Resolving a font family through JustMyType scans and parses every font file
+the installed packs and system directories provide, once per process. A worker
+that saves the resolutions it made with ``save_font_index`` lets later workers
+skip that scan: ``load_font_index`` seeds them before the first render, and
+``gfx:render_text`` consults the index before falling back to the registry.
+
+The index records a fingerprint of the font environment (JustMyType and font
+pack versions, the discovery blocklist, and the modification times of the
+system font directories) and is ignored when the current environment differs.
+"""
+
+import json
+import os
+import threading
+from importlib.metadata import PackageNotFoundError, entry_points, version
+from pathlib import Path
+from typing import Any
+
+from justmytype.packs.factory import create_system_font_pack
+
+_INDEX_FORMAT = 1
+
+_FONT_PATHS_LOCK = threading.Lock()
+_FONT_PATHS: dict[tuple[str, int | None, str], str] = {}
+
+
+def indexed_font_path(font: str, weight: int | None, style: str) -> str | None:
+    """Path recorded for a font spec, if the index has one."""
+    with _FONT_PATHS_LOCK:
+        return _FONT_PATHS.get((font, weight, style))
+
+
+def record_font_path(font: str, weight: int | None, style: str, path: str) -> None:
+    """Remember a registry resolution so save_font_index can persist it."""
+    with _FONT_PATHS_LOCK:
+        _FONT_PATHS[(font, weight, style)] = path
+
+
+def load_font_index(path: Path | str) -> int:
+    """Seed font resolution from an index written by ``save_font_index``.
+
+    Call once at worker startup, before the first render. A missing, unreadable,
+    malformed or stale index (written under a different font environment) is
+    ignored, as are entries whose font file no longer exists.
+
+    Args:
+        path: Index file path.
+
+    Returns:
+        Number of font specs loaded (0 if the index was not used).
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return 0
+
+    if (
+        not isinstance(index, dict)
+        or index.get("format") != _INDEX_FORMAT
+        or not isinstance(index.get("fonts"), list)
+        or not all(_is_index_entry(entry) for entry in index["fonts"])
+        or index.get("fingerprint") != _environment_fingerprint()
+    ):
+        return 0
+
+    loaded = {}
+    for font, weight, style, font_path in index["fonts"]:
+        if os.path.isfile(font_path):
+            loaded[(font, weight, style)] = font_path
+
+    with _FONT_PATHS_LOCK:
+        _FONT_PATHS.update(loaded)
+    return len(loaded)
+
+
+def _is_index_entry(entry: Any) -> bool:
+    """Whether an index entry is a well-typed [font, weight, style, path]."""
+    if not isinstance(entry, list) or len(entry) != 4:
+        return False
+    font, weight, style, font_path = entry
+    return (
+        isinstance(font, str)
+        and (
+            weight is None or (isinstance(weight, int) and not isinstance(weight, bool))
+        )
+        and isinstance(style, str)
+        and isinstance(font_path, str)
+    )
+
+
+def save_font_index(path: Path | str) -> int:
+    """Write the font resolutions known to this process to an index file.
+
+    Missing parent directories are created. The file is replaced
+    atomically, so concurrent workers may share a path.
+
+    Args:
+        path: Index file path.
+
+    Returns:
+        Number of font specs written.
+    """
+    with _FONT_PATHS_LOCK:
+        fonts = [
+            [font, weight, style, font_path]
+            for (font, weight, style), font_path in _FONT_PATHS.items()
+        ]
+    index = {
+        "format": _INDEX_FORMAT,
+        "fingerprint": _environment_fingerprint(),
+        "fonts": fonts,
+    }
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Unique per thread as well as per process, so concurrent saves never
+    # write the same temporary file.
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return len(fonts)
+
+
+def _environment_fingerprint() -> dict[str, Any]:
+    """Describe the installed fonts cheaply enough to check at every startup."""
+    try:
+        justmytype_version = version("justmytype")
+    except PackageNotFoundError:
+        justmytype_version = None
+
+    packs = sorted(
+        [
+            ep.name,
+            ep.value,
+            ep.dist.version if ep.dist is not None else None,
+        ]
+        for ep in entry_points(group="justmytype.packs")
+    )
+
+    return {
+        "justmytype": justmytype_version,
+        "packs": packs,
+        "blocklist": os.environ.get("FONT_DISCOVERY_BLOCKLIST", ""),
+        "system_dirs": _system_font_dir_mtimes(),
+    }
+
+
+def _system_font_dir_mtimes() -> list[list[Any]]:
+    """Latest modification time under each system font directory.
+
+    Directory mtimes change when fonts are added or removed, so only
+    directories are visited; no font file is opened.
+    """
+    try:
+        dirs = create_system_font_pack().get_font_directories()
+    except NotImplementedError:
+        return []
+
+    result = []
+    for dir_path in dirs:
+        latest = None
+        for root, _, _ in os.walk(dir_path):
+            mtime = os.stat(root).st_mtime_ns
+            latest = mtime if latest is None else max(latest, mtime)
+        result.append([str(dir_path), latest])
+    return result
@@ -0,0 +1,244 @@
+"""Pre-rasterized icon atlas.
+
+``gfx:resolve_resource`` followed by ``gfx:render_svg`` parses and rasterizes
+an icon with cairosvg on every cache miss, although a deployment usually draws
+a stable set of icons at a few sizes. ``build_icon_atlas`` renders such a set
+once into a single file, and ``load_icon_atlas`` memory-maps it in each worker
+so ``gfx:render_svg`` and ``gfx:render_svg_sizes`` serve matching requests
+from the mapped pixels without invoking cairosvg.
+
+Entries are keyed by the SHA-256 of the SVG bytes and the raster size, so a
+request only hits when it would have rendered exactly that icon; icons changed
+by a pack upgrade simply miss and are rendered as before.
+
+File layout: an 8-byte magic and the little-endian uint64 offset and uint32
+length of a JSON index, then the entries' pixels, then the index. Single-color
+rasters (most icon packs draw in one color) are stored as their 8-bit alpha
+plus the color, a quarter of the size of straight-alpha RGBA, which is used
+for every other raster.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+from collections.abc import Iterable
+from decimal import Decimal
+from pathlib import Path
+
+from justmyresource import get_default_registry
+from PIL import Image
+
+from invariant_gfx.colors import colored_alpha
+
+_MAGIC = b"IGFXATL1"
+_HEADER = struct.Struct("<8sQI")
+
+_ATLAS_LOCK = threading.Lock()
+_ATLAS_ENTRIES: dict[
+    tuple[bytes, int, int], tuple[memoryview, tuple[int, int, int] | None]
+] = {}
+
+
+def atlas_image(svg_bytes: bytes, size: tuple[int, int]) -> Image.Image | None:
+    """Look up the raster of an SVG at a size in the loaded atlases.
+
+    Args:
+        svg_bytes: SVG content, as passed to ``gfx:render_svg``.
+        size: (width, height) in pixels.
+
+    Returns:
+        The RGBA raster ``gfx:render_svg`` would produce, or None if no loaded
+        atlas has it.
+    """
+    width, height = size
+    if not _ATLAS_ENTRIES:
+        return None
+    key = (hashlib.sha256(svg_bytes).digest(), width, height)
+    with _ATLAS_LOCK:
+        entry = _ATLAS_ENTRIES.get(key)
+    if entry is None:
+        return None
+
+    pixels, color = entry
+    if color is None:
+        # A read-only view of the mapped file; Pillow copies it before any
+        # in-place modification.
+        return Image.frombuffer("RGBA", (width, height), pixels, "raw", "RGBA", 0, 1)
+    return colored_alpha(
+        Image.frombuffer("L", (width, height), pixels, "raw", "L", 0, 1), color
+    )
+
+
+def _single_color(image: Image.Image) -> tuple[int, int, int] | None:
+    """The one RGB color of an image's visible pixels, or None if it has several."""
+    alpha = image.getchannel("A")
+    visible = alpha.point([0] + [255] * 255)
+    color = []
+    for band in image.split()[:3]:
+        levels = [level for level, count in enumerate(band.histogram(visible)) if count]
+        if len(levels) > 1:
+            return None
+        color.append(levels[0] if levels else 0)
+    color = tuple(color)
+
+    # Only use the compact form when it reproduces the raster exactly.
+    if colored_alpha(alpha, color).tobytes() != image.tobytes():
+        return None
+    return color
+
+
+def build_icon_atlas(
+    path: Path | str,
+    sizes: list[Decimal | int | str | list[Decimal | int | str]],
+    pack: str | None = None,
+    icons: Iterable[str] | None = None,
+) -> int:
+    """Pre-rasterize icons into an atlas file for ``load_icon_atlas``.
+
+    Exactly one of ``pack`` or ``icons`` must be provided. Each icon is
+    rendered with ``gfx:render_svg`` at every size, so atlas hits are
+    pixel-identical to rendering. The file is replaced atomically, so it can
+    be rebuilt while workers have the previous version mapped.
+
+    Args:
+        path: Atlas file path.
+        sizes: Sizes as for ``gfx:render_svg_sizes``: each entry a single
+            size (square) or a [width, height] pair.
+        pack: JustMyResource pack prefix (e.g. "lucide"); every SVG in the
+            pack is included.
+        icons: Resource names (e.g. "lucide:thermometer") to include.
+
+    Returns:
+        Number of rasters written.
+
+    Raises:
+        ValueError: If both or neither of pack and icons are provided, a
+            resource cannot be found, or a size is invalid.
+    """
+    from invariant_gfx.ops.render_svg import render_svg
+    from invariant_gfx.ops.render_svg_sizes import _to_dimensions
+
+    if (pack is None) == (icons is None):
+        raise ValueError("Exactly one of pack or icons must be provided")
+    if not isinstance(sizes, (list, tuple)) or not sizes:
+        raise ValueError(f"sizes must be a non-empty list, got {sizes!r}")
+    dimensions = list(
+        dict.fromkeys(
+            _to_dimensions(size, f"sizes[{i}]") for i, size in enumerate(sizes)
+        )
+    )
+
+    registry = get_default_registry()
+    if pack is not None:
+        icons = [
+            f"{pack}:{info.name}"
+            for info in registry.list_resources(pack=pack)
+            if info.content_type == "image/svg+xml"
+        ]
+
+    svgs = {}
+    for name in icons:
+        try:
+            resource = registry.get_resource(name)
+        except Exception as e:
+            raise ValueError(f"failed to find resource '{name}': {e}") from e
+        svgs.setdefault(hashlib.sha256(resource.data).digest(), resource.data)
+
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    entries = []
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, 0, 0))
+        for digest, svg_bytes in svgs.items():
+            for width, height in dimensions:
+                image = render_svg(svg_bytes, width, height).image
+                color = _single_color(image)
+                pixels = (
+                    image.tobytes()
+                    if color is None
+                    else image.getchannel("A").tobytes()
+                )
+                entries.append([digest.hex(), width, height, f.tell(), color])
+                f.write(pixels)
+
+        index = json.dumps({"entries": entries}).encode("utf-8")
+        index_offset = f.tell()
+        f.write(index)
+        f.seek(0)
+        f.write(_HEADER.pack(_MAGIC, index_offset, len(index)))
+    os.replace(tmp_path, path)
+    return len(entries)
+
+
+def load_icon_atlas(path: Path | str) -> int:
+    """Memory-map an atlas written by ``build_icon_atlas`` for render lookups.
+
+    Call once at worker startup. Several atlases may be loaded; a missing,
+    unreadable or truncated file is ignored. Pixels are paged in from the file
+    on first use and shared between processes mapping the same atlas.
+
+    Args:
+        path: Atlas file path.
+
+    Returns:
+        Number of rasters loaded (0 if the atlas was not used).
+
+    Raises:
+        ValueError: If the atlas index lists a malformed entry, or one whose
+            pixels lie outside the file's pixel data.
+    """
+    try:
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return 0
+
+    view = memoryview(mapped)
+    try:
+        magic, index_offset, index_length = _HEADER.unpack_from(view)
+        if magic != _MAGIC or index_offset + index_length > len(view):
+            return 0
+        index = json.loads(bytes(view[index_offset : index_offset + index_length]))
+    except (struct.error, ValueError):
+        return 0
+
+    entries = index.get("entries") if isinstance(index, dict) else None
+    if not isinstance(entries, list):
+        raise ValueError(f"icon atlas {path} has no entry list")
+    loaded = {}
+    for entry in entries:
+        try:
+            digest, width, height, offset, color = entry
+            key = (bytes.fromhex(digest), width, height)
+        except (TypeError, ValueError) as e:
+            raise ValueError(
+                f"icon atlas {path} has a malformed entry {entry!r}"
+            ) from e
+        if (
+            not all(isinstance(value, int) for value in (width, height, offset))
+            or width <= 0
+            or height <= 0
+        ):
+            raise ValueError(f"icon atlas {path} has a malformed entry {entry!r}")
+        if color is not None and (
+            not isinstance(color, list)
+            or len(color) != 3
+            or not all(isinstance(level, int) and 0 <= level <= 255 for level in color)
+        ):
+            raise ValueError(f"icon atlas {path} has a malformed entry {entry!r}")
+
+        # Pixels lie between the header and the index.
+        end = offset + width * height * (4 if color is None else 1)
+        if offset < _HEADER.size or end > index_offset:
+            raise ValueError(
+                f"icon atlas {path} entry {entry!r} spans bytes {offset}-{end}, "
+                f"outside its pixel data ({_HEADER.size}-{index_offset})"
+            )
+        loaded[key] = (view[offset:end], None if color is None else tuple(color))
+
+    with _ATLAS_LOCK:
+        _ATLAS_ENTRIES.update(loaded)
+    return len(loaded)
@@ -22,9 +22,13 @@ from invariant_gfx.ops.layout import layout
 from invariant_gfx.ops.mask_alpha import mask_alpha
 from invariant_gfx.ops.opacity import opacity
 from invariant_gfx.ops.packed_text import packed_text
+from invariant_gfx.ops.packed_text_layout import packed_text_layout
 from invariant_gfx.ops.pad import pad
+from invariant_gfx.ops.render_shape import render_shape
 from invariant_gfx.ops.render_svg import render_svg
+from invariant_gfx.ops.render_svg_sizes import render_svg_sizes
 from invariant_gfx.ops.render_text import render_text
+from invariant_gfx.ops.render_text_batch import render_text_batch
 from invariant_gfx.ops.resize import resize
 from invariant_gfx.ops.resolve_color import resolve_color
 from invariant_gfx.ops.resolve_resource import resolve_resource
@@ -83,9 +87,13 @@ _RAW_OPS = {
     "mask_alpha": mask_alpha,
     "opacity": opacity,
     "packed_text": packed_text,
+    "packed_text_layout": packed_text_layout,
     "pad": pad,
+    "render_shape": render_shape,
     "render_svg": render_svg,
+    "render_svg_sizes": render_svg_sizes,
     "render_text": render_text,
+    "render_text_batch": render_text_batch,
     "resolve_color": resolve_color,
     "resize": resize,
     "resolve_resource": resolve_resource,
@@ -118,9 +126,13 @@ OP_TRAITS = {
     "mask_alpha": _IMAGE_OP_TRAITS,
     "opacity": _IMAGE_OP_TRAITS,
     "packed_text": _TEXT_OP_TRAITS,
+    "packed_text_layout": _TEXT_OP_TRAITS,
     "pad": _IMAGE_OP_TRAITS,
+    "render_shape": _IMAGE_OP_TRAITS,
     "render_svg": _IMAGE_OP_TRAITS,
+    "render_svg_sizes": _IMAGE_OP_TRAITS,
     "render_text": _TEXT_OP_TRAITS,
+    "render_text_batch": _TEXT_OP_TRAITS,
     "resize": _IMAGE_OP_TRAITS,
     "resolve_color": _LOW_COST_OP_TRAITS,
     "resolve_resource": _RESOURCE_OP_TRAITS,
@@ -169,9 +181,13 @@ __all__ = [
     "mask_alpha",
     "opacity",
     "packed_text",
+    "packed_text_layout",
     "pad",
+    "render_shape",
     "render_svg",
+    "render_svg_sizes",
     "render_text",
+    "render_text_batch",
     "resolve_color",
     "resize",
     "resolve_resource",
@@ -3,27 +3,30 @@
 from PIL import Image
 
 from invariant.protocol import ICacheable
-from invariant_gfx.artifacts import ImageArtifact
+from invariant_gfx.artifacts import ImageArtifact, MaskArtifact
 
 
 def colorize(
-    image: ImageArtifact,
+    image: ImageArtifact | MaskArtifact,
     color: tuple[int, int, int, int],
 ) -> ICacheable:
     """Fill image with solid color; output alpha = source alpha × color alpha (per pixel).
 
     Args:
-        image: ImageArtifact (source — typically an alpha-only mask).
+        image: ImageArtifact (source — typically an alpha-only mask) or
+            MaskArtifact (used directly as the source alpha).
         color: Tuple[int, int, int, int] (RGBA, 0-255 per channel).
 
     Returns:
         ImageArtifact with RGB set to color and alpha = (source_alpha * color_alpha) / 255.
 
     Raises:
-        ValueError: If image is not an ImageArtifact or color is invalid.
+        ValueError: If image is not an ImageArtifact or MaskArtifact, or color is invalid.
     """
-    if not isinstance(image, ImageArtifact):
-        raise ValueError(f"image must be ImageArtifact, got {type(image)}")
+    if not isinstance(image, (ImageArtifact, MaskArtifact)):
+        raise ValueError(
+            f"image must be ImageArtifact or MaskArtifact, got {type(image)}"
+        )
     if not isinstance(color, (tuple, list)) or len(color) != 4:
         raise ValueError(
             f"color must be a tuple/list of 4 RGBA values, got {type(color)}"
@@ -32,7 +35,10 @@ def colorize(
     if not all(isinstance(c, int) and 0 <= c <= 255 for c in (r, g, b, a_c)):
         raise ValueError(f"color values must be int in range 0-255, got {color}")
 
-    _, _, _, a_src = image.image.split()
+    if isinstance(image, MaskArtifact):
+        a_src = image.image
+    else:
+        a_src = image.image.getchannel("A")
     w, h = image.image.size
     r_band = Image.new("L", (w, h), r)
     g_band = Image.new("L", (w, h), g)
@@ -3,7 +3,7 @@
 from decimal import Decimal
 from typing import Any
 
-from PIL import Image
+from PIL import Image, ImageChops
 
 from invariant.protocol import ICacheable
 from invariant_gfx.artifacts import ImageArtifact
@@ -12,8 +12,14 @@ _SUPPORTED_BLEND_MODES = frozenset(
     {"normal", "multiply", "screen", "overlay", "darken", "lighten", "add"}
 )
 
+# Point tables used by the band-wise blend path
+_OPAQUE_LUT = [255 if v == 255 else 0 for v in range(256)]
+_TRANSPARENT_LUT = [255 if v == 0 else 0 for v in range(256)]
+_DARK_HALF_LUT = [255 if v < 128 else 0 for v in range(256)]
+_DOUBLE_LUT = [min(255, 2 * v) for v in range(256)]
 
-def composite(layers: list[dict[str, Any]]) -> ICacheable:
+
+def composite(layers: list[dict[str, Any]], premultiplied: bool = False) -> ICacheable:
     """Composite multiple layers onto a fixed-size canvas.
 
     Args:
@@ -24,6 +30,13 @@ def composite(layers: list[dict[str, Any]]) -> ICacheable:
             - 'id': str (optional, required if referenced by relative() anchor)
             - 'mode': str (optional, default "normal")
             - 'opacity': Decimal (optional, default 1.0)
+        premultiplied: bool (default False). When True, the canvas is kept in
+            premultiplied "RGBa" form and normal layers are merged with a single
+            premultiplied paste instead of alpha_composite. Normal layers made by
+            another premultiplied composite/layout are used without conversion,
+            and the result is unpremultiplied only when its straight pixels are
+            needed (hashing, serialization, non-compositing ops). Rounding of
+            semi-transparent pixels may differ slightly from the straight path.
 
     Returns:
         ImageArtifact with composited result.
@@ -31,6 +44,9 @@ def composite(layers: list[dict[str, Any]]) -> ICacheable:
     Raises:
         ValueError: If layers structure is invalid, first layer has anchor, or positioning fails.
     """
+    if not isinstance(premultiplied, bool):
+        raise ValueError(f"premultiplied must be bool, got {type(premultiplied)}")
+
     # Validate layers is a list
     if not isinstance(layers, list):
         raise ValueError(f"layers must be a list, got {type(layers)}")
@@ -60,7 +76,8 @@ def composite(layers: list[dict[str, Any]]) -> ICacheable:
             raise ValueError(f"Layer {i} must have 'image' field")
 
     # Create canvas
-    canvas = Image.new("RGBA", (canvas_width, canvas_height), (0, 0, 0, 0))
+    canvas_mode = "RGBa" if premultiplied else "RGBA"
+    canvas = Image.new(canvas_mode, (canvas_width, canvas_height), (0, 0, 0, 0))
 
     # Track placed layers for relative positioning (by id field)
     placed: dict[str, tuple[int, int, int, int]] = {}  # id -> (x, y, width, height)
@@ -95,14 +112,21 @@ def composite(layers: list[dict[str, Any]]) -> ICacheable:
 
         opacity = max(0.0, min(1.0, opacity))  # Clamp to [0, 1]
 
-        # Apply opacity if needed
-        layer_image = image.image
-        if opacity < 1.0:
-            # Create a copy with adjusted alpha
-            layer_image = layer_image.copy()
-            alpha = layer_image.split()[3]
-            alpha = alpha.point(lambda p: int(p * opacity))
-            layer_image.putalpha(alpha)
+        # Apply opacity if needed. Blend modes mix straight colors, so only
+        # normal layers are premultiplied; a round trip would lose precision.
+        if premultiplied and mode == "normal":
+            layer_image = image.premultiplied_image
+            if opacity < 1.0:
+                # Premultiplied color scales together with alpha
+                layer_image = layer_image.point(lambda p: int(p * opacity))
+        else:
+            layer_image = image.image
+            if opacity < 1.0:
+                # Create a copy with adjusted alpha
+                layer_image = layer_image.copy()
+                alpha = layer_image.split()[3]
+                alpha = alpha.point(lambda p: int(p * opacity))
+                layer_image.putalpha(alpha)
 
         # Validate blend mode
         if mode not in _SUPPORTED_BLEND_MODES:
@@ -111,13 +135,14 @@ def composite(layers: list[dict[str, Any]]) -> ICacheable:
             )
 
         # Composite onto canvas
-        if layer_image.mode == "RGBA":
+        if layer_image.mode == "RGBa":
+            # An RGBa mask makes paste compute src + dst * (1 - src_alpha)
+            canvas.paste(layer_image, (x, y), layer_image)
+        elif layer_image.mode == "RGBA":
             if mode == "normal":
                 canvas.alpha_composite(layer_image, (x, y))
             else:
-                temp = Image.new("RGBA", (canvas_width, canvas_height), (0, 0, 0, 0))
-                temp.paste(layer_image, (x, y))
-                canvas = _blend_layer(canvas, temp, mode)
+                _blend_region(canvas, layer_image, (x, y), mode)
         else:
             canvas.paste(layer_image, (x, y))
 
@@ -128,6 +153,33 @@ def composite(layers: list[dict[str, Any]]) -> ICacheable:
     return ImageArtifact(canvas)
 
 
+def _blend_region(
+    canvas: Image.Image, layer: Image.Image, position: tuple[int, int], mode: str
+) -> None:
+    """Blend layer onto canvas in place, touching only the overlapping rectangle.
+
+    Canvas pixels outside the layer's clipped placement are left untouched (a
+    transparent layer pixel leaves the base unchanged), so the work scales with
+    the layer's on-canvas area rather than the canvas area. A premultiplied
+    canvas is unpremultiplied only within that rectangle.
+    """
+    x, y = position
+    left = max(0, x)
+    top = max(0, y)
+    right = min(canvas.width, x + layer.width)
+    bottom = min(canvas.height, y + layer.height)
+    if left >= right or top >= bottom:
+        return
+    box = (left, top, right, bottom)
+    layer_box = (left - x, top - y, right - x, bottom - y)
+    if canvas.mode == "RGBa":
+        base = canvas.crop(box).convert("RGBA")
+        blended = _blend_layer(base, layer.crop(layer_box), mode).convert("RGBa")
+    else:
+        blended = _blend_layer(canvas.crop(box), layer.crop(layer_box), mode)
+    canvas.paste(blended, box)
+
+
 def _blend_channel(base: int, blend: int, mode: str) -> int:
     """Apply blend formula to a single channel (0-255). Returns 0-255."""
     b = base / 255.0
@@ -150,45 +202,78 @@ def _blend_channel(base: int, blend: int, mode: str) -> int:
 
 
 def _blend_layer(base: Image.Image, blend: Image.Image, mode: str) -> Image.Image:
-    """Composite blend over base using the given blend mode. Both must be RGBA, same size."""
+    """Composite blend over base using the given blend mode. Both must be RGBA, same size.
+
+    Operates on whole bands with Pillow primitives instead of per-pixel Python.
+    Every step reproduces the rounding of ``_blend_channel`` and the straight
+    alpha "over" mix exactly, so the output is bit-identical to the scalar
+    formulas.
+    """
     if base.size != blend.size:
         raise ValueError(
             f"base and blend must have same size, got {base.size} and {blend.size}"
         )
-    w, h = base.size
-    out = Image.new("RGBA", (w, h), (0, 0, 0, 0))
-    base_px = base.load()
-    blend_px = blend.load()
-    out_px = out.load()
-    for py in range(h):
-        for px in range(w):
-            br, bg, bb, ba = base_px[px, py]
-            sr, sg, sb, sa = blend_px[px, py]
-            if sa == 0:
-                out_px[px, py] = (br, bg, bb, ba)
-                continue
-            if sa == 255 and ba == 0:
-                out_px[px, py] = (sr, sg, sb, sa)
-                continue
-            # Blend RGB using mode
-            r = _blend_channel(br, sr, mode)
-            g = _blend_channel(bg, sg, mode)
-            b_val = _blend_channel(bb, sb, mode)
-            # Alpha: over composite
-            sa_n = sa / 255.0
-            ba_n = ba / 255.0
-            a_out = sa_n + ba_n * (1.0 - sa_n)
-            if a_out <= 0:
-                out_px[px, py] = (0, 0, 0, 0)
-                continue
-            # Premultiplied-style mix: result = blend * sa + base * (1-sa) for color
-            # Then un-premultiply by a_out for final alpha
-            r_out = int(round((r * sa_n + br * (1 - sa_n))))
-            g_out = int(round((g * sa_n + bg * (1 - sa_n))))
-            b_out = int(round((b_val * sa_n + bb * (1 - sa_n))))
-            a_out_int = max(0, min(255, int(round(a_out * 255))))
-            out_px[px, py] = (r_out, g_out, b_out, a_out_int)
-    return out
+    base_bands = base.split()
+    blend_bands = blend.split()
+    base_alpha = base_bands[3]
+    blend_alpha = blend_bands[3]
+
+    # Color: mix(blended, base, sa) = round((blended * sa + base * (255 - sa)) / 255)
+    out_bands = [
+        Image.composite(
+            _blend_bands(base_band, blend_band, mode), base_band, blend_alpha
+        )
+        for base_band, blend_band in zip(base_bands[:3], blend_bands[:3])
+    ]
+    # Alpha: sa + round(ba * (255 - sa) / 255)
+    out_bands.append(
+        ImageChops.add(
+            blend_alpha, _multiply_round(base_alpha, ImageChops.invert(blend_alpha))
+        )
+    )
+    out = Image.merge("RGBA", out_bands)
+
+    # An opaque layer pixel over a fully transparent base pixel is copied as-is.
+    replace = ImageChops.darker(
+        blend_alpha.point(_OPAQUE_LUT), base_alpha.point(_TRANSPARENT_LUT)
+    )
+    return Image.composite(blend, out, replace)
+
+
+def _multiply_round(a: Image.Image, b: Image.Image) -> Image.Image:
+    """Return ``round(a * b / 255)`` per pixel for two "L" bands.
+
+    ``ImageChops.multiply`` truncates; ``Image.composite`` against black rounds
+    exactly, matching ``int(round(...))`` in ``_blend_channel``.
+    """
+    return Image.composite(a, Image.new("L", a.size, 0), b)
+
+
+def _blend_bands(base: Image.Image, blend: Image.Image, mode: str) -> Image.Image:
+    """Apply ``_blend_channel`` to every pixel of two "L" bands."""
+    if mode == "multiply":
+        return _multiply_round(base, blend)
+    if mode == "screen":
+        return ImageChops.invert(
+            _multiply_round(ImageChops.invert(base), ImageChops.invert(blend))
+        )
+    if mode == "overlay":
+        # base < 128: 2 * b * s; otherwise the screen-like upper branch. 2 * b
+        # (or 2 * (255 - b)) stays within 0..254 on the branch where it is used.
+        dark = _multiply_round(base.point(_DOUBLE_LUT), blend)
+        light = ImageChops.invert(
+            _multiply_round(
+                ImageChops.invert(base).point(_DOUBLE_LUT), ImageChops.invert(blend)
+            )
+        )
+        return Image.composite(dark, light, base.point(_DARK_HALF_LUT))
+    if mode == "darken":
+        return ImageChops.darker(base, blend)
+    if mode == "lighten":
+        return ImageChops.lighter(base, blend)
+    if mode == "add":
+        return ImageChops.add(base, blend)
+    return blend.copy()
 
 
 def _resolve_position(
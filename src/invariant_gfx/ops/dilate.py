@@ -3,31 +3,36 @@
 from PIL import Image, ImageFilter
 
 from invariant.protocol import ICacheable
-from invariant_gfx.artifacts import ImageArtifact
+from invariant_gfx.artifacts import ImageArtifact, MaskArtifact
 
 
-def dilate(image: ImageArtifact, radius: int) -> ICacheable:
+def dilate(image: ImageArtifact | MaskArtifact, radius: int) -> ICacheable:
     """Expand (grow) the alpha channel by radius pixels. RGB unchanged.
 
     Uses Pillow MaxFilter with kernel size 2*radius+1 on the alpha band only.
 
     Args:
-        image: ImageArtifact (source image).
+        image: ImageArtifact (source image) or MaskArtifact (filtered directly).
         radius: Expansion radius in pixels (non-negative).
 
     Returns:
-        ImageArtifact with alpha channel dilated.
+        ImageArtifact with alpha channel dilated, or MaskArtifact for mask input.
 
     Raises:
-        ValueError: If image is not an ImageArtifact or radius is negative.
+        ValueError: If image is not an ImageArtifact or MaskArtifact, or radius is negative.
     """
-    if not isinstance(image, ImageArtifact):
-        raise ValueError(f"image must be ImageArtifact, got {type(image)}")
+    if not isinstance(image, (ImageArtifact, MaskArtifact)):
+        raise ValueError(
+            f"image must be ImageArtifact or MaskArtifact, got {type(image)}"
+        )
     if not isinstance(radius, int) or radius < 0:
         raise ValueError(f"radius must be non-negative int, got {radius!r}")
 
-    r, g, b, a = image.image.split()
     size = 2 * radius + 1
+    if isinstance(image, MaskArtifact):
+        return MaskArtifact(image.image.filter(ImageFilter.MaxFilter(size=size)))
+
+    r, g, b, a = image.image.split()
     a_dilated = a.filter(ImageFilter.MaxFilter(size=size))
     out = Image.merge("RGBA", (r, g, b, a_dilated))
     return ImageArtifact(out)
@@ -3,31 +3,36 @@
 from PIL import Image, ImageFilter
 
 from invariant.protocol import ICacheable
-from invariant_gfx.artifacts import ImageArtifact
+from invariant_gfx.artifacts import ImageArtifact, MaskArtifact
 
 
-def erode(image: ImageArtifact, radius: int) -> ICacheable:
+def erode(image: ImageArtifact | MaskArtifact, radius: int) -> ICacheable:
     """Contract (shrink) the alpha channel by radius pixels. RGB unchanged.
 
     Uses Pillow MinFilter with kernel size 2*radius+1 on the alpha band only.
 
     Args:
-        image: ImageArtifact (source image).
+        image: ImageArtifact (source image) or MaskArtifact (filtered directly).
         radius: Erosion radius in pixels (non-negative).
 
     Returns:
-        ImageArtifact with alpha channel eroded.
+        ImageArtifact with alpha channel eroded, or MaskArtifact for mask input.
 
     Raises:
-        ValueError: If image is not an ImageArtifact or radius is negative.
+        ValueError: If image is not an ImageArtifact or MaskArtifact, or radius is negative.
     """
-    if not isinstance(image, ImageArtifact):
-        raise ValueError(f"image must be ImageArtifact, got {type(image)}")
+    if not isinstance(image, (ImageArtifact, MaskArtifact)):
+        raise ValueError(
+            f"image must be ImageArtifact or MaskArtifact, got {type(image)}"
+        )
     if not isinstance(radius, int) or radius < 0:
         raise ValueError(f"radius must be non-negative int, got {radius!r}")
 
-    r, g, b, a = image.image.split()
     size = 2 * radius + 1
+    if isinstance(image, MaskArtifact):
+        return MaskArtifact(image.image.filter(ImageFilter.MinFilter(size=size)))
+
+    r, g, b, a = image.image.split()
     a_eroded = a.filter(ImageFilter.MinFilter(size=size))
     out = Image.merge("RGBA", (r, g, b, a_eroded))
     return ImageArtifact(out)
@@ -3,25 +3,32 @@
 from PIL import Image
 
 from invariant.protocol import ICacheable
-from invariant_gfx.artifacts import ImageArtifact
+from invariant_gfx.artifacts import ImageArtifact, MaskArtifact
 
 
-def extract_alpha(image: ImageArtifact) -> ICacheable:
+def extract_alpha(image: ImageArtifact, as_mask: bool = False) -> ICacheable:
     """Extract the alpha channel from an image; RGB channels are zeroed.
 
     Args:
         image: ImageArtifact (source image).
+        as_mask: bool (default False). When True, return the alpha band as a
+            single-band MaskArtifact instead of an RGBA image with zeroed RGB.
 
     Returns:
-        ImageArtifact with RGB zeroed and alpha preserved from source.
+        ImageArtifact with RGB zeroed and alpha preserved from source, or a
+        MaskArtifact holding the source alpha when as_mask is True.
 
     Raises:
-        ValueError: If image is not an ImageArtifact.
+        ValueError: If image is not an ImageArtifact or as_mask is not a bool.
     """
     if not isinstance(image, ImageArtifact):
         raise ValueError(f"image must be ImageArtifact, got {type(image)}")
+    if not isinstance(as_mask, bool):
+        raise ValueError(f"as_mask must be bool, got {type(as_mask)}")
 
-    r, g, b, a = image.image.split()
+    a = image.image.getchannel("A")
+    if as_mask:
+        return MaskArtifact(a)
     zero = Image.new("L", image.image.size, 0)
     out = Image.merge("RGBA", (zero, zero, zero, a))
     return ImageArtifact(out)
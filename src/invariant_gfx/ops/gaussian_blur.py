@@ -5,27 +5,30 @@ from decimal import Decimal
 from PIL import ImageFilter
 
 from invariant.protocol import ICacheable
-from invariant_gfx.artifacts import ImageArtifact
+from invariant_gfx.artifacts import ImageArtifact, MaskArtifact
 
 
 def gaussian_blur(
-    image: ImageArtifact,
+    image: ImageArtifact | MaskArtifact,
     sigma: Decimal | int | str,
 ) -> ICacheable:
     """Apply Gaussian blur. Pillow's radius parameter is standard deviation (sigma).
 
     Args:
-        image: ImageArtifact (source image).
+        image: ImageArtifact (source image) or MaskArtifact (blurred directly).
         sigma: Blur standard deviation (Decimal, int, or str). Non-negative.
 
     Returns:
-        ImageArtifact with blurred image (all channels).
+        ImageArtifact with blurred image (all channels), or MaskArtifact for mask input.
 
     Raises:
-        ValueError: If image is not an ImageArtifact or sigma is invalid/negative.
+        ValueError: If image is not an ImageArtifact or MaskArtifact, or sigma is
+            invalid/negative.
     """
-    if not isinstance(image, ImageArtifact):
-        raise ValueError(f"image must be ImageArtifact, got {type(image)}")
+    if not isinstance(image, (ImageArtifact, MaskArtifact)):
+        raise ValueError(
+            f"image must be ImageArtifact or MaskArtifact, got {type(image)}"
+        )
 
     if isinstance(sigma, Decimal):
         sigma_dec = sigma
@@ -39,4 +42,4 @@ def gaussian_blur(
 
     # Pillow's GaussianBlur(radius=...) is standard deviation; pass sigma directly.
     out = image.image.filter(ImageFilter.GaussianBlur(radius=float(sigma_dec)))
-    return ImageArtifact(out)
+    return type(image)(out)
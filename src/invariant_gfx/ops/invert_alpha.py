@@ -3,23 +3,29 @@
 from PIL import Image
 
 from invariant.protocol import ICacheable
-from invariant_gfx.artifacts import ImageArtifact
+from invariant_gfx.artifacts import ImageArtifact, MaskArtifact
 
 
-def invert_alpha(image: ImageArtifact) -> ICacheable:
+def invert_alpha(image: ImageArtifact | MaskArtifact) -> ICacheable:
     """Invert the alpha channel of an image (255 - alpha). RGB unchanged.
 
     Args:
-        image: ImageArtifact (source image, typically alpha-channel from extract_alpha).
+        image: ImageArtifact (source image, typically alpha-channel from extract_alpha)
+            or MaskArtifact (inverted directly).
 
     Returns:
-        ImageArtifact with alpha values inverted.
+        ImageArtifact with alpha values inverted, or MaskArtifact for mask input.
 
     Raises:
-        ValueError: If image is not an ImageArtifact.
+        ValueError: If image is not an ImageArtifact or MaskArtifact.
     """
-    if not isinstance(image, ImageArtifact):
-        raise ValueError(f"image must be ImageArtifact, got {type(image)}")
+    if not isinstance(image, (ImageArtifact, MaskArtifact)):
+        raise ValueError(
+            f"image must be ImageArtifact or MaskArtifact, got {type(image)}"
+        )
+
+    if isinstance(image, MaskArtifact):
+        return MaskArtifact(image.image.point(lambda x: 255 - x, mode="L"))
 
     r, g, b, a = image.image.split()
     a_inv = a.point(lambda x: 255 - x, mode="L")
@@ -13,6 +13,7 @@ def layout(
     align: str,
     gap: Decimal | int | str,
     items: list[ImageArtifact],
+    premultiplied: bool = False,
 ) -> ICacheable:
     """Arrange items in a flow (row or column) with content-sized output.
 
@@ -21,6 +22,10 @@ def layout(
         align: "s", "c", or "e" (cross-axis alignment)
         gap: Decimal | int | str (spacing between items in pixels)
         items: list[ImageArtifact] (ordered list of images to arrange)
+        premultiplied: bool (default False). When True, items are placed on a
+            premultiplied "RGBa" canvas with a single premultiplied paste each,
+            and the result stays premultiplied for downstream composite/layout
+            ops (see gfx:composite).
 
     Returns:
         ImageArtifact sized to the tight bounding box of arranged items (RGBA mode).
@@ -28,6 +33,9 @@ def layout(
     Raises:
         ValueError: If direction/align values are invalid, gap is negative, or items is empty.
     """
+    if not isinstance(premultiplied, bool):
+        raise ValueError(f"premultiplied must be bool, got {type(premultiplied)}")
+
     # Validate direction
     if direction not in ("row", "column"):
         raise ValueError(f"direction must be 'row' or 'column', got '{direction}'")
@@ -80,7 +88,8 @@ def layout(
         )
 
     # Create canvas
-    canvas = Image.new("RGBA", (total_width, total_height), (0, 0, 0, 0))
+    canvas_mode = "RGBa" if premultiplied else "RGBA"
+    canvas = Image.new(canvas_mode, (total_width, total_height), (0, 0, 0, 0))
 
     # Place items
     if direction == "row":
@@ -95,8 +104,7 @@ def layout(
             else:  # align == "e"
                 y = total_height - item.height
 
-            # Use alpha_composite so low-alpha pixels are preserved
-            canvas.alpha_composite(item.image, (x, y))
+            _place(canvas, item, (x, y))
 
             # Move to next position
             x += item.width + gap_int
@@ -113,10 +121,20 @@ def layout(
             else:  # align == "e"
                 x = total_width - item.width
 
-            # Use alpha_composite so low-alpha pixels are preserved
-            canvas.alpha_composite(item.image, (x, y))
+            _place(canvas, item, (x, y))
 
             # Move to next position
             y += item.height + gap_int
 
     return ImageArtifact(canvas)
+
+
+def _place(canvas: Image.Image, item: ImageArtifact, position: tuple[int, int]) -> None:
+    """Composite item onto canvas at position, in the canvas's alpha representation."""
+    if canvas.mode == "RGBa":
+        # An RGBa mask makes paste compute src + dst * (1 - src_alpha)
+        source = item.premultiplied_image
+        canvas.paste(source, position, source)
+    else:
+        # Use alpha_composite so low-alpha pixels are preserved
+        canvas.alpha_composite(item.image, position)
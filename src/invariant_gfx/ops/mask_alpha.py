@@ -3,26 +3,30 @@
 from PIL import Image, ImageChops
 
 from invariant.protocol import ICacheable
-from invariant_gfx.artifacts import ImageArtifact
+from invariant_gfx.artifacts import ImageArtifact, MaskArtifact
 
 
-def mask_alpha(image: ImageArtifact, mask: ImageArtifact) -> ICacheable:
+def mask_alpha(image: ImageArtifact, mask: ImageArtifact | MaskArtifact) -> ICacheable:
     """Apply mask to alpha: output alpha = image_alpha * mask_alpha (per pixel). RGB unchanged.
 
     Args:
         image: ImageArtifact (source image).
-        mask: ImageArtifact (mask image; alpha channel used).
+        mask: ImageArtifact (mask image; alpha channel used) or MaskArtifact
+            (used directly).
 
     Returns:
         ImageArtifact with source RGB and alpha = image_alpha * mask_alpha / 255.
 
     Raises:
-        ValueError: If image or mask is not an ImageArtifact, or if dimensions differ.
+        ValueError: If image is not an ImageArtifact, mask is not an ImageArtifact or
+            MaskArtifact, or if dimensions differ.
     """
     if not isinstance(image, ImageArtifact):
         raise ValueError(f"image must be ImageArtifact, got {type(image)}")
-    if not isinstance(mask, ImageArtifact):
-        raise ValueError(f"mask must be ImageArtifact, got {type(mask)}")
+    if not isinstance(mask, (ImageArtifact, MaskArtifact)):
+        raise ValueError(
+            f"mask must be ImageArtifact or MaskArtifact, got {type(mask)}"
+        )
     if image.image.size != mask.image.size:
         raise ValueError(
             f"image and mask must have same dimensions, "
@@ -30,7 +34,10 @@ def mask_alpha(image: ImageArtifact, mask: ImageArtifact) -> ICacheable:
         )
 
     r, g, b, a_img = image.image.split()
-    _, _, _, a_mask = mask.image.split()
+    if isinstance(mask, MaskArtifact):
+        a_mask = mask.image
+    else:
+        a_mask = mask.image.getchannel("A")
     a_out = ImageChops.multiply(a_img, a_mask)
     out = Image.merge("RGBA", (r, g, b, a_out))
     return ImageArtifact(out)
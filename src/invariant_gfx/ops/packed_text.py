@@ -1,20 +1,26 @@
 """gfx:packed_text operation - packs multi-line text into a fixed-size canvas."""
 
-from dataclasses import dataclass
+import hashlib
+import json
+from dataclasses import astuple, dataclass
 from decimal import Decimal
+from functools import lru_cache
 
+from invariant.protocol import ICacheable
 from PIL import Image, ImageFont
 
-from invariant.protocol import ICacheable
 from invariant_gfx.artifacts import BlobArtifact, ImageArtifact
 from invariant_gfx.ops.render_text import (
     _fit_width_font_size,
+    _glyph_atlas,
     _load_font,
     _measure_loaded_text,
     _render_at_size,
+    _text_bbox,
 )
 
 _TEXT_PADDING = 2  # Keep in sync with gfx:render_text padding.
+_LAYOUT_CACHE_SIZE = 1024
 
 
 @dataclass(frozen=True)
@@ -22,11 +28,37 @@ class _PackedLayout:
     """Resolved text layout for packed_text()."""
 
     font_size: int
-    lines: list[str]
+    lines: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class _LayoutRequest:
+    """Validated inputs that determine a packed_text layout.
+
+    Equality and hashing cover everything the layout depends on, and nothing
+    else (color, alignment), so a request is the key of the layout cache. A
+    BlobArtifact font is represented by its content hash only; the font itself
+    is passed alongside, so cached layouts do not keep font blobs alive.
+    """
+
+    text: str
+    width: int
+    height: int
+    font_key: tuple[str, str]
+    weight: int | None
+    style: str
+    min_font_size: int
+    max_font_size: int
+    line_gap: int
+
+    def digest(self) -> str:
+        """Hex digest identifying the request, recorded in serialized layouts."""
+        encoded = json.dumps(astuple(self), separators=(",", ":"))
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
 
 
 class _TextMeasurer:
-    """Per-render cache for loaded fonts and text measurements."""
+    """Per-render font lookup over the process-wide text measurement cache."""
 
     def __init__(
         self,
@@ -38,7 +70,6 @@ class _TextMeasurer:
         self._weight = weight
         self._style = style
         self._fonts: dict[int, ImageFont.FreeTypeFont] = {}
-        self._measurements: dict[tuple[int, str], tuple[int, int]] = {}
 
     def font(self, size: int) -> ImageFont.FreeTypeFont:
         if size not in self._fonts:
@@ -46,14 +77,8 @@ class _TextMeasurer:
         return self._fonts[size]
 
     def measure(self, text: str, size: int) -> tuple[int, int]:
-        key = (size, text)
-        if key not in self._measurements:
-            width, height = _measure_loaded_text(text, self.font(size))
-            self._measurements[key] = (
-                width + _TEXT_PADDING * 2,
-                height + _TEXT_PADDING * 2,
-            )
-        return self._measurements[key]
+        width, height = _measure_loaded_text(text, self.font(size))
+        return (width + _TEXT_PADDING * 2, height + _TEXT_PADDING * 2)
 
 
 def _truncate_to_width(
@@ -91,33 +116,129 @@ def _truncate_to_width(
     return best or ellipsis
 
 
+class _LineBounds:
+    """Bounds on a wrapped line's measured width, grown one token at a time.
+
+    Under Pillow's basic layout each glyph lands at its 26.6 pen position
+    rounded to whole pixels, so a token whose pen starts at 64q + f has the box
+    it has at the origin shifted right by q pixels, or q + 1 when f > 0. With
+    the exact pen (token advances plus the kerning around each joining space,
+    from the glyph atlas) the joined line's box is known to within a pixel from
+    per-token boxes alone, without measuring the joined string.
+    """
+
+    def __init__(self, pil_font: ImageFont.FreeTypeFont, token: str) -> None:
+        self._font = pil_font
+        self._atlas = _glyph_atlas(pil_font)
+        left, _, right, _ = _text_bbox(token, pil_font)
+        # (low, high) bounds of the line's left and right ink edges
+        self._left = (left, left)
+        self._right = (right, right)
+        self._pen = self._atlas.advance(token)
+        self._last = token[-1]
+
+    def _place(self, token: str) -> tuple[tuple[int, int], tuple[int, int], int]:
+        """Left/right edge bounds and end pen of the line with token appended."""
+        atlas = self._atlas
+        last_advance = atlas.advance(self._last)
+        space_pen = (
+            self._pen
+            + atlas.advance(f"{self._last} ")
+            - last_advance
+            - atlas.advance(" ")
+        )
+        token_pen = (
+            self._pen
+            + atlas.advance(f"{self._last} {token[0]}")
+            - last_advance
+            - atlas.advance(token[0])
+        )
+
+        left, right = self._left, self._right
+        for text, pen in ((" ", space_pen), (token, token_pen)):
+            box_left, _, box_right, _ = _text_bbox(text, self._font)
+            shift = pen >> 6
+            carry = 1 if pen & 63 else 0
+            left = (
+                min(left[0], shift + box_left),
+                min(left[1], shift + box_left + carry),
+            )
+            right = (
+                max(right[0], shift + box_right),
+                max(right[1], shift + box_right + carry),
+            )
+        return left, right, token_pen + atlas.advance(token)
+
+    def width_with(self, token: str) -> tuple[int, int]:
+        """(low, high) bounds of the padded width with token appended."""
+        left, right, _ = self._place(token)
+        padding = _TEXT_PADDING * 2
+        return (right[0] - left[1] + padding, right[1] - left[0] + padding)
+
+    def append(self, token: str) -> None:
+        """Grow the line by a space and token."""
+        self._left, self._right, self._pen = self._place(token)
+        self._last = token[-1]
+
+
+def _line_bounds(pil_font: ImageFont.FreeTypeFont, token: str) -> _LineBounds | None:
+    """Width bounds for a line starting with token, where the font allows them."""
+    if token and pil_font.layout_engine == ImageFont.Layout.BASIC:
+        return _LineBounds(pil_font, token)
+    return None
+
+
 def _wrap_tokens(
     tokens: list[str],
     max_width: int,
     measurer: _TextMeasurer,
     font_size: int,
 ) -> list[str]:
-    """Greedy token wrapping with horizontal truncation for oversized tokens."""
+    """Greedy token wrapping with horizontal truncation for oversized tokens.
+
+    Whether the next token fits is decided from per-token widths via
+    ``_LineBounds``; the joined candidate line is measured only when its
+    bounds straddle max_width, or when the font uses complex (raqm) layout.
+    Wrapping is therefore linear in the number of tokens, and the lines are
+    the same as measuring every candidate.
+    """
     if not tokens:
         return [""]
 
+    pil_font = measurer.font(font_size)
     lines: list[str] = []
     current_line: list[str] = []
+    bounds: _LineBounds | None = None
 
     for token in tokens:
-        if not current_line:
-            candidate = token
-        else:
-            candidate = f"{' '.join(current_line)} {token}"
-
-        candidate_width, _ = measurer.measure(candidate, font_size)
-        if candidate_width <= max_width:
+        fits: bool | None = None
+        if current_line and bounds is not None:
+            low, high = bounds.width_with(token)
+            if high <= max_width:
+                fits = True
+            elif low > max_width:
+                fits = False
+
+        if fits is None:
+            if not current_line:
+                candidate = token
+            else:
+                candidate = f"{' '.join(current_line)} {token}"
+            candidate_width, _ = measurer.measure(candidate, font_size)
+            fits = candidate_width <= max_width
+
+        if fits:
+            if current_line and bounds is not None:
+                bounds.append(token)
+            elif not current_line:
+                bounds = _line_bounds(pil_font, token)
             current_line.append(token)
             continue
 
         if current_line:
             lines.append(" ".join(current_line))
             current_line = [token]
+            bounds = _line_bounds(pil_font, token)
             token_width, _ = measurer.measure(token, font_size)
             if token_width > max_width:
                 current_line = [
@@ -125,6 +246,7 @@ def _wrap_tokens(
                 ]
                 lines.append(current_line[0])
                 current_line = []
+                bounds = None
             continue
 
         lines.append(_truncate_to_width(token, max_width, measurer, font_size))
@@ -217,7 +339,7 @@ def _drop_lines_to_fit(
     if not lines:
         return _PackedLayout(
             font_size=font_size,
-            lines=[_truncate_to_width(text.strip(), width, measurer, font_size)],
+            lines=(_truncate_to_width(text.strip(), width, measurer, font_size),),
         )
 
     if len(lines) < original_count:
@@ -226,7 +348,7 @@ def _drop_lines_to_fit(
             tail = f"{tail}\u2026"
         lines[-1] = _truncate_to_width(tail, width, measurer, font_size)
 
-    return _PackedLayout(font_size=font_size, lines=lines)
+    return _PackedLayout(font_size=font_size, lines=tuple(lines))
 
 
 def _find_layout_by_height(
@@ -250,7 +372,7 @@ def _find_layout_by_height(
         mid = (low + high) // 2
         lines = _wrap_tokens(tokens, width, measurer, mid)
         if _layout_height(lines, measurer, mid, line_gap) <= height:
-            best_layout = _PackedLayout(font_size=mid, lines=lines)
+            best_layout = _PackedLayout(font_size=mid, lines=tuple(lines))
             low = mid + 1
         else:
             high = mid - 1
@@ -341,6 +463,162 @@ def _fit_layout(
     )
 
 
+class _Unkeyed:
+    """Argument that takes no part in an ``lru_cache`` key.
+
+    All instances compare equal, so the key is formed by the other arguments.
+    The caller clears ``value`` after the call, so the instance the cache keeps
+    inside its key holds nothing.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self, value) -> None:
+        self.value = value
+
+    def __hash__(self) -> int:
+        return 0
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Unkeyed)
+
+
+def _resolve_layout(request: _LayoutRequest, font: str | BlobArtifact) -> _PackedLayout:
+    """Search the font size and line breaks for a request, cached process-wide.
+
+    ``font`` is the font ``request.font_key`` identifies. It is only read on a
+    cache miss and is not retained by the cache.
+    """
+    font_arg = _Unkeyed(font)
+    try:
+        return _cached_layout(request, font_arg)
+    finally:
+        font_arg.value = None
+
+
+@lru_cache(maxsize=_LAYOUT_CACHE_SIZE)
+def _cached_layout(request: _LayoutRequest, font_arg: _Unkeyed) -> _PackedLayout:
+    """Search for a layout on a ``_resolve_layout`` cache miss."""
+    font = font_arg.value
+    return _fit_layout(
+        text=request.text,
+        font=font,
+        width=request.width,
+        height=request.height,
+        min_font_size=request.min_font_size,
+        max_font_size=request.max_font_size,
+        line_gap=request.line_gap,
+        weight=request.weight,
+        style=request.style,
+        measurer=_TextMeasurer(font, request.weight, request.style),
+    )
+
+
+def _layout_request(
+    text: str,
+    size: tuple[int, int] | list[int],
+    font: str | BlobArtifact,
+    min_font_size: int,
+    max_font_size: int | None,
+    line_gap: Decimal | int | str,
+    weight: int | None,
+    style: str,
+) -> _LayoutRequest:
+    """Validate the layout params shared by packed_text and packed_text_layout."""
+    if not isinstance(text, str):
+        raise ValueError(f"text must be a string, got {type(text)}")
+
+    if not isinstance(size, (tuple, list)) or len(size) != 2:
+        raise ValueError(f"size must be a tuple/list of (width, height), got {size}")
+
+    width = _to_int(size[0], name="size[0]")
+    height = _to_int(size[1], name="size[1]")
+    if width <= 0 or height <= 0:
+        raise ValueError(f"size values must be positive, got {size}")
+
+    min_font_size_int = _to_int(min_font_size, name="min_font_size")
+    if min_font_size_int <= 0:
+        raise ValueError(f"min_font_size must be positive, got {min_font_size}")
+
+    max_font_size_int: int | None = None
+    if max_font_size is not None:
+        max_font_size_int = _to_int(max_font_size, name="max_font_size")
+        if max_font_size_int < min_font_size_int:
+            raise ValueError(
+                "max_font_size must be greater than or equal to min_font_size, "
+                f"got min={min_font_size_int}, max={max_font_size_int}"
+            )
+
+    line_gap_int = _to_int(line_gap, name="line_gap")
+    if line_gap_int < 0:
+        raise ValueError(f"line_gap must be non-negative, got {line_gap}")
+
+    # Checked here, not only when the font loads, because the request is
+    # hashed as a cache key before any font is loaded.
+    if weight is not None:
+        if not isinstance(weight, int) or not (100 <= weight <= 900):
+            raise ValueError(f"weight must be int in range 100-900, got {weight!r}")
+
+    if not isinstance(style, str) or style not in ("normal", "italic"):
+        raise ValueError(f"style must be 'normal' or 'italic', got {style!r}")
+
+    if isinstance(font, BlobArtifact):
+        font_key = ("blob", font.get_stable_hash())
+    elif isinstance(font, str):
+        font_key = ("family", font)
+    else:
+        raise ValueError(f"font must be a string or BlobArtifact, got {type(font)}")
+
+    return _LayoutRequest(
+        text=text,
+        width=width,
+        height=height,
+        font_key=font_key,
+        weight=weight,
+        style=style,
+        min_font_size=min_font_size_int,
+        max_font_size=max_font_size_int or max(min(width, height), min_font_size_int),
+        line_gap=line_gap_int,
+    )
+
+
+def _layout_to_param(layout: _PackedLayout, request: _LayoutRequest) -> dict:
+    """Serialize a layout for gfx:packed_text_layout, tagged with its request."""
+    return {
+        "font_size": layout.font_size,
+        "lines": list(layout.lines),
+        "request": request.digest(),
+    }
+
+
+def _layout_from_param(layout: dict, request: _LayoutRequest) -> _PackedLayout:
+    """Validate a layout produced by gfx:packed_text_layout for this request."""
+    if not isinstance(layout, dict) or set(layout) != {"font_size", "lines", "request"}:
+        raise ValueError(
+            "layout must be a dict with 'font_size', 'lines' and 'request', "
+            f"got {layout!r}"
+        )
+
+    font_size = layout["font_size"]
+    if not isinstance(font_size, int) or isinstance(font_size, bool) or font_size <= 0:
+        raise ValueError(f"layout font_size must be a positive int, got {font_size!r}")
+
+    lines = layout["lines"]
+    if (
+        not isinstance(lines, (list, tuple))
+        or not lines
+        or not all(isinstance(line, str) for line in lines)
+    ):
+        raise ValueError(f"layout lines must be a non-empty list of str, got {lines!r}")
+
+    if layout["request"] != request.digest():
+        raise ValueError(
+            "layout was computed for different text, size, font or sizing params"
+        )
+
+    return _PackedLayout(font_size=font_size, lines=tuple(lines))
+
+
 def _to_axis_align(value: str, axis: str) -> str:
     """Normalize user-friendly alignment names to composite alignment chars."""
     aliases = {
@@ -389,6 +667,8 @@ def packed_text(
     align_vertical: str = "center",
     weight: int | None = None,
     style: str = "normal",
+    premultiplied: bool = False,
+    layout: dict | None = None,
 ) -> ICacheable:
     """Render packed multi-line text into a fixed-size RGBA canvas.
 
@@ -404,37 +684,21 @@ def packed_text(
         align_vertical: "top"/"center"/"bottom" (or aliases).
         weight: Font weight (100-900, optional, only for string fonts).
         style: Font style: "normal" or "italic".
+        premultiplied: When True, lines are assembled on a premultiplied "RGBa"
+            canvas and the result stays premultiplied for downstream
+            composite/layout ops (see gfx:composite).
+        layout: Optional dict from gfx:packed_text_layout for the same text,
+            size, font and sizing params. When given, its font size and line
+            breaks are painted directly instead of being searched for; a layout
+            made for other params raises ValueError.
 
     Returns:
         ImageArtifact sized to the requested canvas (RGBA mode).
     """
-    if not isinstance(text, str):
-        raise ValueError(f"text must be a string, got {type(text)}")
-
-    if not isinstance(size, (tuple, list)) or len(size) != 2:
-        raise ValueError(f"size must be a tuple/list of (width, height), got {size}")
-
-    width = _to_int(size[0], name="size[0]")
-    height = _to_int(size[1], name="size[1]")
-    if width <= 0 or height <= 0:
-        raise ValueError(f"size values must be positive, got {size}")
-
-    min_font_size_int = _to_int(min_font_size, name="min_font_size")
-    if min_font_size_int <= 0:
-        raise ValueError(f"min_font_size must be positive, got {min_font_size}")
-
-    max_font_size_int: int | None = None
-    if max_font_size is not None:
-        max_font_size_int = _to_int(max_font_size, name="max_font_size")
-        if max_font_size_int < min_font_size_int:
-            raise ValueError(
-                "max_font_size must be greater than or equal to min_font_size, "
-                f"got min={min_font_size_int}, max={max_font_size_int}"
-            )
-
-    line_gap_int = _to_int(line_gap, name="line_gap")
-    if line_gap_int < 0:
-        raise ValueError(f"line_gap must be non-negative, got {line_gap}")
+    request = _layout_request(
+        text, size, font, min_font_size, max_font_size, line_gap, weight, style
+    )
+    width, height, line_gap_int = request.width, request.height, request.line_gap
 
     if not isinstance(color, (tuple, list)) or len(color) != 4:
         raise ValueError(
@@ -445,33 +709,27 @@ def packed_text(
     if not all(isinstance(c, int) and 0 <= c <= 255 for c in (r, g, b, a)):
         raise ValueError(f"color values must be int in range 0-255, got {color}")
 
-    resolved_max = max_font_size_int or max(min(width, height), min_font_size_int)
-    measurer = _TextMeasurer(font, weight, style)
-    layout = _fit_layout(
-        text=text,
-        font=font,
-        width=width,
-        height=height,
-        min_font_size=min_font_size_int,
-        max_font_size=resolved_max,
-        line_gap=line_gap_int,
-        weight=weight,
-        style=style,
-        measurer=measurer,
-    )
+    if not isinstance(premultiplied, bool):
+        raise ValueError(f"premultiplied must be bool, got {type(premultiplied)}")
+
+    if layout is None:
+        packed = _resolve_layout(request, font)
+    else:
+        packed = _layout_from_param(layout, request)
 
     h_align = _to_axis_align(align_horizontal, "horizontal")
     v_align = _to_axis_align(align_vertical, "vertical")
 
-    pil_font = measurer.font(layout.font_size)
-    line_images = [_render_at_size(line, pil_font, color) for line in layout.lines]
+    pil_font = _load_font(font, packed.font_size, weight, style)
+    line_images = [_render_at_size(line, pil_font, color) for line in packed.lines]
 
     block_width = max(image.width for image in line_images)
     block_height = sum(image.height for image in line_images) + line_gap_int * (
         len(line_images) - 1
     )
 
-    block = Image.new("RGBA", (block_width, block_height), (0, 0, 0, 0))
+    canvas_mode = "RGBa" if premultiplied else "RGBA"
+    block = Image.new(canvas_mode, (block_width, block_height), (0, 0, 0, 0))
     y = 0
     for image in line_images:
         if h_align == "s":
@@ -481,7 +739,11 @@ def packed_text(
         else:
             x = block_width - image.width
 
-        block.alpha_composite(image.image, (x, y))
+        if premultiplied:
+            # An RGBa mask makes paste compute src + dst * (1 - src_alpha)
+            block.paste(image.premultiplied_image, (x, y), image.premultiplied_image)
+        else:
+            block.alpha_composite(image.image, (x, y))
         y += image.height + line_gap_int
 
     if h_align == "s":
@@ -498,7 +760,10 @@ def packed_text(
     else:
         block_y = height - block_height
 
-    canvas = Image.new("RGBA", (width, height), (0, 0, 0, 0))
-    canvas.alpha_composite(block, (block_x, block_y))
+    canvas = Image.new(canvas_mode, (width, height), (0, 0, 0, 0))
+    if premultiplied:
+        canvas.paste(block, (block_x, block_y), block)
+    else:
+        canvas.alpha_composite(block, (block_x, block_y))
 
     return ImageArtifact(canvas)
@@ -0,0 +1,53 @@
+"""gfx:packed_text_layout operation - the font size and line breaks gfx:packed_text picks."""
+
+from decimal import Decimal
+
+from invariant_gfx.artifacts import BlobArtifact
+from invariant_gfx.ops.packed_text import (
+    _layout_request,
+    _layout_to_param,
+    _resolve_layout,
+)
+
+
+def packed_text_layout(
+    text: str,
+    size: tuple[int, int] | list[int],
+    font: str | BlobArtifact,
+    min_font_size: int = 10,
+    max_font_size: int | None = None,
+    line_gap: Decimal | int | str = 0,
+    weight: int | None = None,
+    style: str = "normal",
+) -> dict:
+    """Choose the font size and line breaks for text packed into a box.
+
+    Runs the same search as gfx:packed_text but returns the decision instead of
+    painting it. The manifest holds only what the layout depends on (no color,
+    alignment or premultiplication), so the result is cached by the executor's
+    store under one key for every paint variant of the same text, and a
+    persistent store shares it across processes. Pass the result to
+    gfx:packed_text as ``layout`` to paint without searching again.
+
+    Args:
+        text: String to pack. Existing newlines are treated as whitespace.
+        size: Tuple[int, int] or list[int] (width, height) in pixels.
+        font: String (font family name) or BlobArtifact (font file bytes).
+        min_font_size: Minimum font size to try before truncation (default 10).
+        max_font_size: Optional maximum font size (default: min(width, height)).
+        line_gap: Extra pixels between lines (default 0).
+        weight: Optional font weight (100-900) for named fonts.
+        style: Font style ("normal" or "italic") for named fonts.
+
+    Returns:
+        Dict with "font_size" (int), "lines" (list of str, one per line,
+        ellipsized where the text had to be truncated) and "request" (a digest
+        of the params, checked by gfx:packed_text).
+
+    Raises:
+        ValueError: If any parameter is invalid.
+    """
+    request = _layout_request(
+        text, size, font, min_font_size, max_font_size, line_gap, weight, style
+    )
+    return _layout_to_param(_resolve_layout(request, font), request)
@@ -3,11 +3,11 @@
 from PIL import Image
 
 from invariant.protocol import ICacheable
-from invariant_gfx.artifacts import ImageArtifact
+from invariant_gfx.artifacts import ImageArtifact, MaskArtifact
 
 
 def pad(
-    image: ImageArtifact,
+    image: ImageArtifact | MaskArtifact,
     left: int,
     top: int,
     right: int,
@@ -16,20 +16,24 @@ def pad(
     """Expand canvas by adding transparent padding around the image.
 
     Args:
-        image: ImageArtifact (source image).
+        image: ImageArtifact (source image) or MaskArtifact (padded with zero coverage).
         left: Padding in pixels (left side).
         top: Padding in pixels (top).
         right: Padding in pixels (right side).
         bottom: Padding in pixels (bottom).
 
     Returns:
-        ImageArtifact with original image placed at (left, top) in expanded canvas.
+        ImageArtifact with original image placed at (left, top) in expanded canvas,
+        or MaskArtifact for mask input.
 
     Raises:
-        ValueError: If image is not an ImageArtifact or any padding is not int or is negative.
+        ValueError: If image is not an ImageArtifact or MaskArtifact, or any padding is
+            not int or is negative.
     """
-    if not isinstance(image, ImageArtifact):
-        raise ValueError(f"image must be ImageArtifact, got {type(image)}")
+    if not isinstance(image, (ImageArtifact, MaskArtifact)):
+        raise ValueError(
+            f"image must be ImageArtifact or MaskArtifact, got {type(image)}"
+        )
     for name, val in (
         ("left", left),
         ("top", top),
@@ -45,6 +49,11 @@ def pad(
     out_w = w + left + right
     out_h = h + top + bottom
 
+    if isinstance(image, MaskArtifact):
+        canvas = Image.new("L", (out_w, out_h), 0)
+        canvas.paste(image.image, (left, top))
+        return MaskArtifact(canvas)
+
     canvas = Image.new("RGBA", (out_w, out_h), (0, 0, 0, 0))
     canvas.paste(image.image, (left, top))
     return ImageArtifact(canvas)
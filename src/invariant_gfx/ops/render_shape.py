@@ -0,0 +1,685 @@
+"""gfx:render_shape operation - rasterizes a shape primitive without SVG."""
+
+import math
+from decimal import Decimal
+
+from PIL import Image
+
+from invariant.protocol import ICacheable
+from invariant_gfx.artifacts import ImageArtifact
+from invariant_gfx.colors import colored_alpha, validate_color
+
+# Required and optional geometry keys per shape, named as in the
+# invariant_gfx.shapes builders.
+_SHAPE_GEOMETRY = {
+    "rect": (("width", "height"), ("x", "y")),
+    "rounded_rect": (("width", "height", "rx"), ("ry", "x", "y")),
+    "circle": (("cx", "cy", "r"), ()),
+    "ellipse": (("cx", "cy", "rx", "ry"), ()),
+    "line": (("x1", "y1", "x2", "y2"), ()),
+    "polygon": (("points",), ()),
+    "arc": (("cx", "cy", "r", "start_angle", "end_angle"), ("pie",)),
+}
+
+# Largest distance, in output pixels, between a path arc and the polyline it
+# is flattened to. cairosvg renders paths with arcs at a tolerance of 1e-5
+# pixels, so they follow the true curve closely.
+_FLATNESS = 0.01
+# cairo's default tolerance, in output pixels, for flattening the Bezier
+# curves that circles, ellipses and rounded rect corners are drawn with.
+_TOLERANCE = 0.1
+# Parameter step, as a fraction of a flattened segment, to the extra point
+# placed just inside each end of a curve.
+_TANGENT_STEP = 1e-3
+# SVG's default stroke-miterlimit: longer miters are beveled.
+_MITER_LIMIT = 4.0
+# cairosvg draws each rounded rect corner as one cubic Bezier from its start
+# point, with these control points relative to it in units of (rx, ry); the
+# top-right and bottom-left corners are not quarter ellipses.
+_ARC_TO_BEZIER = 4 * (math.sqrt(2) - 1) / 3
+_CORNER_CONTROLS = (
+    ((_ARC_TO_BEZIER, 0.0), (1.0, _ARC_TO_BEZIER), (1.0, 1.0)),
+    ((0.0, _ARC_TO_BEZIER), (_ARC_TO_BEZIER - 1.0, 1.0), (-1.0, 1.0)),
+    ((-_ARC_TO_BEZIER, 0.0), (-1.0, -_ARC_TO_BEZIER), (-1.0, -1.0)),
+    ((0.0, -_ARC_TO_BEZIER), (1.0 - _ARC_TO_BEZIER, -1.0), (1.0, -1.0)),
+)
+
+
+def _to_float(value: Decimal | int | str, name: str) -> float:
+    """Convert a geometry param to float (canonical conversion for determinism)."""
+    if isinstance(value, (Decimal, int, str)):
+        return float(value)
+    raise ValueError(f"{name} must be Decimal, int, or str, got {type(value)}")
+
+
+def _parse_geometry(shape: str, geometry: dict) -> dict:
+    """Validate a shape's geometry dict and convert its values."""
+    if shape not in _SHAPE_GEOMETRY:
+        raise ValueError(
+            f"shape must be one of {', '.join(_SHAPE_GEOMETRY)}, got {shape!r}"
+        )
+    if not isinstance(geometry, dict):
+        raise ValueError(f"geometry must be a dict, got {type(geometry)}")
+
+    required, optional = _SHAPE_GEOMETRY[shape]
+    missing = [key for key in required if key not in geometry]
+    if missing:
+        raise ValueError(f"{shape} geometry is missing {', '.join(missing)}")
+    unknown = sorted(set(geometry) - set(required) - set(optional))
+    if unknown:
+        raise ValueError(f"unknown {shape} geometry keys: {', '.join(unknown)}")
+
+    parsed = {}
+    for key, value in geometry.items():
+        if key == "pie":
+            if not isinstance(value, bool):
+                raise ValueError(f"pie must be a bool, got {type(value)}")
+            parsed[key] = value
+        elif key == "points":
+            if not isinstance(value, (list, tuple)) or not value:
+                raise ValueError("points must be a non-empty list of [x, y] pairs")
+            points = []
+            for i, point in enumerate(value):
+                if not isinstance(point, (list, tuple)) or len(point) != 2:
+                    raise ValueError(f"points[{i}] must be [x, y], got {point!r}")
+                points.append(
+                    (
+                        _to_float(point[0], f"points[{i}][0]"),
+                        _to_float(point[1], f"points[{i}][1]"),
+                    )
+                )
+            parsed[key] = points
+        else:
+            parsed[key] = _to_float(value, key)
+
+    for key in ("width", "height", "r", "rx", "ry"):
+        if parsed.get(key, 0) < 0:
+            raise ValueError(f"{key} must not be negative, got {geometry[key]}")
+    return parsed
+
+
+def _viewbox(shape: str, g: dict) -> tuple[float, float, float, float]:
+    """The viewBox (min_x, min_y, width, height) the matching shapes builder emits."""
+    if shape in ("rect", "rounded_rect"):
+        return 0.0, 0.0, g.get("x", 0.0) + g["width"], g.get("y", 0.0) + g["height"]
+    if shape in ("circle", "arc"):
+        r = g["r"]
+        return g["cx"] - r, g["cy"] - r, 2 * r, 2 * r
+    if shape == "ellipse":
+        return 0.0, 0.0, 2 * g["rx"], 2 * g["ry"]
+
+    if shape == "line":
+        xs, ys = (g["x1"], g["x2"]), (g["y1"], g["y2"])
+    else:
+        xs, ys = [x for x, _ in g["points"]], [y for _, y in g["points"]]
+    min_x, min_y = min(xs), min(ys)
+    return min_x, min_y, max(1.0, max(xs) - min_x), max(1.0, max(ys) - min_y)
+
+
+def _curve_steps(segments: int) -> list[float]:
+    """Parameters in [0, 1] at which to sample a curve flattened to segments.
+
+    Besides the segment ends, a point just inside each end makes the first
+    and last segments follow the curve's end tangents, as the caps and joins
+    SVG renderers draw there do.
+    """
+    tip = _TANGENT_STEP / segments
+    return [0.0, tip, *(i / segments for i in range(1, segments)), 1.0 - tip, 1.0]
+
+
+def _arc_points(
+    cx: float,
+    cy: float,
+    rx: float,
+    ry: float,
+    start: float,
+    sweep: float,
+    scale: float,
+) -> list[tuple[float, float]]:
+    """Flatten an elliptical arc (angles in radians) to points, both ends included."""
+    radius = max(rx, ry) * scale
+    if radius > _FLATNESS:
+        step = 2 * math.acos(1 - _FLATNESS / radius)
+        segments = max(1, math.ceil(abs(sweep) / step))
+    else:
+        segments = 1
+    return [
+        (cx + rx * math.cos(start + sweep * t), cy + ry * math.sin(start + sweep * t))
+        for t in _curve_steps(segments)
+    ]
+
+
+def _cubic_at(curve: tuple, t: float) -> tuple[float, float]:
+    """The point at parameter t of a cubic Bezier given as four points."""
+    (x0, y0), (x1, y1), (x2, y2), (x3, y3) = curve
+    u = 1 - t
+    w0, w1, w2, w3 = u * u * u, 3 * u * u * t, 3 * u * t * t, t * t * t
+    return (
+        w0 * x0 + w1 * x1 + w2 * x2 + w3 * x3,
+        w0 * y0 + w1 * y1 + w2 * y2 + w3 * y3,
+    )
+
+
+def _control_error(curve: tuple) -> float:
+    """Squared distance of a cubic's inner control points from its chord."""
+    (ax, ay), (bx, by), (cx, cy), (dx, dy) = curve
+    chord_x, chord_y = dx - ax, dy - ay
+    chord = chord_x * chord_x + chord_y * chord_y
+    error = 0.0
+    for px, py in ((bx - ax, by - ay), (cx - ax, cy - ay)):
+        if chord:
+            u = px * chord_x + py * chord_y
+            if u >= chord:
+                px, py = px - chord_x, py - chord_y
+            elif u > 0:
+                px, py = px - u / chord * chord_x, py - u / chord * chord_y
+        error = max(error, px * px + py * py)
+    return error
+
+
+def _cubic_points(curve: tuple, scale: float) -> list[tuple[float, float]]:
+    """Flatten a cubic Bezier to points, both ends included, as cairo does.
+
+    The curve is halved until both inner control points of every piece lie
+    within _TOLERANCE output pixels of its chord. Points just inside both
+    ends keep the curve's end tangents, as for _curve_steps.
+    """
+    limit = (_TOLERANCE / scale) ** 2
+    pieces = []
+    pending = [curve]
+    while pending:
+        a, b, c, d = pending.pop()
+        if _control_error((a, b, c, d)) < limit:
+            pieces.append((a, b, c, d))
+            continue
+        ab, bc, cd = _midpoint(a, b), _midpoint(b, c), _midpoint(c, d)
+        abc, bcd = _midpoint(ab, bc), _midpoint(bc, cd)
+        middle = _midpoint(abc, bcd)
+        pending.append((middle, bcd, cd, d))
+        pending.append((a, ab, abc, middle))
+
+    points = [curve[0], _cubic_at(pieces[0], _TANGENT_STEP)]
+    points.extend(piece[3] for piece in pieces[:-1])
+    points.extend((_cubic_at(pieces[-1], 1 - _TANGENT_STEP), curve[3]))
+    return points
+
+
+def _midpoint(p: tuple, q: tuple) -> tuple[float, float]:
+    """The point halfway between two points."""
+    return (p[0] + q[0]) / 2, (p[1] + q[1]) / 2
+
+
+def _ellipse_points(
+    cx: float, cy: float, rx: float, ry: float, scale: float
+) -> list[tuple[float, float]]:
+    """Flatten a full ellipse the way cairo flattens cairo_arc's circle.
+
+    cairo draws each half turn as equal Bezier segments, as few as keep a
+    segment's error within _TOLERANCE of the circle, then flattens those.
+    """
+    tolerance = _TOLERANCE / (max(rx, ry) * scale)
+    sides = 1
+    while (
+        2 / 27 * math.sin(math.pi / sides / 4) ** 6 / math.cos(math.pi / sides / 4) ** 2
+        >= tolerance
+        and sides < 1000
+    ):
+        sides += 1
+    segments = math.ceil(math.pi / (math.pi / sides))
+
+    points = []
+    for start, end in ((0.0, math.pi), (math.pi, 2 * math.pi)):
+        step = (end - start) / segments
+        angles = [start + step * i for i in range(segments)] + [end]
+        for a0, a1 in zip(angles, angles[1:]):
+            h = 4 / 3 * math.tan((a1 - a0) / 4)
+            sin0, cos0, sin1, cos1 = (
+                math.sin(a0),
+                math.cos(a0),
+                math.sin(a1),
+                math.cos(a1),
+            )
+            curve = (
+                (cx + rx * cos0, cy + ry * sin0),
+                (cx + rx * (cos0 - h * sin0), cy + ry * (sin0 + h * cos0)),
+                (cx + rx * (cos1 + h * sin1), cy + ry * (sin1 - h * cos1)),
+                (cx + rx * cos1, cy + ry * sin1),
+            )
+            points.extend(_cubic_points(curve, scale)[:-1])
+    return points
+
+
+def _svg_arc(
+    x1: float,
+    y1: float,
+    x2: float,
+    y2: float,
+    r: float,
+    large_arc: bool,
+    sweep_flag: bool,
+    scale: float,
+) -> list[tuple[float, float]]:
+    """Points of an SVG circular arc command after its start point.
+
+    Converts the endpoint parameterization to a center and angles as SVG
+    renderers do, including scaling up a radius too small for the chord.
+    """
+    if (x1, y1) == (x2, y2):
+        # SVG omits an arc whose endpoints coincide.
+        return []
+    if r == 0:
+        return [(x2, y2)]
+
+    hx, hy = (x1 - x2) / 2, (y1 - y2) / 2
+    chord = hx * hx + hy * hy
+    r = max(r, math.sqrt(chord))
+    coef = math.sqrt(max(0.0, r * r / chord - 1))
+    if large_arc == sweep_flag:
+        coef = -coef
+    ox, oy = coef * hy, -coef * hx
+    cx, cy = ox + (x1 + x2) / 2, oy + (y1 + y2) / 2
+
+    start = math.atan2(hy - oy, hx - ox)
+    sweep = math.atan2(-hy - oy, -hx - ox) - start
+    if sweep_flag and sweep < 0:
+        sweep += 2 * math.pi
+    elif not sweep_flag and sweep > 0:
+        sweep -= 2 * math.pi
+    points = _arc_points(cx, cy, r, r, start, sweep, scale)
+    points[-1] = (x2, y2)
+    return points[1:]
+
+
+def _rounded_rect_points(
+    x: float, y: float, w: float, h: float, rx: float, ry: float, scale: float
+) -> list[tuple[float, float]]:
+    """Outline of an SVG rect with corner radii, clamped as SVG clamps them.
+
+    The corners are the curves cairosvg draws (see _CORNER_CONTROLS).
+    """
+    rx, ry = min(rx, w / 2), min(ry, h / 2)
+    if rx == 0 or ry == 0:
+        return [(x, y), (x + w, y), (x + w, y + h), (x, y + h)]
+    starts = ((x + w - rx, y), (x + w, y + h - ry), (x + rx, y + h), (x, y + ry))
+    points = []
+    for (sx, sy), controls in zip(starts, _CORNER_CONTROLS):
+        p1, p2, p3 = ((sx + cx * rx, sy + cy * ry) for cx, cy in controls)
+        points.extend(_cubic_points(((sx, sy), p1, p2, p3), scale))
+    return points
+
+
+def _outline(shape: str, g: dict, scale: float) -> tuple[list, bool]:
+    """The shape's path in user units, as (points, closed)."""
+    if shape in ("rect", "rounded_rect"):
+        x, y, w, h = g.get("x", 0.0), g.get("y", 0.0), g["width"], g["height"]
+        if w == 0 or h == 0:
+            return [], True
+        if shape == "rect":
+            return [(x, y), (x + w, y), (x + w, y + h), (x, y + h)], True
+        rx = g["rx"]
+        return _rounded_rect_points(x, y, w, h, rx, g.get("ry", rx), scale), True
+    if shape in ("circle", "ellipse"):
+        rx = g["r"] if shape == "circle" else g["rx"]
+        ry = g["r"] if shape == "circle" else g["ry"]
+        if rx == 0 or ry == 0:
+            return [], True
+        return _ellipse_points(g["cx"], g["cy"], rx, ry, scale), True
+    if shape == "line":
+        return [(g["x1"], g["y1"]), (g["x2"], g["y2"])], False
+    if shape == "polygon":
+        return list(g["points"]), True
+
+    # arc: "M cx cy L start A r r 0 large sweep end", closed when pie.
+    cx, cy, r = g["cx"], g["cy"], g["r"]
+    start_angle, end_angle = g["start_angle"], g["end_angle"]
+    start_rad, end_rad = math.radians(start_angle), math.radians(end_angle)
+    # Endpoints are rounded as shapes.arc writes them, so a full turn has
+    # coinciding endpoints and draws no arc there either.
+    x1 = round(cx + r * math.cos(start_rad), 6)
+    y1 = round(cy + r * math.sin(start_rad), 6)
+    x2 = round(cx + r * math.cos(end_rad), 6)
+    y2 = round(cy + r * math.sin(end_rad), 6)
+    large_arc = abs(end_rad - start_rad) > math.pi
+    sweep_flag = end_angle > start_angle
+    points = [(cx, cy), (x1, y1)]
+    points.extend(_svg_arc(x1, y1, x2, y2, r, large_arc, sweep_flag, scale))
+    return points, g.get("pie", False)
+
+
+def _dedupe(points: list, closed: bool) -> list:
+    """Drop zero-length segments, which have no direction to stroke."""
+    result = []
+    for point in points:
+        if not result or math.dist(point, result[-1]) > 1e-9:
+            result.append(point)
+    if closed and len(result) > 1 and math.dist(result[0], result[-1]) <= 1e-9:
+        result.pop()
+    return result
+
+
+def _signed_area(points: list) -> float:
+    """Twice the signed area of a closed polygon (positive when clockwise on screen)."""
+    return sum(
+        x0 * y1 - x1 * y0 for (x0, y0), (x1, y1) in zip(points, points[1:] + points[:1])
+    )
+
+
+def _normal(p0: tuple, p1: tuple) -> tuple[float, float]:
+    """Unit normal of a segment, on its left when walking it on screen."""
+    dx, dy = p1[0] - p0[0], p1[1] - p0[1]
+    length = math.hypot(dx, dy)
+    return dy / length, -dx / length
+
+
+def _inverted(points: list, joins: list) -> bool:
+    """Whether an inward offset turned most of a closed contour around.
+
+    Offsetting a circle inward by more than its radius yields the circle
+    mirrored through its center, with the same orientation; only the edge
+    directions show that nothing of the interior is left uncovered. A few
+    short edges near sharp corners flip without that meaning anything.
+    """
+    count = len(points)
+    turned = total = 0.0
+    for i in range(count):
+        j = (i + 1) % count
+        dx, dy = points[j][0] - points[i][0], points[j][1] - points[i][1]
+        length = math.hypot(dx, dy)
+        total += length
+        # The offset of edge i runs from the end of join i to the start of join j.
+        (x0, y0), (x1, y1) = joins[i][-1], joins[j][0]
+        if dx * (x1 - x0) + dy * (y1 - y0) < 0:
+            turned += length
+    return turned > total / 2
+
+
+def _offset(points: list, distance: float, closed: bool) -> list:
+    """Offset a polyline sideways along its normals, with miter joins.
+
+    Joins on the outside of a turn are mitered up to the miter limit and
+    beveled beyond it; on the inside the offset segments are cut at their
+    intersection. Inside a turn sharp enough to bevel, offset segments that
+    do not meet alongside both segments are joined through the vertex, as
+    cairo's stroker joins them. Open ends are offset straight (butt caps).
+    Returns each vertex's join as a list of points: one (miter), two (bevel)
+    or three (through the vertex).
+    """
+    count = len(points)
+    normals = [
+        _normal(points[i], points[(i + 1) % count])
+        for i in range(count if closed else count - 1)
+    ]
+    result = []
+    for i, (px, py) in enumerate(points):
+        if not closed and i in (0, count - 1):
+            nx, ny = normals[0] if i == 0 else normals[-1]
+            result.append([(px + nx * distance, py + ny * distance)])
+            continue
+
+        (n1x, n1y), (n2x, n2y) = normals[i - 1], normals[i % len(normals)]
+        cos_turn = n1x * n2x + n1y * n2y
+        ex, ey = px - points[i - 1][0], py - points[i - 1][1]
+        outside = (n2x * ex + n2y * ey) * distance > 0
+        start = (px + n1x * distance, py + n1y * distance)
+        end = (px + n2x * distance, py + n2y * distance)
+        sharp = 1 + cos_turn < 2 / _MITER_LIMIT**2
+        if sharp and (outside or 1 + cos_turn < 1e-9):
+            result.append([start, end])
+            continue
+
+        factor = distance / (1 + cos_turn)
+        jx, jy = (n1x + n2x) * factor, (n1y + n2y) * factor
+        if sharp:
+            # The cut lies back along the incoming segment and forward along
+            # the outgoing one; past either end it would cut into the stroke.
+            nx, ny = points[(i + 1) % count]
+            fx, fy = nx - px, ny - py
+            if -(jx * ex + jy * ey) > ex * ex + ey * ey or (
+                jx * fx + jy * fy > fx * fx + fy * fy
+            ):
+                result.append([start, (px, py), end])
+                continue
+        result.append([(px + jx, py + jy)])
+    return result
+
+
+def _flatten(joins: list) -> list:
+    """The contour through a list of joins."""
+    return [point for join in joins for point in join]
+
+
+def _stroke_contours(points: list, closed: bool, width: float) -> list:
+    """Contours whose nonzero fill is the stroke of a path (SVG defaults)."""
+    points = _dedupe(points, closed)
+    if len(points) < 2:
+        return []
+    half = width / 2
+
+    area = _signed_area(points) if closed else 0.0
+    if closed and abs(area) < 1e-9:
+        # A closed path with no area strokes like its open walk around.
+        points, closed = points + points[:1], False
+    if not closed:
+        left = _flatten(_offset(points, half, closed=False))
+        right = _flatten(_offset(points, -half, closed=False))
+        return [left + right[::-1]]
+
+    if area < 0:
+        points = points[::-1]
+    # The positive contour's left normals point outward.
+    outer = _flatten(_offset(points, half, closed=True))
+    inner_joins = _offset(points, -half, closed=True)
+    if _inverted(points, inner_joins):
+        # The stroke is wider than the shape and covers its whole interior.
+        return [outer]
+    return [outer, _flatten(inner_joins)[::-1]]
+
+
+def _accumulate_edge(rows: list, p0: tuple, p1: tuple) -> None:
+    """Add one edge's signed area contributions to per-row coverage deltas.
+
+    Each touched cell receives the change in coverage the edge causes from the
+    previous cell in its row, so a running sum along a row yields the exact
+    area of every pixel covered by the closed contours.
+    """
+    (x0, y0), (x1, y1) = p0, p1
+    if y0 == y1:
+        return
+    if y0 < y1:
+        direction = 1.0
+    else:
+        direction = -1.0
+        x0, y0, x1, y1 = x1, y1, x0, y0
+    dxdy = (x1 - x0) / (y1 - y0)
+
+    top = max(y0, 0.0)
+    rows_range = range(int(top), min(len(rows), math.ceil(y1)))
+    if dxdy == 0:
+        # Vertical edges (rect sides) add the same split to every row they span.
+        lo_i = math.floor(x0)
+        frac = x0 - lo_i
+        for row in rows_range:
+            cells = rows[row]
+            d = (min(row + 1, y1) - max(row, top)) * direction
+            cells[lo_i] = cells.get(lo_i, 0.0) + d - d * frac
+            cells[lo_i + 1] = cells.get(lo_i + 1, 0.0) + d * frac
+        return
+
+    x = x0 + (top - y0) * dxdy
+    for row in rows_range:
+        cells = rows[row]
+        dy = min(row + 1, y1) - max(row, top)
+        x_next = x + dxdy * dy
+        d = dy * direction
+        x_lo, x_hi = (x, x_next) if x < x_next else (x_next, x)
+        lo_floor = math.floor(x_lo)
+        lo_i = int(lo_floor)
+        hi_i = math.ceil(x_hi)
+        if hi_i <= lo_i + 1:
+            # The edge stays within one cell on this row.
+            mid = (x + x_next) / 2 - lo_floor
+            cells[lo_i] = cells.get(lo_i, 0.0) + d - d * mid
+            cells[lo_i + 1] = cells.get(lo_i + 1, 0.0) + d * mid
+        else:
+            slope = 1 / (x_hi - x_lo)
+            lo_frac = x_lo - lo_floor
+            a0 = 0.5 * slope * (1 - lo_frac) ** 2
+            hi_frac = x_hi - hi_i + 1
+            am = 0.5 * slope * hi_frac**2
+            cells[lo_i] = cells.get(lo_i, 0.0) + d * a0
+            if hi_i == lo_i + 2:
+                cells[lo_i + 1] = cells.get(lo_i + 1, 0.0) + d * (1 - a0 - am)
+            else:
+                a1 = slope * (1.5 - lo_frac)
+                cells[lo_i + 1] = cells.get(lo_i + 1, 0.0) + d * (a1 - a0)
+                for xi in range(lo_i + 2, hi_i - 1):
+                    cells[xi] = cells.get(xi, 0.0) + d * slope
+                a2 = a1 + (hi_i - lo_i - 3) * slope
+                cells[hi_i - 1] = cells.get(hi_i - 1, 0.0) + d * (1 - a2 - am)
+            cells[hi_i] = cells.get(hi_i, 0.0) + d * am
+        x = x_next
+
+
+def _clip_edge(p0: tuple, p1: tuple, width: int) -> list:
+    """Split an edge where it leaves the canvas columns and clamp its x there.
+
+    Parts left of the canvas move onto its left border and parts right of it
+    onto the right border, which leaves the coverage of every pixel unchanged.
+    """
+    (x0, y0), (x1, y1) = p0, p1
+    if 0 <= x0 <= width and 0 <= x1 <= width:
+        return [(p0, p1)]
+    ts = sorted(
+        (border - x0) / (x1 - x0)
+        for border in (0, width)
+        if min(x0, x1) < border < max(x0, x1)
+    )
+    points = [(x0, y0)]
+    points.extend((x0 + (x1 - x0) * t, y0 + (y1 - y0) * t) for t in ts)
+    points.append((x1, y1))
+    points = [(min(max(x, 0.0), width), y) for x, y in points]
+    return list(zip(points, points[1:]))
+
+
+def _coverage(contours: list, width: int, height: int) -> Image.Image:
+    """Antialiased coverage mask ("L") of closed contours under the nonzero rule.
+
+    Coverage is the exact pixel area inside the contours (clamped to 1 where
+    they overlap), rather than a supersampled estimate as cairo computes.
+    Only cells an edge passes through are visited; the runs of constant
+    coverage between them are filled as whole slices.
+    """
+    rows = [{} for _ in range(height)]
+    for contour in contours:
+        for p0, p1 in zip(contour, contour[1:] + contour[:1]):
+            for q0, q1 in _clip_edge(p0, p1, width):
+                _accumulate_edge(rows, q0, q1)
+
+    mask = bytearray(width * height)
+    previous = None
+    for row, cells in enumerate(rows):
+        line = row * width
+        if cells == previous:
+            # Rows crossed by the same edges at the same columns are identical.
+            mask[line : line + width] = mask[line - width : line]
+            continue
+        previous = cells
+        # Cells right of the canvas only bring the row's sum back to zero.
+        columns = sorted(column for column in cells if column < width)
+        winding = 0.0
+        for column, end in zip(columns, columns[1:] + [width]):
+            winding += cells[column]
+            value = int(abs(winding) * 255 + 0.5)
+            if value:
+                if value > 255:
+                    value = 255
+                if end == column + 1:
+                    mask[line + column] = value
+                else:
+                    mask[line + column : line + end] = bytes((value,)) * (end - column)
+    return Image.frombytes("L", (width, height), bytes(mask))
+
+
+def _paint(coverage: Image.Image, color: tuple[int, int, int, int]) -> Image.Image:
+    """Straight RGBA layer of a color at a coverage mask."""
+    r, g, b, a = color
+    alpha = coverage.point([(v * a + 127) // 255 for v in range(256)])
+    return colored_alpha(alpha, (r, g, b))
+
+
+def render_shape(
+    shape: str,
+    size: tuple[Decimal | int | str, Decimal | int | str],
+    geometry: dict,
+    fill: tuple[int, int, int, int] | None = None,
+    stroke: tuple[int, int, int, int] | None = None,
+    stroke_width: Decimal | int | str = 0,
+) -> ICacheable:
+    """Rasterize a shape primitive directly, without building or parsing SVG.
+
+    Produces the image gfx:render_svg produces for the matching
+    ``invariant_gfx.shapes`` builder at the same size: the shape is fitted to
+    the builder's viewBox (centered, preserving aspect ratio), filled, then
+    stroked centered on its outline with SVG's default miter joins and butt
+    caps. Pixel coverage is computed analytically; cairo samples it, so edge
+    pixels differ from gfx:render_svg by up to two of cairo's coverage steps
+    (about 16 levels), and by much less on average.
+
+    Geometry keys per shape (optional keys in brackets):
+        rect: width, height, [x, y]
+        rounded_rect: width, height, rx, [ry, x, y]
+        circle: cx, cy, r
+        ellipse: cx, cy, rx, ry
+        line: x1, y1, x2, y2
+        polygon: points (list of [x, y])
+        arc: cx, cy, r, start_angle, end_angle (degrees), [pie]
+
+    Args:
+        shape: One of rect, rounded_rect, circle, ellipse, line, polygon, arc.
+        size: Tuple[Decimal | int | str, Decimal | int | str] (width, height)
+            of the output in pixels.
+        geometry: Dict of the shape's geometry in user units, as above.
+        fill: Optional RGBA fill color (0-255 per channel). Lines have no
+            fill; an open arc fills its pie slice, as in SVG.
+        stroke: Optional RGBA stroke color (0-255 per channel).
+        stroke_width: Stroke width in user units; no stroke is drawn at 0.
+
+    Returns:
+        ImageArtifact with the rasterized shape (RGBA mode).
+
+    Raises:
+        ValueError: If the shape, size, geometry or colors are invalid.
+    """
+    g = _parse_geometry(shape, geometry)
+    if not isinstance(size, (tuple, list)) or len(size) != 2:
+        raise ValueError(f"size must be a tuple/list of 2 values, got {type(size)}")
+    width = int(_to_float(size[0], "width"))
+    height = int(_to_float(size[1], "height"))
+    if width <= 0 or height <= 0:
+        raise ValueError(f"size must be positive, got {width}x{height}")
+    for color in (fill, stroke):
+        if color is not None:
+            validate_color(color)
+    line_width = _to_float(stroke_width, "stroke_width")
+    if line_width < 0:
+        raise ValueError(f"stroke_width must not be negative, got {stroke_width}")
+
+    image = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+    min_x, min_y, view_w, view_h = _viewbox(shape, g)
+    if view_w <= 0 or view_h <= 0:
+        # SVG disables rendering of an empty viewBox.
+        return ImageArtifact(image)
+
+    scale = min(width / view_w, height / view_h)
+    offset_x = (width - view_w * scale) / 2 - min_x * scale
+    offset_y = (height - view_h * scale) / 2 - min_y * scale
+    points, closed = _outline(shape, g, scale)
+    points = [(x * scale + offset_x, y * scale + offset_y) for x, y in points]
+
+    if fill is not None and fill[3] and len(points) > 2:
+        image = _paint(_coverage([points], width, height), fill)
+    if stroke is not None and stroke[3] and line_width > 0:
+        contours = _stroke_contours(points, closed, line_width * scale)
+        layer = _paint(_coverage(contours, width, height), stroke)
+        image = Image.alpha_composite(image, layer)
+    return ImageArtifact(image)
@@ -1,13 +1,126 @@
 """gfx:render_svg operation - converts SVG blobs into raster artifacts using cairosvg."""
 
+import copy
+import sys
 from decimal import Decimal
-from io import BytesIO
+from functools import lru_cache
 
-import cairosvg
-from PIL import Image
+from cairosvg.parser import Tree
+from cairosvg.surface import PNGSurface
+from PIL import Image, ImageMath
 
 from invariant.protocol import ICacheable
 from invariant_gfx.artifacts import BlobArtifact, ImageArtifact
+from invariant_gfx.icon_atlas import atlas_image
+
+# cairo ARGB32 pixels are native-endian 32-bit words, so the bytes in memory
+# are B, G, R, A on little-endian machines and A, R, G, B on big-endian ones.
+_CAIRO_RAW_MODE = "BGRA" if sys.byteorder == "little" else "ARGB"
+_SVG_TREE_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=_SVG_TREE_CACHE_SIZE)
+def _parsed_tree(svg_bytes: bytes) -> Tree:
+    """Parse SVG bytes once per process, however many sizes they render at.
+
+    The returned tree is never drawn; renders draw a ``_clone_tree`` of it.
+    """
+    return Tree(bytestring=svg_bytes)
+
+
+def _clone_tree(node):
+    """Copy a parsed node tree so drawing can mutate it.
+
+    cairosvg writes into nodes while drawing (resolved mask and pattern sizes,
+    path vertices, bounding boxes), so each render needs its own nodes. Only
+    the node dicts and children lists are copied; the XML elements and
+    stylesheets they reference are read-only and shared.
+    """
+    clone = copy.copy(node)
+    children = []
+    for child in node.children:
+        child_clone = _clone_tree(child)
+        if child.parent is node:
+            child_clone.parent = clone
+        children.append(child_clone)
+    clone.children = children
+    return clone
+
+
+def _render_surface(svg_bytes: bytes, width: int, height: int):
+    """Rasterize SVG bytes into an in-memory cairo ARGB32 image surface.
+
+    Performs the same steps as ``cairosvg.svg2png`` with its defaults, up to
+    but not including the PNG encode. The SVG is parsed once per process and
+    reused across sizes.
+    """
+    return _draw_tree(_parsed_tree(svg_bytes), width, height)
+
+
+def _draw_tree(tree: Tree, width: int, height: int):
+    """Draw a copy of a parsed tree into a new cairo ARGB32 image surface."""
+    surface = PNGSurface(
+        _clone_tree(tree),
+        None,
+        96,
+        output_width=width,
+        output_height=height,
+    )
+    return surface.cairo
+
+
+def _unpremultiply(args):
+    """Straight channel value, rounded as cairo's PNG writer rounds it."""
+    c, a = args["c"], args["a"]
+    return args["convert"]((c * 255 + a / 2) / a, "L")
+
+
+def _surface_to_image(surface) -> Image.Image:
+    """Convert a premultiplied cairo ARGB32 surface to a straight RGBA image.
+
+    Pillow's "RGBa" unpacker truncates when unpremultiplying, while cairo's
+    ``write_to_png`` rounds; channels are divided here with cairo's rounding
+    so the pixels are identical to decoding ``svg2png`` output.
+    """
+    surface.flush()
+    premultiplied = Image.frombuffer(
+        "RGBA",
+        (surface.get_width(), surface.get_height()),
+        surface.get_data(),
+        "raw",
+        _CAIRO_RAW_MODE,
+        surface.get_stride(),
+        1,
+    )
+    r, g, b, a = premultiplied.split()
+    if not any(a.histogram()[1:255]):
+        # Only opaque and fully transparent (all-zero) pixels: nothing to divide.
+        return premultiplied
+
+    channels = [ImageMath.lambda_eval(_unpremultiply, c=c, a=a) for c in (r, g, b)]
+    return Image.merge("RGBA", (*channels, a))
+
+
+def _to_dimension(value: Decimal | int | str, name: str) -> int:
+    """Convert a pixel dimension param to int (handles Decimal, int, or string)."""
+    if isinstance(value, (Decimal, int, str)):
+        return int(value)
+    raise ValueError(f"{name} must be Decimal, int, or str, got {type(value)}")
+
+
+def _svg_bytes(svg_content: str | bytes | BlobArtifact) -> bytes:
+    """Extract SVG bytes from an svg_content param."""
+    if isinstance(svg_content, str):
+        # Inline SVG string - encode to bytes
+        return svg_content.encode("utf-8")
+    if isinstance(svg_content, bytes):
+        # Raw bytes (e.g., from ${blob.data} expression)
+        return svg_content
+    if isinstance(svg_content, BlobArtifact):
+        return svg_content.data
+    raise ValueError(
+        f"svg_content must be str, bytes, or BlobArtifact, got {type(svg_content)}"
+    )
 
 
 def render_svg(
@@ -28,56 +141,23 @@ def render_svg(
     Raises:
         ValueError: If SVG cannot be rendered or dimensions are invalid.
     """
-    # Convert to int (handles Decimal, int, or string)
-    if isinstance(width, Decimal):
-        width_int = int(width)
-    elif isinstance(width, (int, str)):
-        width_int = int(width)
-    else:
-        raise ValueError(f"width must be Decimal, int, or str, got {type(width)}")
-
-    if isinstance(height, Decimal):
-        height_int = int(height)
-    elif isinstance(height, (int, str)):
-        height_int = int(height)
-    else:
-        raise ValueError(f"height must be Decimal, int, or str, got {type(height)}")
-
+    width_int = _to_dimension(width, "width")
+    height_int = _to_dimension(height, "height")
     if width_int <= 0 or height_int <= 0:
         raise ValueError(f"size must be positive, got {width_int}x{height_int}")
 
-    # Extract SVG bytes from svg_content
-    if isinstance(svg_content, str):
-        # Inline SVG string - encode to bytes
-        svg_bytes = svg_content.encode("utf-8")
-    elif isinstance(svg_content, bytes):
-        # Raw bytes (e.g., from ${blob.data} expression)
-        svg_bytes = svg_content
-    elif isinstance(svg_content, BlobArtifact):
-        # BlobArtifact - extract data
-        svg_bytes = svg_content.data
-    else:
-        raise ValueError(
-            f"svg_content must be str, bytes, or BlobArtifact, got {type(svg_content)}"
-        )
-
-    # Render SVG to PNG using cairosvg
-    try:
-        png_bytes = cairosvg.svg2png(
-            bytestring=svg_bytes,
-            output_width=width_int,
-            output_height=height_int,
-        )
-    except Exception as e:
-        raise ValueError(f"gfx:render_svg failed to render SVG: {e}") from e
+    svg_bytes = _svg_bytes(svg_content)
 
-    # Parse PNG into PIL Image
+    image = atlas_image(svg_bytes, (width_int, height_int))
+    if image is not None:
+        return ImageArtifact(image)
+
+    # Render into a cairo image surface and read its pixels directly; going
+    # through svg2png would deflate a PNG only to inflate it again.
     try:
-        image = Image.open(BytesIO(png_bytes))
-        # Convert to RGBA mode
-        if image.mode != "RGBA":
-            image = image.convert("RGBA")
+        surface = _render_surface(svg_bytes, width_int, height_int)
+        image = _surface_to_image(surface)
     except Exception as e:
-        raise ValueError(f"gfx:render_svg failed to parse rendered PNG: {e}") from e
+        raise ValueError(f"gfx:render_svg failed to render SVG: {e}") from e
 
     return ImageArtifact(image)
@@ -0,0 +1,79 @@
+"""gfx:render_svg_sizes operation - rasterizes one SVG at a ladder of sizes."""
+
+from decimal import Decimal
+
+from invariant_gfx.artifacts import BlobArtifact, ImageArtifact
+from invariant_gfx.icon_atlas import atlas_image
+from invariant_gfx.ops.render_svg import (
+    _draw_tree,
+    _parsed_tree,
+    _surface_to_image,
+    _svg_bytes,
+    _to_dimension,
+)
+
+
+def render_svg_sizes(
+    svg_content: str | bytes | BlobArtifact,
+    sizes: list[Decimal | int | str | list[Decimal | int | str]],
+) -> dict[str, ImageArtifact]:
+    """Rasterize one SVG at several sizes in a single node.
+
+    Equivalent to one gfx:render_svg node per size, but the SVG is extracted
+    and parsed once and every raster is drawn from the same parsed tree.
+    Repeated sizes are rendered once, and sizes held by a loaded icon atlas
+    are not rendered at all.
+
+    Args:
+        svg_content: str (inline SVG XML), bytes, or BlobArtifact
+        sizes: list of sizes, in output order. Each entry is a single
+            Decimal | int | str (square raster of that many pixels) or a
+            [width, height] pair. Must not be empty.
+
+    Returns:
+        Dict of ImageArtifacts (RGBA mode) in sizes order, keyed "48" for a
+        square size and "96x64" for a pair, each identical to gfx:render_svg's
+        output at that size. Each raster is its own artifact; a downstream
+        ``stdlib:dict_get`` node selects one by key.
+
+    Raises:
+        ValueError: If SVG cannot be rendered or any size is invalid.
+    """
+    if not isinstance(sizes, (list, tuple)) or not sizes:
+        raise ValueError(f"sizes must be a non-empty list, got {sizes!r}")
+
+    dimensions = [_to_dimensions(size, f"sizes[{i}]") for i, size in enumerate(sizes)]
+    svg_bytes = _svg_bytes(svg_content)
+
+    images = {}
+    tree = None
+    try:
+        for width, height in dimensions:
+            key = str(width) if width == height else f"{width}x{height}"
+            if key in images:
+                continue
+            image = atlas_image(svg_bytes, (width, height))
+            if image is None:
+                if tree is None:
+                    tree = _parsed_tree(svg_bytes)
+                image = _surface_to_image(_draw_tree(tree, width, height))
+            images[key] = ImageArtifact(image)
+    except Exception as e:
+        raise ValueError(f"gfx:render_svg_sizes failed to render SVG: {e}") from e
+
+    return images
+
+
+def _to_dimensions(size, name: str) -> tuple[int, int]:
+    """Convert one sizes entry to (width, height)."""
+    if isinstance(size, (list, tuple)):
+        if len(size) != 2:
+            raise ValueError(f"{name} must be a size or [width, height], got {size}")
+        width = _to_dimension(size[0], f"{name}[0]")
+        height = _to_dimension(size[1], f"{name}[1]")
+    else:
+        width = height = _to_dimension(size, name)
+
+    if width <= 0 or height <= 0:
+        raise ValueError(f"size must be positive, got {width}x{height}")
+    return width, height
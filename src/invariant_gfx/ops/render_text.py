@@ -1,20 +1,34 @@
 """gfx:render_text operation - creates tight-fitting text artifacts using Pillow."""
 
-from collections.abc import Callable
+import hashlib
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
 from decimal import Decimal
 from functools import lru_cache
 from io import BytesIO
+from typing import NamedTuple
 
 from PIL import Image, ImageDraw, ImageFont
 from justmytype import get_default_registry
 
 from invariant.protocol import ICacheable
-from invariant_gfx.artifacts import BlobArtifact, ImageArtifact
-
-_FIT_WIDTH_REFERENCE_SIZE = 64
-_FIT_WIDTH_MIN_FILL_PERCENT = 95
-_FIT_WIDTH_MAX_PROBES = 4
-_FONT_BLOB_DATA: dict[str, bytes] = {}
+from invariant_gfx.artifacts import BlobArtifact, ImageArtifact, MaskArtifact
+from invariant_gfx.colors import validate_color
+from invariant_gfx.font_index import indexed_font_path, record_font_path
+
+# Large enough that per-glyph hinting is negligible against the text width
+_FIT_WIDTH_REFERENCE_SIZE = 1000
+_TEXT_BBOX_CACHE_SIZE = 8192
+_TEXT_MASK_CACHE_SIZE = 256
+# ImageDraw.text / multiline_textbbox default line spacing
+_MULTILINE_SPACING = 4
+_FONT_BLOB_CACHE_BYTES = 64 * 1024 * 1024
+# Per-atlas entry limits; an atlas that outgrows one starts that table afresh
+_GLYPH_ATLAS_MAX_GLYPHS = 4096
+_GLYPH_ATLAS_MAX_PAIRS = 16384
 
 
 @lru_cache(maxsize=256)
@@ -23,7 +37,11 @@ def _resolve_font_path_cached(
     weight: int | None,
     style: str,
 ) -> str:
-    """Resolve a font family to a filesystem path."""
+    """Resolve a font family to a filesystem path, consulting the font index first."""
+    indexed = indexed_font_path(font, weight, style)
+    if indexed is not None:
+        return indexed
+
     registry = get_default_registry()
     font_info = registry.find_font(font, weight=weight, style=style)
 
@@ -33,7 +51,9 @@ def _resolve_font_path_cached(
             f"(weight={weight}, style={style})"
         )
 
-    return str(font_info.path)
+    path = str(font_info.path)
+    record_font_path(font, weight, style, path)
+    return path
 
 
 @lru_cache(maxsize=512)
@@ -42,10 +62,260 @@ def _load_font_path_cached(path: str, size_int: int) -> ImageFont.FreeTypeFont:
     return ImageFont.truetype(path, size=size_int)
 
 
-@lru_cache(maxsize=512)
-def _load_font_blob_cached(blob_hash: str, size_int: int) -> ImageFont.FreeTypeFont:
-    """Load font bytes as a PIL ImageFont."""
-    return ImageFont.truetype(BytesIO(_FONT_BLOB_DATA[blob_hash]), size=size_int)
+class FontBlobCacheInfo(NamedTuple):
+    """Statistics for the font blob cache (see ``font_blob_cache_info``)."""
+
+    hits: int
+    misses: int
+    evictions: int
+    fonts: int
+    nbytes: int
+    max_bytes: int
+
+
+class _FontBlobCache:
+    """Byte-budgeted LRU of fonts loaded from BlobArtifact bytes.
+
+    Keyed by (blob hash, size). FreeType keeps a private copy of the font file
+    for every face loaded from memory, so each entry is weighed at the size of
+    its blob. The bytes are not retained separately: the BlobArtifact passed to
+    every call supplies them again when an evicted size is reloaded.
+
+    The caches built on loaded fonts (measurements, masks, glyph atlases) key
+    on ``_FontRef`` and hold fonts weakly, so an evicted font is freed once no
+    render is using it and the statistics describe what is resident.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self._lock = threading.RLock()
+        # (blob hash, size) -> (font, weighed bytes), least recently used first
+        self._fonts: OrderedDict[
+            tuple[str, int], tuple[ImageFont.FreeTypeFont, int]
+        ] = OrderedDict()
+        self._nbytes = 0
+        self._max_bytes = max_bytes
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def load(self, font: BlobArtifact, size_int: int) -> ImageFont.FreeTypeFont:
+        """Return the cached font for the blob at this size, loading it on a miss."""
+        key = (font.get_stable_hash(), size_int)
+        with self._lock:
+            entry = self._fonts.get(key)
+            if entry is not None:
+                self._fonts.move_to_end(key)
+                self._hits += 1
+                return entry[0]
+            self._misses += 1
+
+        pil_font = ImageFont.truetype(BytesIO(font.data), size=size_int)
+        _font_ref(pil_font, digest=key[0])
+        with self._lock:
+            if key not in self._fonts and len(font.data) <= self._max_bytes:
+                self._fonts[key] = (pil_font, len(font.data))
+                self._nbytes += len(font.data)
+                self._evict(self._max_bytes)
+        return pil_font
+
+    def set_max_bytes(self, max_bytes: int) -> None:
+        """Change the budget, evicting least recently used fonts to fit."""
+        with self._lock:
+            self._max_bytes = max_bytes
+            self._evict(max_bytes)
+
+    def clear(self) -> None:
+        """Drop every cached font and reset the statistics."""
+        with self._lock:
+            self._fonts.clear()
+            self._nbytes = 0
+            self._hits = self._misses = self._evictions = 0
+
+    def info(self) -> FontBlobCacheInfo:
+        """Snapshot of the cache statistics."""
+        with self._lock:
+            return FontBlobCacheInfo(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                fonts=len(self._fonts),
+                nbytes=self._nbytes,
+                max_bytes=self._max_bytes,
+            )
+
+    def _evict(self, max_bytes: int) -> None:
+        while self._nbytes > max_bytes:
+            _, (_, size) = self._fonts.popitem(last=False)
+            self._nbytes -= size
+            self._evictions += 1
+
+
+_FONT_BLOB_CACHE = _FontBlobCache(_FONT_BLOB_CACHE_BYTES)
+
+
+def font_blob_cache_info() -> FontBlobCacheInfo:
+    """Statistics for the process-wide cache of fonts loaded from BlobArtifacts.
+
+    Returns:
+        FontBlobCacheInfo with hit, miss and eviction counts, the number of
+        cached (font, size) entries, their weighed size in bytes, and the
+        byte budget.
+    """
+    return _FONT_BLOB_CACHE.info()
+
+
+def set_font_blob_cache_budget(max_bytes: int) -> None:
+    """Set the byte budget of the process-wide font blob cache.
+
+    Least recently used (font, size) entries are evicted until the cache fits.
+    A font whose file is larger than the whole budget is loaded on every use
+    instead of being cached. The default budget is 64 MiB.
+
+    Args:
+        max_bytes: Budget in bytes (non-negative int); 0 disables caching.
+
+    Raises:
+        ValueError: If max_bytes is not a non-negative int.
+    """
+    if not isinstance(max_bytes, int) or isinstance(max_bytes, bool) or max_bytes < 0:
+        raise ValueError(f"max_bytes must be a non-negative int, got {max_bytes!r}")
+    _FONT_BLOB_CACHE.set_max_bytes(max_bytes)
+
+
+class _GlyphAtlas:
+    """Per-(font, size) cache of rasterized glyph masks, advances and kerning.
+
+    Reproduces Pillow's basic-layout text rendering: each glyph is drawn at the
+    pen position rounded to whole pixels (glyph bitmaps do not depend on the
+    sub-pixel offset), and overlapping glyphs are merged with the same rounded
+    "over" Pillow applies, which an L-mode paste of 255 through the glyph mask
+    computes exactly. Pen positions are tracked in 26.6 fixed point, and the
+    line's bounding box is the union of the per-glyph boxes at those positions.
+
+    The atlas lives as long as its font (see ``_glyph_atlas``) and refers to it
+    weakly. Each table holds at most ``_GLYPH_ATLAS_MAX_GLYPHS`` glyphs or
+    ``_GLYPH_ATLAS_MAX_PAIRS`` kerning pairs and is cleared when it would grow
+    past that, so text drawing on a large character set cannot grow it without
+    bound.
+    """
+
+    def __init__(self, pil_font: ImageFont.FreeTypeFont) -> None:
+        self._font_ref = weakref.ref(pil_font)
+        # char -> (bbox at the origin, coverage mask or None for blank glyphs)
+        self._glyphs: dict[
+            str, tuple[tuple[int, int, int, int], Image.Image | None]
+        ] = {}
+        self._advances: dict[str, int] = {}
+        self._kerning: dict[tuple[str, str], int] = {}
+
+    @property
+    def _font(self) -> ImageFont.FreeTypeFont:
+        return self._font_ref()
+
+    def _glyph(self, char: str) -> tuple[tuple[int, int, int, int], Image.Image | None]:
+        """Bounding box of char drawn at the origin and its mask, rasterized once."""
+        glyph = self._glyphs.get(char)
+        if glyph is None:
+            left, top, right, bottom = self._font.getbbox(char)
+            mask = None
+            if right > left and bottom > top:
+                mask = Image.new("L", (right - left, bottom - top), 0)
+                ImageDraw.Draw(mask).text(
+                    (-left, -top), char, font=self._font, fill=255
+                )
+            if len(self._glyphs) >= _GLYPH_ATLAS_MAX_GLYPHS:
+                self._glyphs.clear()
+            glyph = self._glyphs[char] = ((left, top, right, bottom), mask)
+        return glyph
+
+    def _advance(self, char: str) -> int:
+        """Advance width of char in 26.6 fixed point."""
+        advance = self._advances.get(char)
+        if advance is None:
+            if len(self._advances) >= _GLYPH_ATLAS_MAX_GLYPHS:
+                self._advances.clear()
+            advance = self._advances[char] = round(self._font.getlength(char) * 64)
+        return advance
+
+    def _kern(self, left: str, right: str) -> int:
+        """Kerning adjustment between a glyph pair in 26.6 fixed point."""
+        pair = (left, right)
+        kerning = self._kerning.get(pair)
+        if kerning is None:
+            if len(self._kerning) >= _GLYPH_ATLAS_MAX_PAIRS:
+                self._kerning.clear()
+            kerning = self._kerning[pair] = (
+                round(self._font.getlength(left + right) * 64)
+                - self._advance(left)
+                - self._advance(right)
+            )
+        return kerning
+
+    def advance(self, text: str) -> int:
+        """Pen advance of text in 26.6 fixed point, including kerning."""
+        pen = 0
+        for i, char in enumerate(text):
+            pen += self._advance(char)
+            if i + 1 < len(text):
+                pen += self._kern(char, text[i + 1])
+        return pen
+
+    def text_mask(self, text: str, padding: int) -> Image.Image:
+        """Coverage mask of a non-empty single line, tight to its bbox plus padding."""
+        placed = []
+        pen = 0
+        for i, char in enumerate(text):
+            placed.append(((pen + 32) >> 6, self._glyph(char)))
+            pen += self._advance(char)
+            if i + 1 < len(text):
+                pen += self._kern(char, text[i + 1])
+
+        left = min(x + box[0] for x, (box, _) in placed)
+        top = min(box[1] for _, (box, _) in placed)
+        right = max(x + box[2] for x, (box, _) in placed)
+        bottom = max(box[3] for _, (box, _) in placed)
+
+        mask = Image.new(
+            "L", (right - left + padding * 2, bottom - top + padding * 2), 0
+        )
+        for x, (box, glyph) in placed:
+            if glyph is not None:
+                gx = padding - left + x + box[0]
+                gy = padding - top + box[1]
+                mask.paste(255, (gx, gy, gx + glyph.width, gy + glyph.height), glyph)
+        return mask
+
+
+_GLYPH_ATLASES: "weakref.WeakKeyDictionary[ImageFont.FreeTypeFont, _GlyphAtlas]" = (
+    weakref.WeakKeyDictionary()
+)
+_GLYPH_ATLASES_LOCK = threading.Lock()
+
+
+def _glyph_atlas(pil_font: ImageFont.FreeTypeFont) -> _GlyphAtlas:
+    """Return the shared glyph atlas for a loaded font.
+
+    Atlases are held weakly by their font, so one is released together with
+    the font when it drops out of the font caches.
+    """
+    with _GLYPH_ATLASES_LOCK:
+        atlas = _GLYPH_ATLASES.get(pil_font)
+        if atlas is None:
+            atlas = _GLYPH_ATLASES[pil_font] = _GlyphAtlas(pil_font)
+        return atlas
+
+
+def _uses_glyph_atlas(text: str, pil_font: ImageFont.FreeTypeFont) -> bool:
+    """Whether text can be assembled from cached glyphs with identical output.
+
+    Multiline text keeps ImageDraw's line handling, and complex (raqm) layout
+    may substitute or reposition glyphs by context, so both render directly.
+    """
+    return (
+        bool(text)
+        and "\n" not in text
+        and pil_font.layout_engine == ImageFont.Layout.BASIC
+    )
 
 
 def _load_font(
@@ -73,9 +343,7 @@ def _load_font(
 
     elif isinstance(font, BlobArtifact):
         try:
-            blob_hash = font.get_stable_hash()
-            _FONT_BLOB_DATA.setdefault(blob_hash, font.data)
-            return _load_font_blob_cached(blob_hash, size_int)
+            return _FONT_BLOB_CACHE.load(font, size_int)
         except Exception as e:
             raise ValueError(
                 f"gfx:render_text failed to load font from BlobArtifact: {e}"
@@ -85,6 +353,93 @@ def _load_font(
         raise ValueError(f"font must be a string or BlobArtifact, got {type(font)}")
 
 
+def preload_fonts(
+    font: str | BlobArtifact,
+    sizes: Iterable[Decimal | int | str],
+    weight: int | None = None,
+    style: str = "normal",
+) -> None:
+    """Resolve and open a font at the given sizes ahead of traffic.
+
+    Loaded fonts go into the same caches gfx:render_text, gfx:render_text_batch
+    and gfx:packed_text use, so the first render at a preloaded size skips font
+    resolution and FreeType setup.
+
+    Args:
+        font: String (font family name) or BlobArtifact (font file bytes)
+        sizes: Font sizes in points to open.
+        weight: int | None (font weight 100-900, optional, only for string fonts)
+        style: str (font style: "normal" or "italic", default "normal", only for string fonts)
+
+    Raises:
+        ValueError: If the font cannot be loaded or a size is invalid.
+    """
+    for size in sizes:
+        _load_font(font, _parse_size(size), weight, style)
+
+
+class _FontRef:
+    """Cache key standing for a loaded font by a stable identity.
+
+    Equal for fonts loaded from the same file (or the same bytes) at the same
+    size, face index, encoding and layout engine, so a font that is evicted
+    and reloaded finds its measurements again. The font itself is held
+    weakly: caches keyed on it do not keep fonts alive.
+    """
+
+    __slots__ = ("key", "_font", "_hash")
+
+    def __init__(
+        self, pil_font: ImageFont.FreeTypeFont, digest: str | None = None
+    ) -> None:
+        source = pil_font.path
+        if isinstance(source, (str, bytes, os.PathLike)):
+            source = ("path", os.fspath(source))
+        else:
+            if digest is None:
+                digest = hashlib.sha256(pil_font.font_bytes).hexdigest()
+            source = ("data", digest)
+        self.key = (
+            source,
+            pil_font.size,
+            pil_font.index,
+            pil_font.encoding,
+            pil_font.layout_engine,
+        )
+        self._font = weakref.ref(pil_font)
+        self._hash = hash(self.key)
+
+    @property
+    def font(self) -> ImageFont.FreeTypeFont:
+        """The font this key was made from (alive while its caller holds it)."""
+        return self._font()
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _FontRef) and self.key == other.key
+
+
+_FONT_REFS: "weakref.WeakKeyDictionary[ImageFont.FreeTypeFont, _FontRef]" = (
+    weakref.WeakKeyDictionary()
+)
+_FONT_REFS_LOCK = threading.Lock()
+
+
+def _font_ref(pil_font: ImageFont.FreeTypeFont, digest: str | None = None) -> _FontRef:
+    """Return the stable cache key of a loaded font, computing it once per font.
+
+    ``digest`` is the SHA-256 of the font bytes when the caller already knows
+    it, which spares hashing a font loaded from memory again.
+    """
+    with _FONT_REFS_LOCK:
+        ref = _FONT_REFS.get(pil_font)
+        if ref is None:
+            ref = _FONT_REFS[pil_font] = _FontRef(pil_font, digest)
+        return ref
+
+
 def _measure_loaded_text(
     text: str, pil_font: ImageFont.FreeTypeFont
 ) -> tuple[int, int]:
@@ -95,18 +450,69 @@ def _measure_loaded_text(
     return (width, height)
 
 
+class TextMeasurementCacheInfo(NamedTuple):
+    """Statistics for the cache behind ``text_measurement_cache_info``."""
+
+    hits: int
+    misses: int
+    maxsize: int | None
+    currsize: int
+
+
+def text_measurement_cache_info() -> TextMeasurementCacheInfo:
+    """Hit/miss counters of the process-wide text measurement cache.
+
+    Returns:
+        TextMeasurementCacheInfo with the ``functools.lru_cache`` statistics
+        (hits, misses, maxsize, currsize) for the (font, size, string) -> bbox
+        lookups shared by gfx:render_text and gfx:packed_text.
+    """
+    return TextMeasurementCacheInfo(*_cached_text_bbox.cache_info())
+
+
 def _text_bbox(
     text: str, pil_font: ImageFont.FreeTypeFont
 ) -> tuple[int, int, int, int]:
-    """Return the text bounding box, preserving multiline ImageDraw behavior."""
+    """Return the text bounding box, preserving multiline ImageDraw behavior.
+
+    Cached process-wide per (string, font identity); see ``_FontRef``.
+    """
+    return _cached_text_bbox(text, _font_ref(pil_font))
+
+
+@lru_cache(maxsize=_TEXT_BBOX_CACHE_SIZE)
+def _cached_text_bbox(text: str, font_ref: _FontRef) -> tuple[int, int, int, int]:
+    """Measure text on a ``_text_bbox`` cache miss."""
+    pil_font = font_ref.font
     if "\n" in text:
-        temp_image = Image.new("RGBA", (1, 1), (0, 0, 0, 0))
-        temp_draw = ImageDraw.Draw(temp_image)
-        return temp_draw.textbbox((0, 0), text, font=pil_font)
+        return _multiline_bbox(text, pil_font)
 
     return pil_font.getbbox(text)
 
 
+def _multiline_bbox(
+    text: str, pil_font: ImageFont.FreeTypeFont
+) -> tuple[int, int, int, int]:
+    """Bounding box of multiline text, as ImageDraw.multiline_textbbox computes it.
+
+    ImageDraw advances each left-aligned line by the bottom of "A" plus its
+    default 4px spacing and unions the per-line boxes; doing the same from the
+    font directly avoids allocating a scratch image and drawing context, and
+    the "A" box comes from the measurement cache instead of being re-laid out.
+    """
+    line_spacing = _text_bbox("A", pil_font)[3] + _MULTILINE_SPACING
+    lines = text.split("\n")
+    left, top, right, bottom = pil_font.getbbox(lines[0])
+    for i, line in enumerate(lines[1:], start=1):
+        x0, y0, x1, y1 = pil_font.getbbox(line)
+        offset = i * line_spacing
+        left = min(left, x0)
+        top = min(top, y0 + offset)
+        right = max(right, x1)
+        bottom = max(bottom, y1 + offset)
+    return (left, top, right, bottom)
+
+
 def _measure_text_width(
     text: str,
     font: str | BlobArtifact,
@@ -119,32 +525,60 @@ def _measure_text_width(
     return _measure_loaded_text(text, pil_font)
 
 
-def _render_at_size(
-    text: str,
-    pil_font: ImageFont.FreeTypeFont,
-    color: tuple[int, int, int, int],
-) -> ImageArtifact:
-    """Render text with the given font to a tight-fitting ImageArtifact."""
+def _text_mask(text: str, pil_font: ImageFont.FreeTypeFont) -> Image.Image:
+    """Coverage mask of text in a loaded font, tight to its bbox plus padding.
+
+    The mask does not depend on color, so every color of a label shares one
+    rasterization. Cached process-wide per (string, font identity), like
+    ``_text_bbox``. Callers must not modify the returned image.
+    """
+    return _cached_text_mask(text, _font_ref(pil_font))
+
+
+@lru_cache(maxsize=_TEXT_MASK_CACHE_SIZE)
+def _cached_text_mask(text: str, font_ref: _FontRef) -> Image.Image:
+    """Rasterize text on a ``_text_mask`` cache miss."""
+    pil_font = font_ref.font
+    padding = 2
+
+    if _uses_glyph_atlas(text, pil_font):
+        return _glyph_atlas(pil_font).text_mask(text, padding)
+
     bbox = _text_bbox(text, pil_font)
 
     text_width = max(0, bbox[2] - bbox[0])
     text_height = max(0, bbox[3] - bbox[1])
 
-    padding = 2
-    image_width = text_width + padding * 2
-    image_height = text_height + padding * 2
+    mask = Image.new("L", (text_width + padding * 2, text_height + padding * 2), 0)
+    draw = ImageDraw.Draw(mask)
+    draw.text((padding - bbox[0], padding - bbox[1]), text, font=pil_font, fill=255)
+    return mask
 
-    image = Image.new("RGBA", (image_width, image_height), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(image)
 
-    r, g, b, a = color
-    text_x = padding - bbox[0]
-    text_y = padding - bbox[1]
-    draw.text((text_x, text_y), text, font=pil_font, fill=(r, g, b, a))
+def _render_at_size(
+    text: str,
+    pil_font: ImageFont.FreeTypeFont,
+    color: tuple[int, int, int, int],
+) -> ImageArtifact:
+    """Render text with the given font to a tight-fitting ImageArtifact.
 
+    The color is applied to the cached coverage mask from ``_text_mask``.
+    Single-line text is assembled from the font's glyph atlas, so repeated
+    characters are rasterized once; the output is pixel-identical to drawing
+    the string in color with ImageDraw.
+    """
+    mask = _text_mask(text, pil_font)
+    image = Image.new("RGBA", mask.size, (0, 0, 0, 0))
+    # Filling through the coverage mask is exactly what ImageDraw.text does
+    image.paste(tuple(color), mask=mask)
     return ImageArtifact(image)
 
 
+def _render_mask_at_size(text: str, pil_font: ImageFont.FreeTypeFont) -> MaskArtifact:
+    """Render the coverage mask of text as a MaskArtifact."""
+    return MaskArtifact(_text_mask(text, pil_font).copy())
+
+
 def _fit_width_font_size(
     text: str,
     font: str | BlobArtifact,
@@ -154,7 +588,16 @@ def _fit_width_font_size(
     exact: bool = False,
     measure_width: Callable[[int], int] | None = None,
 ) -> int:
-    """Find a font size that fits and visually fills the requested width."""
+    """Find the largest font size whose rendered text fits the requested width.
+
+    Text width scales linearly with font size apart from hinting, which rounds
+    each glyph to whole pixels. One measurement at a large reference size,
+    where that rounding is negligible, gives the width per pixel of font size,
+    so the fitting size is computed directly and confirmed with a single
+    measurement. Hinting can move the true boundary a size or so either way:
+    an estimate that overflows steps down until it fits, and ``exact`` also
+    steps up while the next size still fits.
+    """
     fit_width_int = int(fit_width)
     if fit_width_int <= 0:
         return 1
@@ -176,72 +619,48 @@ def _fit_width_font_size(
             )
         return measured_widths[size_int]
 
-    def fills_well(width: int) -> bool:
-        return width * 100 >= fit_width_int * _FIT_WIDTH_MIN_FILL_PERCENT
-
-    if exact:
-        best = 1
-        lower = low
-        upper = high
-        while lower <= upper:
-            mid = (lower + upper) // 2
-            if width_at(mid) <= fit_width_int:
-                best = mid
-                lower = mid + 1
-            else:
-                upper = mid - 1
-        return best
-
-    reference_size = min(_FIT_WIDTH_REFERENCE_SIZE, high)
-    reference_width = width_at(reference_size)
+    reference_width = width_at(_FIT_WIDTH_REFERENCE_SIZE)
     if reference_width <= 0:
         return high
 
-    estimate = (fit_width_int * reference_size) // reference_width
+    estimate = (fit_width_int * _FIT_WIDTH_REFERENCE_SIZE) // reference_width
     candidate = max(low, min(high, estimate))
-    best_fit = 1
-    first_too_wide = high + 1
-
-    for _ in range(_FIT_WIDTH_MAX_PROBES):
-        width = width_at(candidate)
-        if width <= fit_width_int:
-            best_fit = candidate
-            if fills_well(width):
-                return candidate
-            if candidate >= high or candidate + 1 >= first_too_wide:
-                return candidate
-
-            next_candidate = (candidate * fit_width_int) // max(width, 1)
-            next_candidate = max(candidate + 1, next_candidate)
-            candidate = min(high, first_too_wide - 1, next_candidate)
-            continue
-
-        first_too_wide = candidate
-        if candidate <= low:
-            return best_fit
-
-        next_candidate = (candidate * fit_width_int) // width
-        next_candidate = min(candidate - 1, max(low, next_candidate))
-        if next_candidate <= best_fit:
-            if best_fit + 1 >= first_too_wide:
-                return best_fit
-            next_candidate = (best_fit + first_too_wide) // 2
-            if next_candidate <= best_fit:
-                return best_fit
-        candidate = next_candidate
-
-    return best_fit
+
+    if width_at(candidate) > fit_width_int:
+        while candidate > low and width_at(candidate) > fit_width_int:
+            candidate -= 1
+        return candidate
+
+    if exact:
+        while candidate < high and width_at(candidate + 1) <= fit_width_int:
+            candidate += 1
+    return candidate
+
+
+def _parse_size(size: Decimal | int | str) -> int:
+    """Convert a font size param to a positive int."""
+    if isinstance(size, Decimal):
+        size_int = int(size)
+    elif isinstance(size, (int, str)):
+        size_int = int(size)
+    else:
+        raise ValueError(f"size must be Decimal, int, or str, got {type(size)}")
+
+    if size_int <= 0:
+        raise ValueError(f"size must be positive, got {size_int}")
+    return size_int
 
 
 def render_text(
     text: str,
     font: str | BlobArtifact,
-    color: tuple[int, int, int, int],
+    color: tuple[int, int, int, int] | None = None,
     size: Decimal | int | str | None = None,
     fit_width: Decimal | int | None = None,
     weight: int | None = None,
     style: str = "normal",
     exact: bool = False,
+    as_mask: bool = False,
 ) -> ICacheable:
     """Create a tight-fitting "Text Pill" artifact using Pillow.
 
@@ -250,21 +669,26 @@ def render_text(
     Args:
         text: String content to render
         font: String (font family name) or BlobArtifact (font file bytes)
-        color: Tuple[int, int, int, int] (RGBA, 0-255 per channel)
+        color: Tuple[int, int, int, int] (RGBA, 0-255 per channel). Required
+            unless as_mask is True.
         size: Decimal | int | str (font size in points). Use when fixed size is desired.
-        fit_width: Decimal | int (target max width in pixels). Use to estimate a
+        fit_width: Decimal | int (target max width in pixels). Use to compute a
             font size that fits text within the width. Mutually exclusive with size.
-        exact: bool (default False). When fit_width is provided, use True to find
-            the largest fitting font size instead of the faster good-enough estimate.
+        exact: bool (default False). When fit_width is provided, use True to also
+            check the next sizes up so the largest fitting font size is returned.
         weight: int | None (font weight 100-900, optional, only for string fonts)
         style: str (font style: "normal" or "italic", default "normal", only for string fonts)
+        as_mask: bool (default False). When True, return the text's coverage as a
+            MaskArtifact without color, so the node is cached once for every color
+            and gfx:colorize applies the color downstream. color must be omitted.
 
     Returns:
-        ImageArtifact sized to the text bounding box (RGBA mode).
+        ImageArtifact sized to the text bounding box (RGBA mode), or a
+        MaskArtifact of the same size when as_mask is True.
 
     Raises:
-        ValueError: If font cannot be loaded, text cannot be rendered, or both/neither
-            of size and fit_width are provided.
+        ValueError: If font cannot be loaded, text cannot be rendered, both/neither
+            of size and fit_width are provided, or color does not match as_mask.
     """
     if not isinstance(text, str):
         raise ValueError(f"text must be a string, got {type(text)}")
@@ -272,6 +696,9 @@ def render_text(
     if not isinstance(exact, bool):
         raise ValueError(f"exact must be bool, got {type(exact)}")
 
+    if not isinstance(as_mask, bool):
+        raise ValueError(f"as_mask must be bool, got {type(as_mask)}")
+
     has_size = size is not None
     has_fit_width = fit_width is not None
 
@@ -280,14 +707,11 @@ def render_text(
     if not has_size and not has_fit_width:
         raise ValueError("must provide either size or fit_width")
 
-    if not isinstance(color, (tuple, list)) or len(color) != 4:
-        raise ValueError(
-            f"color must be a tuple/list of 4 RGBA values, got {type(color)}"
-        )
-
-    r, g, b, a = color
-    if not all(isinstance(c, int) and 0 <= c <= 255 for c in (r, g, b, a)):
-        raise ValueError(f"color values must be int in range 0-255, got {color}")
+    if as_mask:
+        if color is not None:
+            raise ValueError("color must not be provided when as_mask is True")
+    else:
+        validate_color(color)
 
     if has_fit_width:
         fit_width_decimal = (
@@ -297,15 +721,9 @@ def render_text(
             text, font, fit_width_decimal, weight, style, exact
         )
     else:
-        if isinstance(size, Decimal):
-            size_int = int(size)
-        elif isinstance(size, (int, str)):
-            size_int = int(size)
-        else:
-            raise ValueError(f"size must be Decimal, int, or str, got {type(size)}")
-
-        if size_int <= 0:
-            raise ValueError(f"size must be positive, got {size_int}")
+        size_int = _parse_size(size)
 
     pil_font = _load_font(font, size_int, weight, style)
+    if as_mask:
+        return _render_mask_at_size(text, pil_font)
     return _render_at_size(text, pil_font, color)
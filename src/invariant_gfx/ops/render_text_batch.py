@@ -0,0 +1,71 @@
+"""gfx:render_text_batch operation - renders many labels sharing one font and size."""
+
+from decimal import Decimal
+
+from invariant_gfx.artifacts import BlobArtifact, ImageArtifact, MaskArtifact
+from invariant_gfx.colors import validate_color
+from invariant_gfx.ops.render_text import (
+    _load_font,
+    _parse_size,
+    _render_at_size,
+    _render_mask_at_size,
+)
+
+
+def render_text_batch(
+    texts: list[str],
+    font: str | BlobArtifact,
+    color: tuple[int, int, int, int] | None = None,
+    size: Decimal | int | str | None = None,
+    weight: int | None = None,
+    style: str = "normal",
+    as_mask: bool = False,
+) -> list[ImageArtifact] | list[MaskArtifact]:
+    """Render a list of strings as tight-fitting "Text Pill" artifacts.
+
+    Equivalent to one gfx:render_text node per string with the same font, size
+    and color, but as a single node: params are validated, the font resolved and
+    loaded, and the manifest hashed once for the whole batch, and every label is
+    assembled from the same glyph atlas.
+
+    Args:
+        texts: list[str] (strings to render, in output order; may be empty)
+        font: String (font family name) or BlobArtifact (font file bytes)
+        color: Tuple[int, int, int, int] (RGBA, 0-255 per channel); None when
+            as_mask is True.
+        size: Decimal | int | str (font size in points; required)
+        weight: int | None (font weight 100-900, optional, only for string fonts)
+        style: str (font style: "normal" or "italic", default "normal", only for string fonts)
+        as_mask: bool (default False). When True, return color-free coverage
+            MaskArtifacts, as gfx:render_text does with as_mask.
+
+    Returns:
+        List of ImageArtifacts (RGBA mode), one per string, each identical to
+        gfx:render_text's output for that string; MaskArtifacts when as_mask
+        is True.
+
+    Raises:
+        ValueError: If texts is not a list of strings, or font, color or size
+            are invalid.
+    """
+    if not isinstance(texts, (list, tuple)):
+        raise ValueError(f"texts must be a list, got {type(texts)}")
+
+    for i, text in enumerate(texts):
+        if not isinstance(text, str):
+            raise ValueError(f"texts[{i}] must be a string, got {type(text)}")
+
+    if not isinstance(as_mask, bool):
+        raise ValueError(f"as_mask must be bool, got {type(as_mask)}")
+
+    if as_mask:
+        if color is not None:
+            raise ValueError("color must not be provided when as_mask is True")
+    else:
+        validate_color(color)
+    size_int = _parse_size(size)
+
+    pil_font = _load_font(font, size_int, weight, style)
+    if as_mask:
+        return [_render_mask_at_size(text, pil_font) for text in texts]
+    return [_render_at_size(text, pil_font, color) for text in texts]
@@ -22,9 +22,9 @@ def drop_shadow(
     """Build a SubGraphNode that produces a drop shadow from a source image.
 
     The internal graph: extract_alpha -> pad -> (optional dilate) -> (optional
-    gaussian_blur when sigma > 0) -> colorize -> (optional translate). The
-    source image is passed in via context under the key "source" (SubGraphNode
-    params/deps).
+    gaussian_blur when sigma > 0) -> colorize -> (optional translate). Every
+    step before colorize carries a single-band MaskArtifact. The source image is
+    passed in via context under the key "source" (SubGraphNode params/deps).
 
     Args:
         source: Node ID of the source image (becomes the subgraph's dependency).
@@ -41,7 +41,7 @@ def drop_shadow(
 
     nodes["alpha"] = Node(
         op_name="gfx:extract_alpha",
-        params={"image": ref("source")},
+        params={"image": ref("source"), "as_mask": True},
         deps=["source"],
     )
 
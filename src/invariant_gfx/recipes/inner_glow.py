@@ -19,7 +19,8 @@ def inner_glow(
     """Build a SubGraphNode that produces an inner glow from a source image.
 
     The internal graph: extract_alpha -> pad -> invert_alpha -> (optional
-    dilate) -> gaussian_blur -> colorize -> mask_alpha. No translate.
+    dilate) -> gaussian_blur -> colorize -> mask_alpha. No translate. The
+    alpha is carried as a single-band MaskArtifact until colorize.
 
     Args:
         source: Node ID of the source image (becomes the subgraph's dependency).
@@ -34,7 +35,7 @@ def inner_glow(
 
     nodes["alpha"] = Node(
         op_name="gfx:extract_alpha",
-        params={"image": ref("source")},
+        params={"image": ref("source"), "as_mask": True},
         deps=["source"],
     )
 
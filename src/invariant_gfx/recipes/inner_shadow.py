@@ -22,7 +22,8 @@ def inner_shadow(
 
     The internal graph: extract_alpha -> pad -> invert_alpha -> (optional
     dilate) -> gaussian_blur -> colorize -> (optional translate) -> mask_alpha.
-    The mask clips the effect to the interior of the source shape.
+    The mask clips the effect to the interior of the source shape. The alpha is
+    carried as a single-band MaskArtifact until colorize.
 
     Args:
         source: Node ID of the source image (becomes the subgraph's dependency).
@@ -39,7 +40,7 @@ def inner_shadow(
 
     nodes["alpha"] = Node(
         op_name="gfx:extract_alpha",
-        params={"image": ref("source")},
+        params={"image": ref("source"), "as_mask": True},
         deps=["source"],
     )
 
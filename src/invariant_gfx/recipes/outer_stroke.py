@@ -17,6 +17,7 @@ def outer_stroke(
 
     The internal graph: extract_alpha -> pad -> dilate -> colorize. The stroke
     is composited behind the source so the source covers the inner portion.
+    The alpha is carried as a single-band MaskArtifact until colorize.
 
     Args:
         source: Node ID of the source image (becomes the subgraph's dependency).
@@ -30,7 +31,7 @@ def outer_stroke(
 
     nodes["alpha"] = Node(
         op_name="gfx:extract_alpha",
-        params={"image": ref("source")},
+        params={"image": ref("source"), "as_mask": True},
         deps=["source"],
     )
 
@@ -0,0 +1,74 @@
+"""Size-aware in-memory artifact store.
+
+Invariant's MemoryStore bounds its LRU/LFU cache by entry count, so a 4K canvas
+and a 16px glyph cost the same slot. ``sized_memory_store`` builds a MemoryStore
+whose cache is weighed by each artifact's ``nbytes`` instead.
+"""
+
+import sys
+from typing import Any, Literal
+
+from cachetools import LFUCache, LRUCache
+from invariant.store.memory import MemoryStore
+
+
+def artifact_nbytes(artifact: Any) -> int:
+    """Memory footprint used to weigh an artifact in a sized cache.
+
+    Uses the artifact's ``nbytes`` (ImageArtifact, MaskArtifact, BlobArtifact)
+    and falls back to ``sys.getsizeof`` for other cacheable values.
+    """
+    nbytes = getattr(artifact, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    return sys.getsizeof(artifact)
+
+
+class _DeclineOversized:
+    """Cache mixin that skips values larger than the whole budget.
+
+    cachetools raises ValueError for such values; a store should treat them
+    as uncacheable rather than fail the node that produced them.
+    """
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        if self.getsizeof(value) > self.maxsize:
+            self.pop(key, None)
+            return
+        super().__setitem__(key, value)
+
+
+class _SizedLRUCache(_DeclineOversized, LRUCache):
+    pass
+
+
+class _SizedLFUCache(_DeclineOversized, LFUCache):
+    pass
+
+
+def sized_memory_store(
+    max_bytes: int, cache: Literal["lru", "lfu"] = "lru"
+) -> MemoryStore:
+    """Create a MemoryStore bounded by total artifact bytes instead of entry count.
+
+    Each artifact is weighed by ``artifact_nbytes`` when it is stored; the
+    least recently (or frequently) used artifacts are evicted until the total
+    fits ``max_bytes``. An artifact larger than ``max_bytes`` is not cached.
+
+    Args:
+        max_bytes: Cache budget in bytes (positive int).
+        cache: Eviction policy, "lru" (default) or "lfu".
+
+    Returns:
+        MemoryStore backed by the size-weighed cache.
+
+    Raises:
+        ValueError: If max_bytes is not a positive int or cache is unknown.
+    """
+    if not isinstance(max_bytes, int) or isinstance(max_bytes, bool) or max_bytes < 1:
+        raise ValueError(f"max_bytes must be a positive int, got {max_bytes!r}")
+    if cache == "lru":
+        return MemoryStore(cache=_SizedLRUCache(max_bytes, getsizeof=artifact_nbytes))
+    if cache == "lfu":
+        return MemoryStore(cache=_SizedLFUCache(max_bytes, getsizeof=artifact_nbytes))
+    raise ValueError(f"cache must be 'lru' or 'lfu', got {cache!r}")
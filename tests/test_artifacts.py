@@ -1,10 +1,28 @@
 """Unit tests for ImageArtifact and BlobArtifact."""
 
+import hashlib
+import random
+import struct
+import sys
 from io import BytesIO
 
+import pytest
 from PIL import Image
 
-from invariant_gfx.artifacts import BlobArtifact, ImageArtifact
+from invariant_gfx.artifacts import (
+    BlobArtifact,
+    ImageArtifact,
+    MaskArtifact,
+    _writable_codec,
+)
+
+
+def _round_trip(artifact: ImageArtifact) -> tuple[bytes, ImageArtifact]:
+    """Serialize and deserialize an artifact, returning the stream bytes too."""
+    stream = BytesIO()
+    artifact.to_stream(stream)
+    stream.seek(0)
+    return stream.getvalue(), ImageArtifact.from_stream(stream)
 
 
 class TestImageArtifact:
@@ -83,6 +101,29 @@ class TestImageArtifact:
 
         assert artifact2.get_stable_hash() == original_hash
 
+    def test_hash_covers_raw_pixels_without_png(self):
+        """Test that hashing is over versioned raw pixels and skips PNG encoding."""
+        image = Image.new("RGBA", (3, 2), (1, 2, 3, 4))
+        artifact = ImageArtifact(image)
+
+        expected = hashlib.sha256(
+            b"invariant-gfx:image:v2\0RGBA\0"
+            + (3).to_bytes(4, byteorder="big")
+            + (2).to_bytes(4, byteorder="big")
+            + image.tobytes()
+        ).hexdigest()
+
+        assert artifact.get_stable_hash() == expected
+        assert artifact._png_cache is None
+
+    def test_hash_distinguishes_shape(self):
+        """Test that identical pixel bytes with different dimensions hash differently."""
+        wide = ImageArtifact(Image.new("RGBA", (4, 1), (9, 9, 9, 9)))
+        tall = ImageArtifact(Image.new("RGBA", (1, 4), (9, 9, 9, 9)))
+
+        assert wide.image.tobytes() == tall.image.tobytes()
+        assert wide.get_stable_hash() != tall.get_stable_hash()
+
     def test_canonical_png_is_cached(self):
         """Test that repeated PNG serialization reuses cached bytes."""
         image = Image.new("RGBA", (10, 10), (255, 128, 64, 255))
@@ -111,6 +152,336 @@ class TestImageArtifact:
         assert artifact._to_canonical_png() is original_png
 
 
+class TestImageArtifactStreamFormats:
+    """Tests for the selectable ImageArtifact stream payloads."""
+
+    @pytest.fixture
+    def noisy(self) -> ImageArtifact:
+        image = Image.effect_noise((23, 17), 60).convert("RGBA")
+        image.putalpha(Image.linear_gradient("L").resize((23, 17)))
+        return ImageArtifact(image)
+
+    @pytest.mark.parametrize("stream_format", ["png", "raw", "lz4", "zstd"])
+    def test_round_trip(self, noisy, monkeypatch, stream_format):
+        """Each format restores identical pixels and hash."""
+        if stream_format == "lz4":
+            pytest.importorskip("lz4.frame")
+        if stream_format == "zstd":
+            pytest.importorskip("zstandard")
+        monkeypatch.setattr(ImageArtifact, "stream_format", stream_format)
+
+        _, restored = _round_trip(noisy)
+
+        assert restored.image.mode == "RGBA"
+        assert restored.image.tobytes() == noisy.image.tobytes()
+        assert restored.get_stable_hash() == noisy.get_stable_hash()
+
+    def test_raw_payload_layout(self, noisy, monkeypatch):
+        """Raw payload is a small header followed by the RGBA bytes."""
+        monkeypatch.setattr(ImageArtifact, "stream_format", "raw")
+
+        data, _ = _round_trip(noisy)
+
+        payload = data[8:]
+        assert int.from_bytes(data[:8], byteorder="big") == len(payload)
+        assert payload.startswith(b"IGFX")
+        assert payload.endswith(noisy.image.tobytes())
+
+    def test_reads_png_entries_with_any_format_selected(self, noisy, monkeypatch):
+        """PNG-framed entries written by the default format stay readable."""
+        png_stream, _ = _round_trip(noisy)
+        monkeypatch.setattr(ImageArtifact, "stream_format", "raw")
+
+        restored = ImageArtifact.from_stream(BytesIO(png_stream))
+
+        assert restored.image.tobytes() == noisy.image.tobytes()
+
+    @pytest.mark.parametrize("stream_format", ["lz4", "zstd"])
+    def test_missing_codec_writes_raw(self, noisy, monkeypatch, stream_format):
+        """A compressed format without its optional module falls back to raw."""
+        for module in ("lz4", "lz4.frame", "zstandard"):
+            monkeypatch.setitem(sys.modules, module, None)
+        _writable_codec.cache_clear()
+        monkeypatch.setattr(ImageArtifact, "stream_format", stream_format)
+        try:
+            data, restored = _round_trip(noisy)
+        finally:
+            _writable_codec.cache_clear()
+
+        assert data[8:].endswith(noisy.image.tobytes())
+        assert restored.image.tobytes() == noisy.image.tobytes()
+
+    def test_unknown_format_raises(self, noisy, monkeypatch):
+        """An unsupported stream_format is rejected at write time."""
+        monkeypatch.setattr(ImageArtifact, "stream_format", "webp")
+
+        with pytest.raises(ValueError, match="stream_format must be one of"):
+            noisy.to_stream(BytesIO())
+
+    def test_unrecognised_payload_raises(self):
+        """A payload that is neither PNG nor pixel data is rejected."""
+        stream = BytesIO((4).to_bytes(8, byteorder="big") + b"nope")
+
+        with pytest.raises(ValueError, match="neither PNG nor pixel data"):
+            ImageArtifact.from_stream(stream)
+
+
+class TestImageArtifactLazyDecode:
+    """Tests for header-only loading in ImageArtifact.from_stream."""
+
+    @pytest.fixture
+    def noisy(self) -> ImageArtifact:
+        return ImageArtifact(Image.effect_noise((21, 13), 50).convert("RGBA"))
+
+    def test_png_dimensions_without_decoding(self, noisy):
+        """PNG entries expose size from IHDR and decode on first image access."""
+        _, restored = _round_trip(noisy)
+
+        assert not restored.is_decoded
+        assert (restored.width, restored.height) == (21, 13)
+        assert not restored.is_decoded
+
+        assert restored.image.tobytes() == noisy.image.tobytes()
+        assert restored.is_decoded
+
+    def test_png_reserialization_skips_decode(self, noisy):
+        """Re-persisting a PNG-loaded artifact reuses the stored PNG bytes."""
+        data, restored = _round_trip(noisy)
+
+        stream = BytesIO()
+        restored.to_stream(stream)
+
+        assert stream.getvalue() == data
+        assert not restored.is_decoded
+
+    def test_pixel_payload_hash_without_decoding(self, noisy, monkeypatch):
+        """Pixel payloads carry the identity digest in their header."""
+        monkeypatch.setattr(ImageArtifact, "stream_format", "raw")
+
+        _, restored = _round_trip(noisy)
+
+        assert restored.get_stable_hash() == noisy.get_stable_hash()
+        assert (restored.width, restored.height) == (21, 13)
+        assert not restored.is_decoded
+
+    def test_version_one_pixel_payload_is_rejected(self, noisy):
+        """Digest-less version 1 headers are not a supported payload format."""
+        header = struct.pack(">4sBBII", b"IGFX", 1, 0, 21, 13)
+        payload = header + noisy.image.tobytes()
+        stream = BytesIO(len(payload).to_bytes(8, byteorder="big") + payload)
+
+        with pytest.raises(ValueError, match="unsupported .* version 1"):
+            ImageArtifact.from_stream(stream)
+
+
+class TestImageArtifactPremultiplied:
+    """Tests for ImageArtifact built from premultiplied RGBa pixels."""
+
+    def test_rgba_premultiplied_kept_and_unpremultiplied_lazily(self):
+        """An RGBa image is kept as-is and converted to RGBA on first access."""
+        premultiplied = Image.new("RGBA", (4, 4), (200, 100, 50, 128)).convert("RGBa")
+        artifact = ImageArtifact(premultiplied)
+
+        assert artifact.premultiplied_image is premultiplied
+        assert not artifact.is_decoded
+        assert artifact.image.mode == "RGBA"
+        assert artifact.image.tobytes() == premultiplied.convert("RGBA").tobytes()
+
+    def test_hash_matches_straight_equivalent(self):
+        """Identity is hashed over the straight pixels."""
+        straight = Image.new("RGBA", (4, 4), (255, 0, 0, 255))
+        from_premultiplied = ImageArtifact(straight.convert("RGBa"))
+
+        assert (
+            from_premultiplied.get_stable_hash()
+            == ImageArtifact(straight).get_stable_hash()
+        )
+
+    def test_premultiplied_image_cached_for_straight_input(self):
+        """The premultiplied view of a straight artifact is converted once."""
+        artifact = ImageArtifact(Image.new("RGBA", (4, 4), (255, 0, 0, 128)))
+
+        first = artifact.premultiplied_image
+        assert first.mode == "RGBa"
+        assert artifact.premultiplied_image is first
+
+
+class TestArtifactNbytes:
+    """Tests for nbytes accounting on artifacts."""
+
+    def test_image_counts_pixels_and_png_cache(self):
+        """nbytes covers the RGBA buffer plus the canonical PNG once encoded."""
+        artifact = ImageArtifact(Image.new("RGBA", (10, 6), (1, 2, 3, 4)))
+        assert artifact.nbytes == 10 * 6 * 4
+
+        png = artifact._to_canonical_png()
+
+        assert artifact.nbytes == 10 * 6 * 4 + len(png)
+
+    def test_image_counts_premultiplied_view(self):
+        """A materialized premultiplied view is counted alongside the pixels."""
+        artifact = ImageArtifact(Image.new("RGBA", (4, 4), (255, 0, 0, 128)))
+        artifact.premultiplied_image
+
+        assert artifact.nbytes == 2 * 4 * 4 * 4
+
+    def test_lazy_image_counts_payload_until_decoded(self):
+        """An undecoded pixel payload is counted, then replaced by the pixels."""
+        source = ImageArtifact(Image.new("RGBA", (8, 8), (9, 9, 9, 9)))
+        source.stream_format = "raw"
+        _, restored = _round_trip(source)
+
+        assert not restored.is_decoded
+        assert restored.nbytes > 8 * 8 * 4
+
+        restored.image
+
+        assert restored.nbytes == 8 * 8 * 4
+
+    def test_mask_and_blob(self):
+        """Masks count one byte per pixel; blobs count their payload."""
+        assert MaskArtifact(Image.new("L", (5, 7))).nbytes == 35
+        assert BlobArtifact(b"12345", "text/plain").nbytes == 5
+
+
+class TestImageArtifactPngCacheBudget:
+    """Tests for the process-wide PNG cache budget."""
+
+    @staticmethod
+    def _noise(seed: int) -> ImageArtifact:
+        rng = random.Random(seed)
+        data = bytes(rng.randrange(256) for _ in range(16 * 16 * 4))
+        return ImageArtifact(Image.frombytes("RGBA", (16, 16), data))
+
+    def test_zero_budget_releases_after_persisting(self, monkeypatch):
+        """With a zero budget the encoding is written but not retained."""
+        monkeypatch.setattr(ImageArtifact, "png_cache_budget", 0)
+        artifact = self._noise(1)
+
+        first, _ = _round_trip(artifact)
+
+        assert artifact._png_cache is None
+        assert artifact.nbytes == 16 * 16 * 4
+        second, _ = _round_trip(artifact)
+        assert first == second
+
+    def test_budget_evicts_least_recently_used(self, monkeypatch):
+        """Encodings beyond the budget are evicted oldest-first."""
+        artifacts = [self._noise(seed) for seed in (1, 2, 3)]
+        sizes = [len(self._noise(seed)._to_canonical_png()) for seed in (1, 2, 3)]
+        monkeypatch.setattr(ImageArtifact, "png_cache_budget", sizes[1] + sizes[2])
+
+        artifacts[0]._to_canonical_png()
+        artifacts[1]._to_canonical_png()
+        artifacts[2]._to_canonical_png()
+
+        assert artifacts[0]._png_cache is None
+        assert artifacts[1]._png_cache is not None
+        assert artifacts[2]._png_cache is not None
+
+        artifacts[1]._to_canonical_png()  # touch: artifacts[2] is now oldest
+        artifacts[0]._to_canonical_png()
+
+        assert artifacts[2]._png_cache is None
+        assert artifacts[1]._png_cache is not None
+
+    def test_lazy_png_source_released_once_decoded(self, monkeypatch):
+        """An undecoded PNG payload is kept as the source, then released."""
+        monkeypatch.setattr(ImageArtifact, "png_cache_budget", 0)
+        original, restored = _round_trip(self._noise(4))
+
+        again, _ = _round_trip(restored)
+        assert again == original
+        assert not restored.is_decoded
+
+        restored.image
+
+        assert restored._png_cache is None
+
+    def test_image_setter_releases_budget_entry(self, monkeypatch):
+        """Replacing the pixels drops the cached encoding and its budget share."""
+        monkeypatch.setattr(ImageArtifact, "png_cache_budget", 1 << 20)
+        artifact = self._noise(5)
+        artifact._to_canonical_png()
+
+        artifact.image = Image.new("RGBA", (2, 2))
+
+        assert artifact._png_cache is None
+        assert artifact.nbytes == 2 * 2 * 4
+
+
+class TestImageArtifactRawFile:
+    """Tests for memory-mapped raw pixel files."""
+
+    def test_round_trip_is_mapped(self, tmp_path):
+        """Pixels come back identical from a read-only mapping of the file."""
+        image = Image.effect_noise((19, 11), 40).convert("RGBA")
+        artifact = ImageArtifact(image)
+        path = tmp_path / "icons" / "glyph.rgba"
+
+        artifact.to_raw_file(path)
+        mapped = ImageArtifact.from_raw_file(path)
+
+        assert mapped.image.readonly
+        assert (mapped.width, mapped.height) == (19, 11)
+        assert mapped.image.tobytes() == image.tobytes()
+        assert mapped.get_stable_hash() == artifact.get_stable_hash()
+        assert list(path.parent.iterdir()) == [path]
+
+    def test_mutation_copies_instead_of_writing_file(self, tmp_path):
+        """In-place edits on a mapped image never touch the file."""
+        path = tmp_path / "solid.rgba"
+        ImageArtifact(Image.new("RGBA", (4, 4), (10, 20, 30, 40))).to_raw_file(path)
+        original = path.read_bytes()
+
+        mapped = ImageArtifact.from_raw_file(path)
+        mapped.image.putpixel((0, 0), (1, 2, 3, 4))
+
+        assert mapped.image.getpixel((0, 0)) == (1, 2, 3, 4)
+        assert path.read_bytes() == original
+
+    def test_truncated_file_raises(self, tmp_path):
+        """A file shorter than its header dimensions is rejected."""
+        path = tmp_path / "short.rgba"
+        ImageArtifact(Image.new("RGBA", (4, 4))).to_raw_file(path)
+        path.write_bytes(path.read_bytes()[:-4])
+
+        with pytest.raises(ValueError, match="expected 64"):
+            ImageArtifact.from_raw_file(path)
+
+
+class TestMaskArtifact:
+    """Tests for MaskArtifact."""
+
+    def test_normalizes_to_l(self):
+        """Non-L input is converted to a single band."""
+        artifact = MaskArtifact(Image.new("RGBA", (5, 3), (255, 255, 255, 255)))
+
+        assert artifact.image.mode == "L"
+        assert (artifact.width, artifact.height) == (5, 3)
+
+    def test_hash_differs_from_rgba_of_same_size(self):
+        """Mask and image hashes are distinct even for identical dimensions."""
+        mask = MaskArtifact(Image.new("L", (4, 4), 0))
+        image = ImageArtifact(Image.new("RGBA", (4, 4), (0, 0, 0, 0)))
+
+        assert mask.get_stable_hash() != image.get_stable_hash()
+
+    def test_serialization_round_trip(self):
+        """Round trip preserves pixels and hash."""
+        img = Image.new("L", (6, 6), 0)
+        img.putpixel((2, 3), 77)
+        artifact = MaskArtifact(img)
+
+        stream = BytesIO()
+        artifact.to_stream(stream)
+        stream.seek(0)
+        restored = MaskArtifact.from_stream(stream)
+
+        assert restored.image.tobytes() == img.tobytes()
+        assert restored.get_stable_hash() == artifact.get_stable_hash()
+
+
 class TestBlobArtifact:
     """Tests for BlobArtifact."""
 
@@ -0,0 +1,166 @@
+"""Tests for the persistent font-resolution index."""
+
+import json
+
+import pytest
+
+from invariant_gfx import font_index
+from invariant_gfx.font_index import load_font_index, save_font_index
+from invariant_gfx.ops.render_text import (
+    _load_font_path_cached,
+    _resolve_font_path_cached,
+    preload_fonts,
+)
+
+from .conftest import TEST_FONT_FAMILY
+
+FONT = TEST_FONT_FAMILY
+
+
+@pytest.fixture(autouse=True)
+def _fresh_index():
+    """Run each test with an empty index and resolution cache."""
+    saved = dict(font_index._FONT_PATHS)
+    font_index._FONT_PATHS.clear()
+    _resolve_font_path_cached.cache_clear()
+    yield
+    font_index._FONT_PATHS.clear()
+    font_index._FONT_PATHS.update(saved)
+    _resolve_font_path_cached.cache_clear()
+
+
+class TestFontIndex:
+    """Tests for save_font_index and load_font_index."""
+
+    def test_round_trip(self, tmp_path):
+        """Resolutions saved by one process are loaded by the next."""
+        path = _resolve_font_path_cached(FONT, None, "normal")
+        index_path = tmp_path / "fonts.json"
+
+        assert save_font_index(index_path) == 1
+        font_index._FONT_PATHS.clear()
+
+        assert load_font_index(index_path) == 1
+        assert font_index.indexed_font_path(FONT, None, "normal") == path
+
+    def test_save_creates_directories_atomically(self, tmp_path, monkeypatch):
+        """Saving creates the parent directories and never leaves a partial file."""
+        _resolve_font_path_cached(FONT, None, "normal")
+        index_path = tmp_path / "cache" / "fonts" / "fonts.json"
+
+        assert save_font_index(index_path) == 1
+        assert load_font_index(index_path) == 1
+        saved = index_path.read_bytes()
+
+        def fail(*args, **kwargs):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(font_index.json, "dump", fail)
+        with pytest.raises(OSError, match="disk full"):
+            save_font_index(index_path)
+        assert index_path.read_bytes() == saved
+        assert list(index_path.parent.iterdir()) == [index_path]
+
+    def test_resolution_uses_index_before_registry(self, tmp_path):
+        """An indexed spec resolves without consulting JustMyType."""
+        font_file = tmp_path / "indexed.ttf"
+        font_file.write_bytes(b"")
+        font_index.record_font_path(
+            "Not A Registry Family", 700, "italic", str(font_file)
+        )
+
+        assert _resolve_font_path_cached("Not A Registry Family", 700, "italic") == str(
+            font_file
+        )
+
+    def test_stale_fingerprint_is_ignored(self, tmp_path):
+        """An index written under another font environment is not used."""
+        _resolve_font_path_cached(FONT, None, "normal")
+        index_path = tmp_path / "fonts.json"
+        save_font_index(index_path)
+
+        index = json.loads(index_path.read_text())
+        index["fingerprint"]["packs"].append(["new-pack", "pkg:pack", "1.0"])
+        index_path.write_text(json.dumps(index))
+        font_index._FONT_PATHS.clear()
+
+        assert load_font_index(index_path) == 0
+        assert font_index.indexed_font_path(FONT, None, "normal") is None
+
+    def test_missing_font_file_is_skipped(self, tmp_path):
+        """Entries whose font file has been removed are dropped on load."""
+        font_file = tmp_path / "gone.ttf"
+        font_file.write_bytes(b"")
+        font_index.record_font_path("Gone", None, "normal", str(font_file))
+        index_path = tmp_path / "fonts.json"
+        save_font_index(index_path)
+        font_file.unlink()
+        font_index._FONT_PATHS.clear()
+
+        assert load_font_index(index_path) == 0
+
+    def test_missing_or_corrupt_index(self, tmp_path):
+        """A missing or unreadable index loads nothing."""
+        assert load_font_index(tmp_path / "missing.json") == 0
+
+        corrupt = tmp_path / "corrupt.json"
+        corrupt.write_text("{not json")
+        assert load_font_index(corrupt) == 0
+
+    @pytest.mark.parametrize(
+        "fonts",
+        [
+            5,
+            {"Inter": "inter.ttf"},
+            [["Inter", [400], "normal", "PATH"]],
+            [["Inter", True, "normal", "PATH"]],
+            [["Inter", None, "normal"]],
+            [[None, None, "normal", "PATH"]],
+            [["Inter", None, "normal", "PATH"], "Inter"],
+        ],
+    )
+    def test_malformed_index_is_ignored(self, tmp_path, fonts):
+        """An index with mistyped fields loads nothing instead of raising."""
+        font_file = tmp_path / "font.ttf"
+        font_file.write_bytes(b"")
+        index_path = tmp_path / "fonts.json"
+        index_path.write_text(
+            json.dumps(
+                {
+                    "format": font_index._INDEX_FORMAT,
+                    "fingerprint": font_index._environment_fingerprint(),
+                    "fonts": json.loads(
+                        json.dumps(fonts).replace('"PATH"', json.dumps(str(font_file)))
+                    ),
+                }
+            )
+        )
+
+        assert load_font_index(index_path) == 0
+        assert font_index.indexed_font_path("Inter", None, "normal") is None
+
+
+class TestPreloadFonts:
+    """Tests for preload_fonts."""
+
+    def test_opens_requested_sizes(self):
+        """Preloaded sizes are served from the font cache afterwards."""
+        preload_fonts(FONT, [13, "27", 41])
+        path = _resolve_font_path_cached(FONT, None, "normal")
+        hits = _load_font_path_cached.cache_info().hits
+
+        _load_font_path_cached(path, 13)
+        _load_font_path_cached(path, 27)
+        _load_font_path_cached(path, 41)
+
+        assert _load_font_path_cached.cache_info().hits == hits + 3
+
+    def test_invalid_size(self):
+        """Test that non-positive sizes raise ValueError."""
+        with pytest.raises(ValueError, match="size must be positive"):
+            preload_fonts(FONT, [12, 0])
+
+    def test_unknown_font(self):
+        """Test that an unknown family raises ValueError."""
+        with pytest.raises(ValueError, match="failed to load font"):
+            preload_fonts("No Such Family Anywhere", [12])
@@ -0,0 +1,140 @@
+"""Tests for the pre-rasterized icon atlas."""
+
+import json
+import sys
+
+import pytest
+from justmyresource import get_default_registry
+from PIL import Image, ImageDraw
+
+from invariant_gfx import icon_atlas
+from invariant_gfx.colors import colored_alpha
+from invariant_gfx.icon_atlas import atlas_image, build_icon_atlas, load_icon_atlas
+from invariant_gfx.ops.render_svg import render_svg
+from invariant_gfx.ops.render_svg_sizes import render_svg_sizes
+
+ICONS = ["lucide:thermometer", "lucide:sun"]
+
+
+@pytest.fixture(autouse=True)
+def _empty_atlas():
+    """Run each test with no atlas loaded."""
+    saved = dict(icon_atlas._ATLAS_ENTRIES)
+    icon_atlas._ATLAS_ENTRIES.clear()
+    yield
+    icon_atlas._ATLAS_ENTRIES.clear()
+    icon_atlas._ATLAS_ENTRIES.update(saved)
+
+
+def _svg(name: str) -> bytes:
+    return get_default_registry().get_resource(name).data
+
+
+class TestIconAtlas:
+    """Tests for build_icon_atlas and load_icon_atlas."""
+
+    def test_round_trip_matches_render(self, tmp_path):
+        """Atlas rasters are identical to rendering the SVG."""
+        atlas_path = tmp_path / "icons.atlas"
+        expected = {
+            (name, size): render_svg(_svg(name), *size).image.tobytes()
+            for name in ICONS
+            for size in [(48, 48), (96, 64)]
+        }
+
+        assert build_icon_atlas(atlas_path, [48, [96, 64]], icons=ICONS) == 4
+        assert load_icon_atlas(atlas_path) == 4
+
+        for (name, size), pixels in expected.items():
+            image = atlas_image(_svg(name), size)
+            assert image.tobytes() == pixels
+
+    def test_hits_skip_cairosvg(self, tmp_path, monkeypatch):
+        """render_svg and render_svg_sizes serve atlas sizes without rendering."""
+        atlas_path = tmp_path / "icons.atlas"
+        build_icon_atlas(atlas_path, [48, 72], icons=ICONS)
+        load_icon_atlas(atlas_path)
+
+        render_svg_module = sys.modules["invariant_gfx.ops.render_svg"]
+        render_svg_sizes_module = sys.modules["invariant_gfx.ops.render_svg_sizes"]
+
+        def fail(*args):
+            raise AssertionError("rendered with cairosvg")
+
+        monkeypatch.setattr(render_svg_module, "_render_surface", fail)
+        monkeypatch.setattr(render_svg_sizes_module, "_parsed_tree", fail)
+
+        assert render_svg(_svg("lucide:sun"), 72, 72).width == 72
+        ladder = render_svg_sizes(_svg("lucide:sun"), [48, 72])
+        assert list(ladder) == ["48", "72"]
+
+    def test_requires_pack_or_icons(self, tmp_path):
+        """Test that exactly one of pack or icons is required."""
+        with pytest.raises(ValueError, match="Exactly one of pack or icons"):
+            build_icon_atlas(tmp_path / "icons.atlas", [48])
+
+        with pytest.raises(ValueError, match="Exactly one of pack or icons"):
+            build_icon_atlas(tmp_path / "icons.atlas", [48], pack="lucide", icons=ICONS)
+
+    def test_unknown_icon(self, tmp_path):
+        """Test that an unknown resource raises ValueError."""
+        with pytest.raises(ValueError, match="failed to find resource"):
+            build_icon_atlas(
+                tmp_path / "icons.atlas", [48], icons=["lucide:no-such-icon"]
+            )
+
+    def test_missing_or_corrupt_atlas(self, tmp_path):
+        """A missing or unreadable atlas loads nothing."""
+        assert load_icon_atlas(tmp_path / "missing.atlas") == 0
+
+        corrupt = tmp_path / "corrupt.atlas"
+        corrupt.write_bytes(b"not an atlas at all")
+        assert load_icon_atlas(corrupt) == 0
+        assert atlas_image(b"<svg/>", (48, 48)) is None
+
+    @pytest.mark.parametrize(
+        "offset",
+        [-4, 0, 1 << 40],
+        ids=["negative", "in-header", "past-end"],
+    )
+    def test_entry_outside_pixel_data(self, tmp_path, offset):
+        """An index entry pointing outside the pixel data raises ValueError."""
+        atlas_path = tmp_path / "icons.atlas"
+        build_icon_atlas(atlas_path, [48], icons=ICONS[:1])
+        data = bytearray(atlas_path.read_bytes())
+        _, index_offset, index_length = icon_atlas._HEADER.unpack_from(data)
+        index = json.loads(data[index_offset : index_offset + index_length])
+        index["entries"][0][3] = offset
+        encoded = json.dumps(index).encode("utf-8")
+        data[index_offset:] = encoded
+        data[: icon_atlas._HEADER.size] = icon_atlas._HEADER.pack(
+            icon_atlas._MAGIC, index_offset, len(encoded)
+        )
+        atlas_path.write_bytes(bytes(data))
+
+        with pytest.raises(ValueError, match="outside its pixel data"):
+            load_icon_atlas(atlas_path)
+        assert atlas_image(_svg(ICONS[0]), (48, 48)) is None
+
+
+class TestSingleColor:
+    """Tests for the compact single-color raster form."""
+
+    def test_single_color_raster(self):
+        """Anti-aliased one-color art is stored as alpha plus color."""
+        image = Image.new("RGBA", (32, 32), (0, 0, 0, 0))
+        ImageDraw.Draw(image).ellipse((3, 3, 28, 28), outline=(0, 0, 0, 255), width=2)
+        image = image.resize((17, 17), Image.Resampling.BOX)
+
+        assert icon_atlas._single_color(image) == (0, 0, 0)
+        rebuilt = colored_alpha(image.getchannel("A"), (0, 0, 0))
+        assert rebuilt.tobytes() == image.tobytes()
+
+    def test_multi_color_raster(self):
+        """Rasters with several colors keep full RGBA."""
+        image = Image.new("RGBA", (16, 16), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(image)
+        draw.rectangle((0, 0, 7, 7), fill=(255, 0, 0, 255))
+        draw.rectangle((8, 8, 15, 15), fill=(0, 0, 255, 128))
+
+        assert icon_atlas._single_color(image) is None
@@ -3,7 +3,7 @@
 import pytest
 from PIL import Image
 
-from invariant_gfx.artifacts import ImageArtifact
+from invariant_gfx.artifacts import ImageArtifact, MaskArtifact
 from invariant_gfx.ops.colorize import colorize
 
 
@@ -55,3 +55,12 @@ class TestColorize:
         source = ImageArtifact(Image.new("RGBA", (4, 4), (0, 0, 0, 255)))
         with pytest.raises(ValueError, match="0-255"):
             colorize(image=source, color=(0, 0, 0, 256))  # type: ignore[arg-type]
+
+    def test_mask_input_used_as_source_alpha(self):
+        """A MaskArtifact supplies the source alpha directly."""
+        source = MaskArtifact(Image.new("L", (4, 4), 128))
+
+        result = colorize(image=source, color=(255, 0, 0, 255))
+
+        assert isinstance(result, ImageArtifact)
+        assert result.image.getpixel((0, 0)) == (255, 0, 0, 128)
@@ -1,5 +1,6 @@
 """Unit tests for gfx:composite operation."""
 
+import random
 from decimal import Decimal
 
 import pytest
@@ -7,7 +8,26 @@ from PIL import Image
 
 from invariant_gfx.anchors import absolute, relative
 from invariant_gfx.artifacts import ImageArtifact
-from invariant_gfx.ops.composite import composite
+from invariant_gfx.ops.composite import (
+    _SUPPORTED_BLEND_MODES,
+    _blend_bands,
+    _blend_channel,
+    _blend_layer,
+    composite,
+)
+
+from .blend_reference import reference_blend_layer, reference_premultiplied_over
+
+
+def _random_rgba(size: tuple[int, int], seed: int) -> Image.Image:
+    """Noise image whose alpha favours the 0/255 edge cases."""
+    rng = random.Random(seed)
+    alphas = [0, 255, 0, 255] + list(range(256))
+    data = bytearray()
+    for _ in range(size[0] * size[1]):
+        data += bytes((rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+        data.append(rng.choice(alphas))
+    return Image.frombytes("RGBA", size, bytes(data))
 
 
 class TestComposite:
@@ -421,3 +441,114 @@ class TestComposite:
 
         with pytest.raises(ValueError, match="Unknown blend mode"):
             composite(layers)
+
+    @pytest.mark.parametrize("mode", sorted(_SUPPORTED_BLEND_MODES - {"normal"}))
+    def test_blend_layer_matches_per_pixel_formulas(self, mode):
+        """Vectorized blending is bit-identical to the per-pixel reference."""
+        base = _random_rgba((48, 48), seed=1)
+        blend = _random_rgba((48, 48), seed=2)
+
+        expected = reference_blend_layer(base, blend, mode)
+
+        assert _blend_layer(base, blend, mode).tobytes() == expected.tobytes()
+
+    @pytest.mark.parametrize("mode", sorted(_SUPPORTED_BLEND_MODES - {"normal"}))
+    def test_blend_bands_exhaustive(self, mode):
+        """Band blending matches _blend_channel for every (base, blend) pair."""
+        base = Image.frombytes("L", (256, 256), bytes(range(256)) * 256)
+        blend = base.transpose(Image.Transpose.TRANSPOSE)
+
+        result = _blend_bands(base, blend, mode).tobytes()
+
+        expected = bytes(
+            _blend_channel(b, s, mode) for s in range(256) for b in range(256)
+        )
+        assert result == expected
+
+    @pytest.mark.parametrize(
+        "position", [(3, 5), (-4, -6), (28, 20), (40, 40), (-20, 0)]
+    )
+    def test_blend_mode_region_matches_full_canvas(self, position):
+        """Blending only the clipped layer rectangle equals a full-canvas blend."""
+        base = _random_rgba((32, 24), seed=3)
+        layer = _random_rgba((10, 8), seed=4)
+
+        canvas = composite([{"image": ImageArtifact(base), "id": "bg"}]).image
+        full = Image.new("RGBA", base.size, (0, 0, 0, 0))
+        full.paste(layer, position)
+        expected = _blend_layer(canvas, full, "screen")
+
+        result = composite(
+            [
+                {"image": ImageArtifact(base), "id": "bg"},
+                {
+                    "image": ImageArtifact(layer),
+                    "anchor": absolute(*position),
+                    "mode": "screen",
+                },
+            ]
+        )
+
+        assert result.image.tobytes() == expected.tobytes()
+
+    def test_premultiplied_matches_exact_reference(self):
+        """The premultiplied chain matches a per-pixel premultiplied reference."""
+        base = _random_rgba((32, 24), seed=5)
+        over = _random_rgba((10, 8), seed=6)
+        faded = _random_rgba((12, 12), seed=7)
+        multiplied = _random_rgba((8, 8), seed=8)
+        layers = [
+            {"image": ImageArtifact(base), "id": "bg"},
+            {"image": ImageArtifact(over), "anchor": absolute(3, 5)},
+            {
+                "image": ImageArtifact(faded),
+                "anchor": absolute(14, 9),
+                "opacity": Decimal("0.5"),
+            },
+            {
+                "image": ImageArtifact(multiplied),
+                "anchor": absolute(20, 2),
+                "mode": "multiply",
+            },
+        ]
+
+        result = composite(layers, premultiplied=True)
+
+        expected = Image.new("RGBa", base.size, (0, 0, 0, 0))
+        reference_premultiplied_over(expected, base.convert("RGBa"), (0, 0))
+        reference_premultiplied_over(expected, over.convert("RGBa"), (3, 5))
+        half = faded.convert("RGBa").point(lambda p: int(p * 0.5))
+        reference_premultiplied_over(expected, half, (14, 9))
+        # Blend modes mix straight colors within the layer's rectangle.
+        box = (20, 2, 28, 10)
+        blended = reference_blend_layer(
+            expected.crop(box).convert("RGBA"), multiplied, "multiply"
+        )
+        expected.paste(blended.convert("RGBa"), box)
+        assert result.premultiplied_image.tobytes() == expected.tobytes()
+
+    def test_premultiplied_result_passes_through(self):
+        """A premultiplied result feeds the next composite without conversion."""
+        red = ImageArtifact(Image.new("RGBA", (8, 8), (255, 0, 0, 128)))
+        inner = composite([{"image": red}], premultiplied=True)
+
+        assert not inner.is_decoded
+        assert inner.premultiplied_image.mode == "RGBa"
+
+        outer = composite(
+            [
+                {"image": ImageArtifact(Image.new("RGBA", (8, 8), (0, 0, 255, 255)))},
+                {"image": inner, "anchor": absolute(0, 0)},
+            ],
+            premultiplied=True,
+        )
+
+        assert not inner.is_decoded
+        assert outer.image.mode == "RGBA"
+        assert outer.image.getpixel((4, 4)) == (128, 0, 127, 255)
+
+    def test_invalid_premultiplied_type(self):
+        """Non-bool premultiplied raises ValueError."""
+        layer = ImageArtifact(Image.new("RGBA", (4, 4)))
+        with pytest.raises(ValueError, match="premultiplied must be bool"):
+            composite([{"image": layer}], premultiplied="yes")  # type: ignore[arg-type]
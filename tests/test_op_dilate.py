@@ -3,7 +3,7 @@
 import pytest
 from PIL import Image
 
-from invariant_gfx.artifacts import ImageArtifact
+from invariant_gfx.artifacts import ImageArtifact, MaskArtifact
 from invariant_gfx.ops.dilate import dilate
 
 
@@ -61,3 +61,15 @@ class TestDilate:
         result = dilate(image=source, radius=0)
 
         assert result.image.getpixel((3, 3)) == (10, 20, 30, 180)
+
+    def test_mask_input_matches_alpha_band(self):
+        """Dilating a MaskArtifact matches dilating the alpha of the RGBA equivalent."""
+        img = Image.new("RGBA", (9, 9), (0, 0, 0, 0))
+        img.putpixel((4, 4), (0, 0, 0, 255))
+        source = ImageArtifact(img)
+
+        rgba = dilate(image=source, radius=2)
+        mask = dilate(image=MaskArtifact(img.getchannel("A")), radius=2)
+
+        assert isinstance(mask, MaskArtifact)
+        assert mask.image.tobytes() == rgba.image.getchannel("A").tobytes()
@@ -3,7 +3,7 @@
 import pytest
 from PIL import Image
 
-from invariant_gfx.artifacts import ImageArtifact
+from invariant_gfx.artifacts import ImageArtifact, MaskArtifact
 from invariant_gfx.ops.erode import erode
 
 
@@ -61,3 +61,15 @@ class TestErode:
         result = erode(image=source, radius=0)
 
         assert result.image.getpixel((3, 3)) == (10, 20, 30, 180)
+
+    def test_mask_input_matches_alpha_band(self):
+        """Eroding a MaskArtifact matches eroding the alpha of the RGBA equivalent."""
+        img = Image.new("RGBA", (9, 9), (0, 0, 0, 0))
+        img.paste((0, 0, 0, 255), (2, 2, 7, 7))
+        source = ImageArtifact(img)
+
+        rgba = erode(image=source, radius=1)
+        mask = erode(image=MaskArtifact(img.getchannel("A")), radius=1)
+
+        assert isinstance(mask, MaskArtifact)
+        assert mask.image.tobytes() == rgba.image.getchannel("A").tobytes()
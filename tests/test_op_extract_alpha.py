@@ -3,7 +3,7 @@
 import pytest
 from PIL import Image
 
-from invariant_gfx.artifacts import ImageArtifact
+from invariant_gfx.artifacts import ImageArtifact, MaskArtifact
 from invariant_gfx.ops.extract_alpha import extract_alpha
 
 
@@ -41,3 +41,20 @@ class TestExtractAlpha:
         """Non-ImageArtifact raises ValueError."""
         with pytest.raises(ValueError, match="must be ImageArtifact"):
             extract_alpha(image="not an image")  # type: ignore[arg-type]
+
+    def test_as_mask_returns_mask_artifact(self):
+        """as_mask=True returns the alpha band as a single-band MaskArtifact."""
+        source = ImageArtifact(Image.new("RGBA", (6, 4), (100, 150, 200, 180)))
+
+        result = extract_alpha(image=source, as_mask=True)
+
+        assert isinstance(result, MaskArtifact)
+        assert result.image.mode == "L"
+        assert result.width == 6 and result.height == 4
+        assert result.image.getpixel((2, 2)) == 180
+
+    def test_invalid_as_mask_type(self):
+        """Non-bool as_mask raises ValueError."""
+        source = ImageArtifact(Image.new("RGBA", (4, 4), (0, 0, 0, 255)))
+        with pytest.raises(ValueError, match="as_mask must be bool"):
+            extract_alpha(image=source, as_mask=1)  # type: ignore[arg-type]
@@ -5,7 +5,7 @@ from decimal import Decimal
 import pytest
 from PIL import Image
 
-from invariant_gfx.artifacts import ImageArtifact
+from invariant_gfx.artifacts import ImageArtifact, MaskArtifact
 from invariant_gfx.ops.gaussian_blur import gaussian_blur
 
 
@@ -63,3 +63,15 @@ class TestGaussianBlur:
 
         assert isinstance(result, ImageArtifact)
         assert result.width == 10 and result.height == 10
+
+    def test_mask_input_returns_mask(self):
+        """MaskArtifact input is blurred as a single band and stays a MaskArtifact."""
+        img = Image.new("L", (10, 10), 0)
+        img.putpixel((5, 5), 255)
+
+        result = gaussian_blur(image=MaskArtifact(img), sigma=1)
+
+        assert isinstance(result, MaskArtifact)
+        assert result.image.mode == "L"
+        assert result.image.getpixel((5, 5)) < 255
+        assert result.image.getpixel((4, 5)) > 0
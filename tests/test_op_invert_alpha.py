@@ -3,7 +3,7 @@
 import pytest
 from PIL import Image
 
-from invariant_gfx.artifacts import ImageArtifact
+from invariant_gfx.artifacts import ImageArtifact, MaskArtifact
 from invariant_gfx.ops.invert_alpha import invert_alpha
 
 
@@ -49,3 +49,12 @@ class TestInvertAlpha:
         result = invert_alpha(image=source)
 
         assert result.image.getpixel((0, 0)) == (0, 0, 0, 0)
+
+    def test_mask_input_returns_mask(self):
+        """MaskArtifact input is inverted directly and stays a MaskArtifact."""
+        source = MaskArtifact(Image.new("L", (4, 4), 200))
+
+        result = invert_alpha(image=source)
+
+        assert isinstance(result, MaskArtifact)
+        assert result.image.getpixel((0, 0)) == 55
@@ -8,6 +8,8 @@ from PIL import Image
 from invariant_gfx.artifacts import ImageArtifact
 from invariant_gfx.ops.layout import layout
 
+from .blend_reference import reference_premultiplied_over
+
 
 class TestLayout:
     """Tests for layout operation."""
@@ -162,3 +164,37 @@ class TestLayout:
 
         with pytest.raises(ValueError, match="gap must be Decimal, int, or str"):
             layout("row", "c", 3.14, [item1])  # type: ignore
+
+    def test_premultiplied_matches_straight_for_opaque_items(self):
+        """Premultiplied placement equals the straight path for opaque items."""
+        item1 = ImageArtifact(Image.new("RGBA", (10, 6), (255, 0, 0, 255)))
+        item2 = ImageArtifact(Image.new("RGBA", (4, 12), (0, 255, 0, 255)))
+
+        straight = layout("row", "c", 2, [item1, item2])
+        premultiplied = layout("row", "c", 2, [item1, item2], premultiplied=True)
+
+        assert premultiplied.premultiplied_image.mode == "RGBa"
+        assert premultiplied.image.tobytes() == straight.image.tobytes()
+        assert premultiplied.get_stable_hash() == straight.get_stable_hash()
+
+    def test_premultiplied_low_alpha_matches_exact_reference(self):
+        """Low-alpha items keep their exact premultiplied pixels."""
+        faint = Image.new("RGBA", (10, 6), (200, 120, 40, 3))
+        faint.putpixel((0, 0), (255, 255, 255, 1))
+        faint.putpixel((1, 0), (17, 99, 250, 254))
+        item1 = ImageArtifact(faint)
+        item2 = ImageArtifact(Image.new("RGBA", (4, 12), (90, 180, 250, 7)))
+
+        result = layout("row", "c", 2, [item1, item2], premultiplied=True)
+
+        expected = Image.new("RGBa", (16, 12), (0, 0, 0, 0))
+        reference_premultiplied_over(expected, faint.convert("RGBa"), (0, 3))
+        reference_premultiplied_over(expected, item2.image.convert("RGBa"), (12, 0))
+        assert result.premultiplied_image.tobytes() == expected.tobytes()
+
+    def test_invalid_premultiplied_type(self):
+        """Non-bool premultiplied raises ValueError."""
+        item1 = ImageArtifact(Image.new("RGBA", (10, 10), (255, 0, 0, 255)))
+
+        with pytest.raises(ValueError, match="premultiplied must be bool"):
+            layout("row", "c", 0, [item1], premultiplied=1)  # type: ignore
@@ -3,7 +3,7 @@
 import pytest
 from PIL import Image
 
-from invariant_gfx.artifacts import ImageArtifact
+from invariant_gfx.artifacts import ImageArtifact, MaskArtifact
 from invariant_gfx.ops.mask_alpha import mask_alpha
 
 
@@ -68,3 +68,14 @@ class TestMaskAlpha:
         mask = ImageArtifact(Image.new("RGBA", (20, 20), (0, 0, 0, 255)))
         with pytest.raises(ValueError, match="same dimensions"):
             mask_alpha(image=source, mask=mask)
+
+    def test_mask_artifact_mask(self):
+        """A MaskArtifact mask gives the same result as the equivalent RGBA mask."""
+        source = ImageArtifact(Image.new("RGBA", (4, 4), (10, 20, 30, 200)))
+        rgba_mask = ImageArtifact(Image.new("RGBA", (4, 4), (0, 0, 0, 128)))
+        l_mask = MaskArtifact(Image.new("L", (4, 4), 128))
+
+        expected = mask_alpha(image=source, mask=rgba_mask)
+        result = mask_alpha(image=source, mask=l_mask)
+
+        assert result.image.tobytes() == expected.image.tobytes()
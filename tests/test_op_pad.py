@@ -3,7 +3,7 @@
 import pytest
 from PIL import Image
 
-from invariant_gfx.artifacts import ImageArtifact
+from invariant_gfx.artifacts import ImageArtifact, MaskArtifact
 from invariant_gfx.ops.pad import pad
 
 
@@ -58,3 +58,14 @@ class TestPad:
         source = ImageArtifact(Image.new("RGBA", (4, 4), (0, 0, 0, 255)))
         with pytest.raises(ValueError, match="left must be int"):
             pad(image=source, left=1.5, top=0, right=0, bottom=0)  # type: ignore[arg-type]
+
+    def test_mask_input_padded_with_zero(self):
+        """MaskArtifact input is padded with zero coverage and stays a MaskArtifact."""
+        source = MaskArtifact(Image.new("L", (4, 4), 255))
+
+        result = pad(image=source, left=2, top=1, right=0, bottom=3)
+
+        assert isinstance(result, MaskArtifact)
+        assert (result.width, result.height) == (6, 8)
+        assert result.image.getpixel((0, 0)) == 0
+        assert result.image.getpixel((2, 1)) == 255
@@ -0,0 +1,476 @@
+"""Unit tests for gfx:render_shape operation."""
+
+import math
+from decimal import Decimal
+
+import pytest
+from invariant import Executor, Node
+from invariant.registry import OpRegistry
+from invariant.store.memory import MemoryStore
+from PIL import Image, ImageChops, ImageDraw, ImageFilter, ImageStat
+
+from invariant_gfx import shapes
+from invariant_gfx.artifacts import ImageArtifact
+from invariant_gfx.ops.render_shape import render_shape
+from invariant_gfx.ops.render_svg import render_svg
+
+# Coverage levels a 64x supersampled reference may be off by at an edge.
+EXACT_MAX_DIFF = 6
+
+FILL = (40, 120, 220, 200)
+STROKE = (200, 30, 30, 255)
+
+# Bounds on the difference from cairo (via gfx:render_svg), in premultiplied
+# levels. Cairo samples coverage on 15 sub-rows per pixel and quantizes it, so
+# a single sloped edge pixel may be up to two of its steps (~16 levels) off the
+# exact area, and curves add cairo's flattening of its Bezier arcs. Averaged
+# over 3x3 pixels that noise cancels: shifting the shape by a quarter pixel
+# or misplacing a join moves the mean and the local bound well past these.
+PARITY_MAX_DIFF = {"straight": 16, "curved": 24}
+PARITY_MAX_LOCAL_DIFF = 8
+PARITY_MAX_MEAN_DIFF = 0.2
+CURVED_SHAPES = {"rounded_rect", "circle", "ellipse", "arc"}
+
+# (shape, geometry, stroke width, equivalent shapes builder call) rendered at
+# 96x96. Besides one case per primitive, these cover a join beveled by the
+# miter limit and strokes thinner than a pixel.
+PARITY_CASES = [
+    (
+        "rect",
+        {"width": 40, "height": 30, "x": 4, "y": 6},
+        3,
+        lambda: shapes.rect(40, 30, x=4, y=6, fill=FILL, stroke=STROKE, stroke_width=3),
+    ),
+    (
+        "rounded_rect",
+        {"width": 50, "height": 30, "rx": 8, "ry": 6},
+        3,
+        lambda: shapes.rounded_rect(
+            50, 30, 8, ry=6, fill=FILL, stroke=STROKE, stroke_width=3
+        ),
+    ),
+    (
+        "circle",
+        {"cx": 20, "cy": 20, "r": 17},
+        3,
+        lambda: shapes.circle(20, 20, 17, fill=FILL, stroke=STROKE, stroke_width=3),
+    ),
+    (
+        "ellipse",
+        {"cx": 24, "cy": 12, "rx": 20, "ry": 10},
+        3,
+        lambda: shapes.ellipse(
+            24, 12, 20, 10, fill=FILL, stroke=STROKE, stroke_width=3
+        ),
+    ),
+    (
+        "line",
+        {"x1": 2, "y1": 30, "x2": 40, "y2": 4},
+        3,
+        lambda: shapes.line(2, 30, 40, 4, stroke=STROKE, stroke_width=3),
+    ),
+    (
+        "polygon",
+        {"points": [[0, 0], [40, 6], [30, 30], [12, 18]]},
+        3,
+        lambda: shapes.polygon(
+            [(0, 0), (40, 6), (30, 30), (12, 18)],
+            fill=FILL,
+            stroke=STROKE,
+            stroke_width=3,
+        ),
+    ),
+    (
+        "arc",
+        {"cx": 20, "cy": 20, "r": 16, "start_angle": -90, "end_angle": 135},
+        3,
+        lambda: shapes.arc(
+            20, 20, 16, -90, 135, fill=FILL, stroke=STROKE, stroke_width=3
+        ),
+    ),
+    (
+        "arc",
+        {"cx": 20, "cy": 20, "r": 16, "start_angle": 0, "end_angle": 60, "pie": True},
+        3,
+        lambda: shapes.arc(
+            20, 20, 16, 0, 60, pie=True, fill=FILL, stroke=STROKE, stroke_width=3
+        ),
+    ),
+    (
+        "polygon",
+        {"points": [[0, 0], [40, 5], [0, 10]]},
+        2,
+        lambda: shapes.polygon(
+            [(0, 0), (40, 5), (0, 10)], fill=FILL, stroke=STROKE, stroke_width=2
+        ),
+    ),
+    (
+        "line",
+        {"x1": 2, "y1": 30, "x2": 40, "y2": 4},
+        "0.25",
+        lambda: shapes.line(2, 30, 40, 4, stroke=STROKE, stroke_width=0.25),
+    ),
+    (
+        "rect",
+        {"width": 40, "height": 30, "x": 3, "y": 2},
+        "0.5",
+        lambda: shapes.rect(
+            40, 30, x=3, y=2, fill=FILL, stroke=STROKE, stroke_width=0.5
+        ),
+    ),
+]
+
+
+def _mean_abs_diff(a, b) -> float:
+    """Mean absolute difference over all channels of two 4-band images."""
+    return sum(ImageStat.Stat(ImageChops.difference(a, b)).mean) / 4
+
+
+def _max_abs_diff(a, b) -> int:
+    """Largest absolute difference of any channel of any pixel."""
+    diff = ImageChops.difference(a, b)
+    extrema = diff.getextrema() if len(diff.getbands()) > 1 else [diff.getextrema()]
+    return max(high for _, high in extrema)
+
+
+def _fitted(points, size):
+    """Map user-space points to pixels the way a polygon's viewBox is fitted."""
+    xs, ys = [x for x, _ in points], [y for _, y in points]
+    min_x, min_y = min(xs), min(ys)
+    view_w, view_h = max(1, max(xs) - min_x), max(1, max(ys) - min_y)
+    scale = min(size[0] / view_w, size[1] / view_h)
+    dx = (size[0] - view_w * scale) / 2 - min_x * scale
+    dy = (size[1] - view_h * scale) / 2 - min_y * scale
+    return [(x * scale + dx, y * scale + dy) for x, y in points], scale
+
+
+def _supersampled(size, polygons, factor=64):
+    """Reference coverage: polygons (pixel coordinates) drawn at a high
+    resolution and box-filtered down. Each polygon is (points, value), drawn
+    in order, so a later polygon of value 0 cuts a hole.
+    """
+    big = Image.new("L", (size[0] * factor, size[1] * factor), 0)
+    draw = ImageDraw.Draw(big)
+    for points, value in polygons:
+        draw.polygon([(x * factor, y * factor) for x, y in points], fill=value)
+    return big.reduce(factor)
+
+
+def _offset_convex(points, distance):
+    """A convex polygon grown by distance (shrunk if negative), miter-joined,
+    by intersecting its edges' offset lines."""
+    cx = sum(x for x, _ in points) / len(points)
+    cy = sum(y for _, y in points) / len(points)
+    lines = []
+    for (x0, y0), (x1, y1) in zip(points, points[1:] + points[:1]):
+        nx, ny = y1 - y0, x0 - x1
+        length = math.hypot(nx, ny)
+        nx, ny = nx / length, ny / length
+        if nx * (x0 - cx) + ny * (y0 - cy) < 0:
+            nx, ny = -nx, -ny
+        lines.append(((x0 + nx * distance, y0 + ny * distance), (x1 - x0, y1 - y0)))
+    result = []
+    for ((ax, ay), (adx, ady)), ((bx, by), (bdx, bdy)) in zip(
+        lines[-1:] + lines[:-1], lines
+    ):
+        t = ((bx - ax) * bdy - (by - ay) * bdx) / (adx * bdy - ady * bdx)
+        result.append((ax + adx * t, ay + ady * t))
+    return result
+
+
+def _stroke_pieces(points, half):
+    """A closed polygon's stroke as polygons whose union it is: one rectangle
+    per edge, plus each corner's miter (or bevel past SVG's miter limit of 4)
+    on both sides of the outline."""
+    count = len(points)
+    normals = []
+    for (x0, y0), (x1, y1) in zip(points, points[1:] + points[:1]):
+        length = math.hypot(x1 - x0, y1 - y0)
+        normals.append(((y1 - y0) / length * half, (x0 - x1) / length * half))
+    pieces = []
+    for i, ((x0, y0), (x1, y1)) in enumerate(zip(points, points[1:] + points[:1])):
+        nx, ny = normals[i]
+        pieces.append([(x0 + nx, y0 + ny), (x1 + nx, y1 + ny), (x1 - nx, y1 - ny)])
+        pieces[-1].append((x0 - nx, y0 - ny))
+    for i, (px, py) in enumerate(points):
+        (ax, ay), (bx, by) = normals[i - 1], normals[i]
+        cos_turn = (ax * bx + ay * by) / (half * half)
+        for sign in (1, -1):
+            corner = [(px, py), (px + sign * ax, py + sign * ay)]
+            if 1 + cos_turn >= 2 / 4.0**2:
+                factor = sign / (1 + cos_turn)
+                corner.append((px + (ax + bx) * factor, py + (ay + by) * factor))
+            corner.append((px + sign * bx, py + sign * by))
+            pieces.append(corner)
+    assert len(pieces) == 3 * count
+    return pieces
+
+
+class TestRenderShape:
+    """Tests for render_shape operation."""
+
+    @pytest.mark.parametrize(
+        ("shape", "geometry", "stroke_width", "svg"),
+        PARITY_CASES,
+        ids=[f"{case[0]}-{i}" for i, case in enumerate(PARITY_CASES)],
+    )
+    def test_matches_render_svg(self, shape, geometry, stroke_width, svg):
+        """Rasters match gfx:render_svg of the matching shapes builder.
+
+        Pixels are compared premultiplied: the straight color of a pixel with
+        an alpha of 1 or 2 is mostly rounding. The per-pixel and local bounds
+        hold everywhere, so they cover antialiased edges, miter and bevel
+        joins and sub-pixel strokes; the mean catches a systematic offset.
+        """
+        fill = None if shape == "line" else FILL
+
+        result = render_shape(
+            shape,
+            (96, 96),
+            geometry,
+            fill=fill,
+            stroke=STROKE,
+            stroke_width=stroke_width,
+        )
+
+        expected = render_svg(svg(), 96, 96)
+        assert result.image.size == expected.image.size
+        actual, reference = result.image.convert("RGBa"), expected.image.convert("RGBa")
+        assert _mean_abs_diff(actual, reference) <= PARITY_MAX_MEAN_DIFF
+        kind = "curved" if shape in CURVED_SHAPES else "straight"
+        assert _max_abs_diff(actual, reference) <= PARITY_MAX_DIFF[kind]
+        local = ImageFilter.BoxBlur(1)
+        assert (
+            _max_abs_diff(actual.filter(local), reference.filter(local))
+            <= PARITY_MAX_LOCAL_DIFF
+        )
+
+    def test_sloped_edges_match_exact_coverage(self):
+        """Coverage along sloped fill edges matches a supersampled reference."""
+        points = [[0, 0], [40, 6], [14, 30]]
+        size = (53, 41)
+
+        result = render_shape("polygon", size, {"points": points}, fill=(0, 0, 0, 255))
+
+        device, _ = _fitted(points, size)
+        expected = _supersampled(size, [(device, 255)])
+        assert _max_abs_diff(result.image.getchannel("A"), expected) <= EXACT_MAX_DIFF
+
+    def test_miter_joins_match_exact_coverage(self):
+        """Mitered stroke corners match a supersampled reference."""
+        points = [[0, 0], [40, 6], [14, 30]]
+        size = (53, 41)
+
+        result = render_shape(
+            "polygon",
+            size,
+            {"points": points},
+            stroke=(0, 0, 0, 255),
+            stroke_width=3,
+        )
+
+        device, scale = _fitted(points, size)
+        half = 1.5 * scale
+        expected = _supersampled(
+            size,
+            [(_offset_convex(device, half), 255), (_offset_convex(device, -half), 0)],
+        )
+        assert _max_abs_diff(result.image.getchannel("A"), expected) <= EXACT_MAX_DIFF
+
+    def test_sharp_joins_match_exact_coverage(self):
+        """A spike's beveled tip and the inside of its sharp turn are covered
+        as the union of the stroked edges and their joins."""
+        points = [[0, 0], [40, 5], [0, 10]]
+        size = (96, 24)
+
+        result = render_shape(
+            "polygon",
+            size,
+            {"points": points},
+            stroke=(0, 0, 0, 255),
+            stroke_width=2,
+        )
+
+        device, scale = _fitted(points, size)
+        pieces = _stroke_pieces(device, 1.0 * scale)
+        expected = _supersampled(size, [(piece, 255) for piece in pieces])
+        assert _max_abs_diff(result.image.getchannel("A"), expected) <= EXACT_MAX_DIFF
+
+    @pytest.mark.parametrize("stroke_width", ["0.25", "0.5", "1"])
+    def test_thin_strokes_match_exact_coverage(self, stroke_width):
+        """Sub-pixel strokes keep their exact coverage instead of vanishing."""
+        size = (40, 24)
+
+        result = render_shape(
+            "line",
+            size,
+            {"x1": 2, "y1": 3, "x2": 29, "y2": 17},
+            stroke=(0, 0, 0, 255),
+            stroke_width=stroke_width,
+        )
+
+        ((x0, y0), (x1, y1)), scale = _fitted([(2, 3), (29, 17)], size)
+        length = math.hypot(x1 - x0, y1 - y0)
+        half = float(stroke_width) * scale / 2
+        nx, ny = (y0 - y1) / length * half, (x1 - x0) / length * half
+        band = [
+            (x0 + nx, y0 + ny),
+            (x1 + nx, y1 + ny),
+            (x1 - nx, y1 - ny),
+            (x0 - nx, y0 - ny),
+        ]
+        expected = _supersampled(size, [(band, 255)])
+        assert _max_abs_diff(result.image.getchannel("A"), expected) <= EXACT_MAX_DIFF
+
+    def test_exact_edge_coverage(self):
+        """Edges between pixels are antialiased by the area they cover."""
+        # viewBox 0 0 3.5 3.5 scaled 2x into 8x7 leaves half a pixel of
+        # centering margin either side, so the rect spans x 1.5..7.5 and
+        # y 1..7 in device pixels.
+        result = render_shape(
+            "rect",
+            (8, 7),
+            {"width": 3, "height": 3, "x": "0.5", "y": Decimal("0.5")},
+            fill=(0, 0, 0, 255),
+        )
+
+        alpha = result.image.getchannel("A")
+        row = [alpha.getpixel((x, 4)) for x in range(8)]
+        column = [alpha.getpixel((4, y)) for y in range(7)]
+        assert row == [0, 128, 255, 255, 255, 255, 255, 128]
+        assert column == [0, 255, 255, 255, 255, 255, 255]
+
+    def test_circle_area(self):
+        """Total coverage of a filled circle is its area."""
+        result = render_shape(
+            "circle", (64, 64), {"cx": 32, "cy": 32, "r": 32}, fill=(0, 0, 0, 255)
+        )
+
+        coverage = ImageStat.Stat(result.image.getchannel("A")).sum[0] / 255
+        assert coverage == pytest.approx(math.pi * 32 * 32, rel=0.01)
+
+    def test_stroke_composited_over_fill(self):
+        """The stroke is centered on the outline and drawn over the fill."""
+        result = render_shape(
+            "rect",
+            (20, 20),
+            {"width": 10, "height": 10},
+            fill=(0, 0, 255, 255),
+            stroke=(255, 0, 0, 255),
+            stroke_width=2,
+        )
+
+        # Scale 2: the 4px stroke spans 2px either side of the rect's edges.
+        assert result.image.getpixel((0, 10)) == (255, 0, 0, 255)
+        assert result.image.getpixel((1, 10)) == (255, 0, 0, 255)
+        assert result.image.getpixel((2, 10)) == (0, 0, 255, 255)
+        assert result.image.getpixel((10, 10)) == (0, 0, 255, 255)
+
+    def test_wide_stroke_covers_interior(self):
+        """A stroke wider than the shape leaves no hole in the middle."""
+        result = render_shape(
+            "circle",
+            (32, 32),
+            {"cx": 8, "cy": 8, "r": 8},
+            stroke=(0, 0, 0, 255),
+            stroke_width=20,
+        )
+
+        assert result.image.getpixel((16, 16)) == (0, 0, 0, 255)
+
+    def test_full_turn_arc_draws_radius_only(self):
+        """A 360 degree arc has coinciding endpoints, so only the radius line draws."""
+        result = render_shape(
+            "arc",
+            (40, 40),
+            {"cx": 20, "cy": 20, "r": 20, "start_angle": 0, "end_angle": 360},
+            fill=(0, 0, 0, 255),
+            stroke=(0, 0, 0, 255),
+            stroke_width=2,
+        )
+
+        assert result.image.getbbox() == (20, 19, 40, 21)
+
+    def test_line_has_no_fill(self):
+        """Only a line's stroke is drawn."""
+        result = render_shape(
+            "line",
+            (10, 10),
+            {"x1": 0, "y1": 5, "x2": 10, "y2": 5},
+            fill=(0, 0, 0, 255),
+        )
+
+        assert result.image.getbbox() is None
+
+    def test_in_graph(self):
+        """Test render_shape as a graph node with CEL-resolved geometry."""
+        registry = OpRegistry()
+        registry.auto_discover()
+        executor = Executor(registry=registry, store=MemoryStore())
+        graph = {
+            "badge": Node(
+                op_name="gfx:render_shape",
+                params={
+                    "shape": "rounded_rect",
+                    "size": [72, 36],
+                    "geometry": {"width": 72, "height": 36, "rx": "${9 * 2}"},
+                    "fill": (0, 128, 0, 255),
+                },
+                deps=[],
+            ),
+        }
+
+        results = executor.execute(graph, ["badge"])
+
+        badge = results["badge"]
+        assert isinstance(badge, ImageArtifact)
+        assert badge.image.getpixel((36, 18)) == (0, 128, 0, 255)
+        assert badge.image.getpixel((0, 0))[3] == 0
+
+    def test_unknown_shape(self):
+        """Test that an unknown shape raises ValueError."""
+        with pytest.raises(ValueError, match="shape must be one of"):
+            render_shape("star", (10, 10), {}, fill=(0, 0, 0, 255))
+
+    def test_missing_geometry(self):
+        """Test that missing geometry keys raise ValueError."""
+        with pytest.raises(ValueError, match="circle geometry is missing r"):
+            render_shape("circle", (10, 10), {"cx": 5, "cy": 5}, fill=(0, 0, 0, 255))
+
+    def test_unknown_geometry(self):
+        """Test that geometry keys of another shape raise ValueError."""
+        with pytest.raises(ValueError, match="unknown rect geometry keys: rx"):
+            render_shape(
+                "rect",
+                (10, 10),
+                {"width": 5, "height": 5, "rx": 2},
+                fill=(0, 0, 0, 255),
+            )
+
+    def test_negative_radius(self):
+        """Test that a negative radius raises ValueError."""
+        with pytest.raises(ValueError, match="r must not be negative"):
+            render_shape(
+                "circle", (10, 10), {"cx": 5, "cy": 5, "r": -1}, fill=(0, 0, 0, 255)
+            )
+
+    def test_invalid_points(self):
+        """Test that malformed polygon points raise ValueError."""
+        with pytest.raises(ValueError, match=r"points\[1\] must be \[x, y\]"):
+            render_shape(
+                "polygon", (10, 10), {"points": [[0, 0], [1]]}, fill=(0, 0, 0, 255)
+            )
+
+    def test_invalid_size(self):
+        """Test that a non-positive size raises ValueError."""
+        with pytest.raises(ValueError, match="size must be positive"):
+            render_shape(
+                "circle", (0, 10), {"cx": 5, "cy": 5, "r": 5}, fill=(0, 0, 0, 255)
+            )
+
+    def test_invalid_color(self):
+        """Test that an invalid color raises ValueError."""
+        with pytest.raises(ValueError, match="color values must be int"):
+            render_shape(
+                "circle", (10, 10), {"cx": 5, "cy": 5, "r": 5}, fill=(0, 0, 0, 256)
+            )
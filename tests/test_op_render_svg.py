@@ -1,11 +1,15 @@
 """Unit tests for gfx:render_svg operation."""
 
+import sys
 from decimal import Decimal
+from io import BytesIO
 
+import cairosvg
 import pytest
+from PIL import Image
 
 from invariant_gfx.artifacts import BlobArtifact, ImageArtifact
-from invariant_gfx.ops.render_svg import render_svg
+from invariant_gfx.ops.render_svg import _parsed_tree, render_svg
 
 
 class TestRenderSvg:
@@ -123,3 +127,75 @@ class TestRenderSvg:
                 width=48,
                 height=48,
             )
+
+    def test_surface_conversion_failure(self, monkeypatch):
+        """A failure reading the rendered surface raises ValueError."""
+        render_svg_module = sys.modules["invariant_gfx.ops.render_svg"]
+
+        def fail(surface):
+            raise RuntimeError("unsupported surface format")
+
+        monkeypatch.setattr(render_svg_module, "_render_surface", lambda *args: None)
+        monkeypatch.setattr(render_svg_module, "_surface_to_image", fail)
+        blob = BlobArtifact(data=b"<svg/>", content_type="image/svg+xml")
+
+        with pytest.raises(ValueError, match="unsupported surface format"):
+            render_svg(svg_content=blob, width=31, height=17)
+
+    @pytest.mark.parametrize(
+        "svg_string",
+        [
+            # Opaque fill: cairo writes an RGB PNG for fully opaque surfaces.
+            '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24"><rect width="24" height="24" fill="#3a7bd5"/></svg>',
+            # Anti-aliased edges over transparency.
+            '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24"><circle cx="12" cy="12" r="9.3" fill="#e94e1b"/></svg>',
+            # Translucent, overlapping fills exercise every alpha level.
+            '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24"><defs><linearGradient id="g"><stop offset="0" stop-color="#0f0" stop-opacity="0"/><stop offset="1" stop-color="#f0f" stop-opacity="1"/></linearGradient></defs><rect width="24" height="24" fill="url(#g)"/><circle cx="12" cy="12" r="7" fill="#123456" fill-opacity="0.37"/></svg>',
+        ],
+    )
+    def test_matches_svg2png(self, svg_string):
+        """Pixels are identical to decoding cairosvg.svg2png output."""
+        png_bytes = cairosvg.svg2png(
+            bytestring=svg_string.encode("utf-8"), output_width=37, output_height=53
+        )
+        expected = Image.open(BytesIO(png_bytes)).convert("RGBA")
+
+        result = render_svg(svg_content=svg_string, width=37, height=53)
+
+        assert result.image.tobytes() == expected.tobytes()
+
+    def test_parses_once_across_sizes(self):
+        """Rendering one icon at several sizes parses its SVG once."""
+        from justmyresource import get_default_registry
+
+        resource = get_default_registry().get_resource("lucide:thermometer")
+        _parsed_tree.cache_clear()
+
+        for size in (48, 72, 96, 144):
+            result = render_svg(svg_content=resource.data, width=size, height=size)
+            assert result.width == size
+
+        info = _parsed_tree.cache_info()
+        assert (info.misses, info.hits) == (1, 3)
+
+    def test_cached_tree_is_not_mutated_by_drawing(self):
+        """Masks and patterns, which cairosvg resolves in place, redraw correctly."""
+        svg_string = (
+            '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24">'
+            '<defs><pattern id="p" width="25%" height="25%">'
+            '<rect width="3" height="3" fill="#c00"/></pattern>'
+            '<mask id="m"><circle cx="12" cy="12" r="10" fill="white"/></mask></defs>'
+            '<rect width="24" height="24" fill="url(#p)" mask="url(#m)"/></svg>'
+        )
+
+        for size in (32, 80, 32):
+            png_bytes = cairosvg.svg2png(
+                bytestring=svg_string.encode("utf-8"),
+                output_width=size,
+                output_height=size,
+            )
+            expected = Image.open(BytesIO(png_bytes)).convert("RGBA")
+
+            result = render_svg(svg_content=svg_string, width=size, height=size)
+
+            assert result.image.tobytes() == expected.tobytes()
@@ -0,0 +1,98 @@
+"""Unit tests for gfx:render_svg_sizes operation."""
+
+import pytest
+from invariant import Executor, Node, ref
+from invariant.registry import OpRegistry
+from invariant.store.memory import MemoryStore
+
+from invariant_gfx.artifacts import BlobArtifact, ImageArtifact
+from invariant_gfx.ops.render_svg import _parsed_tree, render_svg
+from invariant_gfx.ops.render_svg_sizes import render_svg_sizes
+
+
+@pytest.fixture
+def icon_blob():
+    """A Lucide icon SVG blob."""
+    from justmyresource import get_default_registry
+
+    resource = get_default_registry().get_resource("lucide:thermometer")
+    return BlobArtifact(data=resource.data, content_type=resource.content_type)
+
+
+class TestRenderSvgSizes:
+    """Tests for render_svg_sizes operation."""
+
+    def test_matches_render_svg_per_size(self, icon_blob):
+        """Each raster is identical to a gfx:render_svg node at that size."""
+        sizes = [48, "72", [96, 64], 144]
+
+        results = render_svg_sizes(svg_content=icon_blob, sizes=sizes)
+
+        assert list(results) == ["48", "72", "96x64", "144"]
+        for result, (width, height) in zip(
+            results.values(), [(48, 48), (72, 72), (96, 64), (144, 144)], strict=True
+        ):
+            assert isinstance(result, ImageArtifact)
+            assert (result.width, result.height) == (width, height)
+            expected = render_svg(svg_content=icon_blob, width=width, height=height)
+            assert result.image.tobytes() == expected.image.tobytes()
+
+    def test_parses_once(self, icon_blob):
+        """The whole ladder is drawn from one parse."""
+        _parsed_tree.cache_clear()
+
+        render_svg_sizes(svg_content=icon_blob, sizes=[48, 72, 96, 144])
+
+        info = _parsed_tree.cache_info()
+        assert (info.misses, info.hits) == (1, 0)
+
+    def test_repeated_sizes_render_once(self, icon_blob):
+        """Repeated sizes are rendered once."""
+        results = render_svg_sizes(svg_content=icon_blob, sizes=[48, [48, 48], 72])
+
+        assert list(results) == ["48", "72"]
+
+    def test_size_selected_in_graph(self, icon_blob):
+        """A stdlib:dict_get node picks one size out as its own artifact."""
+        registry = OpRegistry()
+        registry.auto_discover()
+        executor = Executor(registry=registry, store=MemoryStore())
+        graph = {
+            "icons": Node(
+                op_name="gfx:render_svg_sizes",
+                params={"svg_content": icon_blob, "sizes": [48, 96]},
+                deps=[],
+            ),
+            "icon_96": Node(
+                op_name="stdlib:dict_get",
+                params={"dict_obj": ref("icons"), "key": "96"},
+                deps=["icons"],
+            ),
+        }
+
+        results = executor.execute(graph, ["icon_96"])
+
+        assert isinstance(results["icon_96"], ImageArtifact)
+        assert results["icon_96"].width == 96
+
+    def test_empty_sizes(self, icon_blob):
+        """Test that an empty sizes list raises ValueError."""
+        with pytest.raises(ValueError, match="sizes must be a non-empty list"):
+            render_svg_sizes(svg_content=icon_blob, sizes=[])
+
+    def test_invalid_size_pair(self, icon_blob):
+        """Test that a size pair of the wrong length raises ValueError."""
+        with pytest.raises(ValueError, match=r"sizes\[1\] must be a size"):
+            render_svg_sizes(svg_content=icon_blob, sizes=[48, [48, 48, 48]])
+
+    def test_non_positive_size(self, icon_blob):
+        """Test that non-positive sizes raise ValueError."""
+        with pytest.raises(ValueError, match="size must be positive"):
+            render_svg_sizes(svg_content=icon_blob, sizes=[48, 0])
+
+    def test_invalid_svg_data(self):
+        """Test that invalid SVG data raises ValueError."""
+        blob = BlobArtifact(data=b"not an svg", content_type="image/svg+xml")
+
+        with pytest.raises(ValueError, match="failed to render"):
+            render_svg_sizes(svg_content=blob, sizes=[48, 96])
@@ -1,14 +1,33 @@
 """Unit tests for gfx:render_text operation."""
 
+import gc
+import sys
+import weakref
 from decimal import Decimal
 
 import pytest
+from PIL import Image, ImageDraw, ImageFont
 
-from invariant_gfx.artifacts import BlobArtifact, ImageArtifact
+from invariant_gfx.artifacts import BlobArtifact, ImageArtifact, MaskArtifact
+from invariant_gfx.ops.colorize import colorize
 from invariant_gfx.ops.render_text import (
+    _FIT_WIDTH_REFERENCE_SIZE,
+    _FONT_BLOB_CACHE,
+    _FONT_BLOB_CACHE_BYTES,
+    TextMeasurementCacheInfo,
+    _cached_text_bbox,
+    _cached_text_mask,
     _fit_width_font_size,
+    _glyph_atlas,
+    _load_font,
     _measure_text_width,
+    _multiline_bbox,
+    _render_at_size,
+    _text_bbox,
+    font_blob_cache_info,
     render_text,
+    set_font_blob_cache_budget,
+    text_measurement_cache_info,
 )
 
 from .conftest import TEST_FONT_FAMILY
@@ -262,6 +281,26 @@ class TestRenderText:
         assert width <= target
         assert next_width > target
 
+    def test_fit_width_scales_one_reference_measurement(self):
+        """fit_width sizes from the reference width plus one confirming measurement."""
+        text = "Temperature 21.5°C"
+        measured_sizes = []
+
+        def measure_width(size):
+            measured_sizes.append(size)
+            return _measure_text_width(text, FONT, size)[0]
+
+        size = _fit_width_font_size(
+            text=text,
+            font=FONT,
+            fit_width=Decimal("160"),
+            measure_width=measure_width,
+        )
+
+        assert measured_sizes[0] == _FIT_WIDTH_REFERENCE_SIZE
+        assert len(measured_sizes) <= 3
+        assert _measure_text_width(text, FONT, size)[0] <= 160
+
     def test_fit_width_exclusive(self):
         """Test that passing both size and fit_width raises ValueError."""
         with pytest.raises(ValueError, match="exactly one of size or fit_width"):
@@ -295,3 +334,313 @@ class TestRenderText:
         assert isinstance(result, ImageArtifact)
         assert result.width <= 85
         assert result.height > 0
+
+
+def _draw_text_reference(text, pil_font, color) -> Image.Image:
+    """Render text the way gfx:render_text did before the glyph atlas."""
+    bbox = _text_bbox(text, pil_font)
+    width = max(0, bbox[2] - bbox[0]) + 4
+    height = max(0, bbox[3] - bbox[1]) + 4
+    image = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    draw.text((2 - bbox[0], 2 - bbox[1]), text, font=pil_font, fill=color)
+    return image
+
+
+class TestGlyphAtlas:
+    """Tests for the glyph atlas render path."""
+
+    @pytest.mark.parametrize("size", [7, 12, 24, 61])
+    @pytest.mark.parametrize(
+        "text",
+        ["12:45", "-0.125%", "AVATAR Tokyo", "WAVE fi ffl", "Tj yg", "äöü €", " x "],
+    )
+    def test_pixel_identical_to_draw_text(self, text, size):
+        """Atlas-assembled text matches ImageDraw.text byte for byte."""
+        pil_font = _load_font(FONT, size)
+        color = (200, 120, 40, 180)
+
+        result = _render_at_size(text, pil_font, color)
+
+        expected = _draw_text_reference(text, pil_font, color)
+        assert result.image.tobytes() == expected.tobytes()
+
+    def test_glyphs_rasterized_once_per_font(self):
+        """Repeated characters are cached on the font's atlas."""
+        pil_font = _load_font(FONT, 19)
+        atlas = _glyph_atlas(pil_font)
+
+        render_text(text="1010", font=FONT, size=19, color=(0, 0, 0, 255))
+        glyph = atlas._glyphs["1"]
+        render_text(text="0101", font=FONT, size=19, color=(9, 9, 9, 255))
+
+        assert set(atlas._glyphs) >= {"0", "1"}
+        assert atlas._glyphs["1"] is glyph
+
+    def test_atlas_tables_are_bounded(self, monkeypatch):
+        """An atlas drops its tables rather than grow past the entry limits."""
+        render_text_module = sys.modules["invariant_gfx.ops.render_text"]
+        monkeypatch.setattr(render_text_module, "_GLYPH_ATLAS_MAX_GLYPHS", 8)
+        monkeypatch.setattr(render_text_module, "_GLYPH_ATLAS_MAX_PAIRS", 8)
+        pil_font = ImageFont.truetype(_load_font(FONT, 23).path, 23)
+        atlas = _glyph_atlas(pil_font)
+        text = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+        result = _render_at_size(text, pil_font, (0, 0, 0, 255))
+
+        assert len(atlas._glyphs) <= 8
+        assert len(atlas._advances) <= 8
+        assert len(atlas._kerning) <= 8
+        expected = _draw_text_reference(text, pil_font, (0, 0, 0, 255))
+        assert result.image.tobytes() == expected.tobytes()
+
+    def test_atlas_released_with_font(self):
+        """A font's atlas does not outlive the font."""
+        pil_font = ImageFont.truetype(_load_font(FONT, 29).path, 29)
+        atlas = weakref.ref(_glyph_atlas(pil_font))
+        atlas().advance("abc")
+
+        del pil_font
+        gc.collect()
+
+        assert atlas() is None
+
+    def test_multiline_matches_draw_text(self):
+        """Multiline text keeps the ImageDraw path."""
+        pil_font = _load_font(FONT, 20)
+
+        result = _render_at_size("A\nBC", pil_font, (255, 255, 255, 255))
+
+        expected = _draw_text_reference("A\nBC", pil_font, (255, 255, 255, 255))
+        assert result.image.tobytes() == expected.tobytes()
+
+
+class TestTextMeasurementCache:
+    """Tests for the process-wide text measurement cache."""
+
+    def test_repeat_measurement_hits_cache(self):
+        """Measuring the same string and size again is a cache hit."""
+        _cached_text_bbox.cache_clear()
+
+        first = _measure_text_width("Cached label", FONT, 18)
+        second = _measure_text_width("Cached label", FONT, 18)
+
+        info = text_measurement_cache_info()
+        assert isinstance(info, TextMeasurementCacheInfo)
+        assert first == second
+        assert info.misses == 1
+        assert info.hits == 1
+
+    def test_size_is_part_of_identity(self):
+        """The same string at another size is measured separately."""
+        _cached_text_bbox.cache_clear()
+
+        _measure_text_width("Cached label", FONT, 18)
+        _measure_text_width("Cached label", FONT, 19)
+
+        assert text_measurement_cache_info().misses == 2
+
+    def test_keyed_on_font_identity(self):
+        """A reloaded copy of a font shares its measurements without pinning it."""
+        _cached_text_bbox.cache_clear()
+        path = _load_font(FONT, 18).path
+        first = ImageFont.truetype(path, 18)
+        font_ref = weakref.ref(first)
+
+        bbox = _text_bbox("Same font", first)
+        del first
+        gc.collect()
+
+        assert font_ref() is None
+        assert _text_bbox("Same font", ImageFont.truetype(path, 18)) == bbox
+        info = text_measurement_cache_info()
+        assert (info.misses, info.hits) == (1, 1)
+
+    @pytest.mark.parametrize(
+        "text",
+        ["Line 1\nLine 2", "gy\nAj\nQp", "\nleading", "trailing\n", "a\n\nb", "\n"],
+    )
+    @pytest.mark.parametrize("size", [9, 24, 61])
+    def test_multiline_bbox_matches_imagedraw(self, text, size):
+        """Metric-based multiline boxes match ImageDraw.multiline_textbbox."""
+        pil_font = _load_font(FONT, size)
+        draw = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+
+        assert _multiline_bbox(text, pil_font) == draw.multiline_textbbox(
+            (0, 0), text, font=pil_font
+        )
+
+    def test_fit_width_rerender_skips_measurement(self):
+        """A repeated fit_width render in another color only hits the cache."""
+        render_text(text="88.8", font=FONT, fit_width=70, color=(255, 0, 0, 255))
+        misses = text_measurement_cache_info().misses
+
+        render_text(text="88.8", font=FONT, fit_width=70, color=(0, 0, 255, 255))
+
+        assert text_measurement_cache_info().misses == misses
+
+
+@pytest.fixture
+def font_blob() -> BlobArtifact:
+    """The test font as a BlobArtifact, with a fresh font blob cache."""
+    from justmytype import FontRegistry
+
+    info = FontRegistry().find_font(FONT)
+    _FONT_BLOB_CACHE.clear()
+    yield BlobArtifact(data=info.path.read_bytes(), content_type="font/ttf")
+    set_font_blob_cache_budget(_FONT_BLOB_CACHE_BYTES)
+    _FONT_BLOB_CACHE.clear()
+
+
+class TestFontBlobCache:
+    """Tests for the byte-budgeted cache of fonts loaded from blobs."""
+
+    def test_repeat_load_hits_cache(self, font_blob):
+        """Rendering with the same blob and size loads the font once."""
+        first = render_text(text="A", font=font_blob, size=20, color=(0, 0, 0, 255))
+        second = render_text(text="A", font=font_blob, size=20, color=(0, 0, 0, 255))
+
+        info = font_blob_cache_info()
+        assert first.get_stable_hash() == second.get_stable_hash()
+        assert (info.hits, info.misses, info.fonts) == (1, 1, 1)
+        assert info.nbytes == len(font_blob.data)
+
+    def test_equal_blobs_share_entry(self, font_blob):
+        """A second artifact with the same bytes reuses the cached font."""
+        copy = BlobArtifact(data=bytes(font_blob.data), content_type="font/ttf")
+
+        render_text(text="A", font=font_blob, size=20, color=(0, 0, 0, 255))
+        render_text(text="A", font=copy, size=20, color=(0, 0, 0, 255))
+
+        assert font_blob_cache_info().hits == 1
+
+    def test_budget_evicts_least_recently_used(self, font_blob):
+        """Loaded sizes beyond the byte budget evict the oldest entries."""
+        set_font_blob_cache_budget(len(font_blob.data) * 2)
+
+        for size in (12, 14, 16):
+            render_text(text="A", font=font_blob, size=size, color=(0, 0, 0, 255))
+        render_text(text="A", font=font_blob, size=14, color=(0, 0, 0, 255))
+        render_text(text="A", font=font_blob, size=12, color=(0, 0, 0, 255))
+
+        info = font_blob_cache_info()
+        assert info.fonts == 2
+        assert info.nbytes <= info.max_bytes
+        assert (info.hits, info.misses, info.evictions) == (1, 4, 2)
+
+    def test_font_larger_than_budget_is_not_cached(self, font_blob):
+        """A font bigger than the whole budget still renders, uncached."""
+        set_font_blob_cache_budget(len(font_blob.data) - 1)
+
+        result = render_text(text="A", font=font_blob, size=20, color=(0, 0, 0, 255))
+
+        assert result.width > 0
+        assert font_blob_cache_info().fonts == 0
+
+    def test_lowering_budget_evicts(self, font_blob):
+        """Shrinking the budget evicts entries that no longer fit."""
+        render_text(text="A", font=font_blob, size=20, color=(0, 0, 0, 255))
+
+        set_font_blob_cache_budget(0)
+
+        info = font_blob_cache_info()
+        assert (info.fonts, info.nbytes, info.evictions) == (0, 0, 1)
+
+    def test_evicted_fonts_are_released(self, font_blob, monkeypatch):
+        """Evicted fonts are freed, so the statistics match what is resident."""
+        loaded = []
+        truetype = ImageFont.truetype
+
+        def tracking_truetype(*args, **kwargs):
+            pil_font = truetype(*args, **kwargs)
+            loaded.append(weakref.ref(pil_font))
+            return pil_font
+
+        monkeypatch.setattr(ImageFont, "truetype", tracking_truetype)
+        set_font_blob_cache_budget(len(font_blob.data) * 2)
+
+        for size in range(10, 60):
+            render_text(text="Resident", font=font_blob, size=size, as_mask=True)
+        gc.collect()
+
+        info = font_blob_cache_info()
+        assert sum(ref() is not None for ref in loaded) == info.fonts == 2
+        assert info.nbytes == 2 * len(font_blob.data)
+
+    def test_reloaded_size_reuses_masks(self, font_blob):
+        """Masks cached before an eviction serve the reloaded font."""
+        set_font_blob_cache_budget(len(font_blob.data))
+        render_text(text="Again", font=font_blob, size=20, as_mask=True)
+        render_text(text="Again", font=font_blob, size=21, as_mask=True)
+        hits = _cached_text_mask.cache_info().hits
+
+        render_text(text="Again", font=font_blob, size=20, as_mask=True)
+
+        assert font_blob_cache_info().evictions == 2
+        assert _cached_text_mask.cache_info().hits == hits + 1
+
+    def test_invalid_budget(self):
+        """Test that the budget must be a non-negative int."""
+        with pytest.raises(ValueError, match="max_bytes must be a non-negative int"):
+            set_font_blob_cache_budget(-1)
+
+
+class TestTextMask:
+    """Tests for color-independent text masks."""
+
+    def test_as_mask_returns_coverage(self):
+        """as_mask returns the alpha a white render would have."""
+        mask = render_text(text="Mask me", font=FONT, size=22, as_mask=True)
+        white = render_text(
+            text="Mask me", font=FONT, size=22, color=(255, 255, 255, 255)
+        )
+
+        assert isinstance(mask, MaskArtifact)
+        assert mask.image.size == white.image.size
+        assert mask.image.tobytes() == white.image.getchannel("A").tobytes()
+
+    def test_multiline_as_mask(self):
+        """Multiline text masks match the drawn alpha as well."""
+        mask = render_text(text="Two\nlines", font=FONT, size=18, as_mask=True)
+        drawn = render_text(text="Two\nlines", font=FONT, size=18, color=(0, 0, 0, 255))
+
+        assert mask.image.tobytes() == drawn.image.getchannel("A").tobytes()
+
+    def test_colorized_mask_matches_opaque_render_alpha(self):
+        """render_text(as_mask) -> colorize gives the text's shape in that color."""
+        mask = render_text(text="Status", font=FONT, size=20, as_mask=True)
+        direct = render_text(text="Status", font=FONT, size=20, color=(200, 0, 0, 255))
+
+        colored = colorize(mask, (200, 0, 0, 255))
+
+        assert colored.image.getchannel("A").tobytes() == (
+            direct.image.getchannel("A").tobytes()
+        )
+        assert colored.image.getpixel((0, 0))[:3] == (200, 0, 0)
+
+    def test_colors_share_one_rasterization(self):
+        """Rendering a label in several colors rasterizes it once."""
+        _cached_text_mask.cache_clear()
+
+        for color in ((255, 255, 255, 255), (128, 128, 128, 255), (255, 0, 0, 255)):
+            render_text(text="Theme", font=FONT, size=24, color=color)
+
+        info = _cached_text_mask.cache_info()
+        assert (info.misses, info.hits) == (1, 2)
+
+    def test_color_with_as_mask_raises(self):
+        """Test that color is rejected when as_mask is True."""
+        with pytest.raises(ValueError, match="color must not be provided"):
+            render_text(
+                text="A", font=FONT, size=12, color=(0, 0, 0, 255), as_mask=True
+            )
+
+    def test_missing_color_raises(self):
+        """Test that color is required without as_mask."""
+        with pytest.raises(ValueError, match="color must be a tuple/list"):
+            render_text(text="A", font=FONT, size=12)
+
+    def test_invalid_as_mask(self):
+        """Test that as_mask must be bool."""
+        with pytest.raises(ValueError, match="as_mask must be bool"):
+            render_text(text="A", font=FONT, size=12, as_mask="yes")
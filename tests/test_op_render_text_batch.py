@@ -0,0 +1,132 @@
+"""Tests for gfx:render_text_batch operation."""
+
+from decimal import Decimal
+
+import pytest
+from invariant import Executor, Node, ref
+from invariant.registry import OpRegistry
+from invariant.store.memory import MemoryStore
+
+from invariant_gfx import register_core_ops
+from invariant_gfx.artifacts import ImageArtifact, MaskArtifact
+from invariant_gfx.ops.render_text import render_text
+from invariant_gfx.ops.render_text_batch import render_text_batch
+
+from .conftest import TEST_FONT_FAMILY
+
+FONT = TEST_FONT_FAMILY
+
+
+class TestRenderTextBatch:
+    """Tests for render_text_batch operation."""
+
+    def test_matches_render_text_per_item(self):
+        """Each label is identical to a separate render_text call."""
+        texts = ["12:04", "87.5%", "-3.2°C", "Hello World", "12:04"]
+        color = (255, 200, 0, 255)
+
+        results = render_text_batch(texts=texts, font=FONT, color=color, size=24)
+
+        assert len(results) == len(texts)
+        for text, result in zip(texts, results, strict=True):
+            expected = render_text(text=text, font=FONT, color=color, size=24)
+            assert isinstance(result, ImageArtifact)
+            assert result.get_stable_hash() == expected.get_stable_hash()
+
+    def test_multiline_item(self):
+        """Multiline strings render like render_text."""
+        results = render_text_batch(
+            texts=["Line 1\nLine 2"], font=FONT, color=(0, 0, 0, 255), size="16"
+        )
+        expected = render_text(
+            text="Line 1\nLine 2", font=FONT, color=(0, 0, 0, 255), size=16
+        )
+
+        assert results[0].get_stable_hash() == expected.get_stable_hash()
+
+    def test_empty_batch(self):
+        """An empty batch renders nothing."""
+        assert (
+            render_text_batch(texts=[], font=FONT, color=(0, 0, 0, 255), size=12) == []
+        )
+
+    def test_decimal_size(self):
+        """Test size as Decimal."""
+        results = render_text_batch(
+            texts=["A", "B"], font=FONT, color=(0, 0, 0, 255), size=Decimal("20")
+        )
+
+        assert [r.height for r in results] == [
+            render_text(text=t, font=FONT, color=(0, 0, 0, 255), size=20).height
+            for t in ("A", "B")
+        ]
+
+    def test_invalid_texts(self):
+        """Test that texts must be a list of strings."""
+        with pytest.raises(ValueError, match="texts must be a list"):
+            render_text_batch(texts="abc", font=FONT, color=(0, 0, 0, 255), size=12)
+
+        with pytest.raises(ValueError, match=r"texts\[1\] must be a string"):
+            render_text_batch(texts=["a", 1], font=FONT, color=(0, 0, 0, 255), size=12)
+
+    def test_invalid_color(self):
+        """Test that invalid color raises ValueError."""
+        with pytest.raises(ValueError, match="color must be a tuple/list"):
+            render_text_batch(texts=["a"], font=FONT, color=(0, 0, 0), size=12)
+
+    def test_invalid_size(self):
+        """Test that non-positive size raises ValueError."""
+        with pytest.raises(ValueError, match="size must be positive"):
+            render_text_batch(texts=["a"], font=FONT, color=(0, 0, 0, 255), size=0)
+
+    def test_as_mask(self):
+        """as_mask returns the same masks as render_text."""
+        results = render_text_batch(
+            texts=["On", "Off"], font=FONT, size=16, as_mask=True
+        )
+
+        for text, result in zip(("On", "Off"), results, strict=True):
+            expected = render_text(text=text, font=FONT, size=16, as_mask=True)
+            assert isinstance(result, MaskArtifact)
+            assert result.get_stable_hash() == expected.get_stable_hash()
+
+    def test_color_with_as_mask_raises(self):
+        """Test that color is rejected when as_mask is True."""
+        with pytest.raises(ValueError, match="color must not be provided"):
+            render_text_batch(
+                texts=["a"], font=FONT, color=(0, 0, 0, 255), size=12, as_mask=True
+            )
+
+    def test_batch_feeds_layout(self):
+        """A batch node's list output can be laid out directly."""
+        registry = OpRegistry()
+        register_core_ops(registry)
+        executor = Executor(registry=registry, store=MemoryStore())
+        graph = {
+            "labels": Node(
+                op_name="gfx:render_text_batch",
+                params={
+                    "texts": ["CPU 41%", "MEM 63%", "NET 2.1M"],
+                    "font": FONT,
+                    "color": (255, 255, 255, 255),
+                    "size": 14,
+                },
+                deps=[],
+            ),
+            "column": Node(
+                op_name="gfx:layout",
+                params={
+                    "direction": "column",
+                    "align": "s",
+                    "gap": 2,
+                    "items": ref("labels"),
+                },
+                deps=["labels"],
+            ),
+        }
+
+        results = executor.execute(graph, ["labels", "column"])
+
+        labels = results["labels"]
+        assert len(labels) == 3
+        assert results["column"].height == sum(label.height for label in labels) + 4
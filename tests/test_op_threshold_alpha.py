@@ -3,7 +3,7 @@
 import pytest
 from PIL import Image
 
-from invariant_gfx.artifacts import ImageArtifact
+from invariant_gfx.artifacts import ImageArtifact, MaskArtifact
 from invariant_gfx.ops.threshold_alpha import threshold_alpha
 
 
@@ -61,3 +61,15 @@ class TestThresholdAlpha:
         source = ImageArtifact(Image.new("RGBA", (8, 8), (0, 0, 0, 128)))
         with pytest.raises(ValueError, match="t must be int in 0-255"):
             threshold_alpha(image=source, t=256)
+
+    def test_mask_input_returns_mask(self):
+        """MaskArtifact input is thresholded directly and stays a MaskArtifact."""
+        img = Image.new("L", (2, 1), 0)
+        img.putpixel((0, 0), 100)
+        img.putpixel((1, 0), 200)
+
+        result = threshold_alpha(image=MaskArtifact(img), t=128)
+
+        assert isinstance(result, MaskArtifact)
+        assert result.image.getpixel((0, 0)) == 0
+        assert result.image.getpixel((1, 0)) == 255
@@ -30,7 +30,9 @@ _IMAGE_OPS = {
     "mask_alpha",
     "opacity",
     "pad",
+    "render_shape",
     "render_svg",
+    "render_svg_sizes",
     "resize",
     "rotate",
     "threshold_alpha",
@@ -96,6 +98,8 @@ def test_register_core_ops_exposes_expected_traits_and_refs():
     assert registry.traits("gfx:resolve_resource") == _RESOURCE_TRAITS
     assert registry.traits("gfx:render_text") == _TEXT_TRAITS
     assert registry.traits("gfx:packed_text") == _TEXT_TRAITS
+    assert registry.traits("gfx:packed_text_layout") == _TEXT_TRAITS
+    assert registry.traits("gfx:render_text_batch") == _TEXT_TRAITS
     assert registry.traits("gfx:resolve_color") == _LOW_COST_TRAITS
 
 
@@ -1,10 +1,24 @@
 """Tests for the packed_text op."""
 
-from invariant import Executor, Node
+import gc
+import weakref
+
+import pytest
+from invariant import Executor, Node, ref
 from invariant.registry import OpRegistry
 from invariant.store.memory import MemoryStore
+from justmytype import FontRegistry
+
 from invariant_gfx import register_core_ops
-from invariant_gfx.artifacts import ImageArtifact
+from invariant_gfx.artifacts import BlobArtifact, ImageArtifact
+from invariant_gfx.ops.packed_text import (
+    _cached_layout,
+    _TextMeasurer,
+    _wrap_tokens,
+    packed_text,
+)
+from invariant_gfx.ops.packed_text_layout import packed_text_layout
+from invariant_gfx.ops.render_text import text_measurement_cache_info
 
 
 def _make_executor():
@@ -91,3 +105,216 @@ def test_packed_text_handles_extreme_phrase_with_drop(test_font_family: str):
     results = executor.execute(graph, ["label"])
     assert results["label"].width == 196
     assert results["label"].height == 196
+
+
+def test_packed_text_premultiplied(test_font_family: str):
+    """premultiplied=True yields the same coverage as the straight path."""
+    executor = _make_executor()
+    params = {
+        "text": "Momentary lapse of Reason",
+        "size": (128, 96),
+        "font": test_font_family,
+        "color": (255, 255, 255, 255),
+        "min_font_size": 10,
+        "max_font_size": 32,
+    }
+    graph = {
+        "straight": Node(op_name="gfx:packed_text", params=params, deps=[]),
+        "premultiplied": Node(
+            op_name="gfx:packed_text",
+            params={**params, "premultiplied": True},
+            deps=[],
+        ),
+    }
+
+    results = executor.execute(graph, ["straight", "premultiplied"])
+    straight = results["straight"].image.getchannel("A")
+    premultiplied = results["premultiplied"].image.getchannel("A")
+    assert premultiplied.tobytes() == straight.tobytes()
+
+
+def test_packed_text_measurements_shared_across_renders(test_font_family: str):
+    """Re-rendering the same text in another color reuses every measurement."""
+    params = {
+        "text": "Momentary lapse of Reason",
+        "size": (150, 90),
+        "font": test_font_family,
+        "min_font_size": 8,
+        "max_font_size": 40,
+    }
+    packed_text(color=(255, 255, 255, 255), **params)
+    misses = text_measurement_cache_info().misses
+
+    packed_text(color=(255, 0, 0, 255), **params)
+
+    assert text_measurement_cache_info().misses == misses
+
+
+def _wrap_by_measuring_every_candidate(tokens, max_width, measurer, font_size):
+    """Reference greedy wrap that measures each joined candidate line."""
+    lines, current = [], []
+    for token in tokens:
+        candidate = " ".join([*current, token])
+        if measurer.measure(candidate, font_size)[0] <= max_width:
+            current.append(token)
+        else:
+            lines.append(" ".join(current))
+            current = [token]
+    lines.append(" ".join(current))
+    return lines
+
+
+def test_packed_text_token_bounds_wrap_like_full_measurement(test_font_family: str):
+    """Per-token width bounds give the same lines as measuring every candidate."""
+    words = (
+        "Wish you were here AVAWAY T. Y, V; rhythm fi ff iii 12.5% -3°C "
+        "momentary lapse of reason"
+    ).split()
+    tokens = words * 3
+    measurer = _TextMeasurer(test_font_family, None, "normal")
+
+    for font_size in (9, 17, 31):
+        for max_width in (233, 407, 610):
+            assert _wrap_tokens(
+                tokens, max_width, measurer, font_size
+            ) == _wrap_by_measuring_every_candidate(
+                tokens, max_width, measurer, font_size
+            )
+
+
+def test_packed_text_wrap_measures_few_joined_lines(test_font_family: str):
+    """Wrapping a long paragraph does not measure each growing candidate line."""
+    tokens = ("the quick brown fox jumps over the lazy dog " * 40).split()
+    measurer = _TextMeasurer(test_font_family, None, "normal")
+    measured = []
+    measure = measurer.measure
+
+    def counting_measure(text, size):
+        measured.append(text)
+        return measure(text, size)
+
+    measurer.measure = counting_measure
+    lines = _wrap_tokens(tokens, 300, measurer, 14)
+
+    joined = [text for text in measured if " " in text]
+    assert len(lines) > 10
+    assert len(joined) <= len(lines)
+
+
+def test_packed_text_layout_reused_across_paint_params(test_font_family: str):
+    """Color and alignment changes reuse the cached layout decision."""
+    params = {
+        "text": "Wish you were here",
+        "size": (137, 83),
+        "font": test_font_family,
+        "min_font_size": 8,
+        "max_font_size": 40,
+    }
+    packed_text(color=(255, 255, 255, 255), **params)
+    misses = _cached_layout.cache_info().misses
+
+    packed_text(color=(0, 128, 255, 255), align_horizontal="right", **params)
+    packed_text(align_vertical="bottom", premultiplied=True, **params)
+
+    assert _cached_layout.cache_info().misses == misses
+
+
+def test_packed_text_layout_node_feeds_packed_text(test_font_family: str):
+    """A packed_text_layout node paints the same image as a direct search."""
+    executor = _make_executor()
+    layout_params = {
+        "text": "Momentary lapse of Reason",
+        "size": (160, 120),
+        "font": test_font_family,
+        "min_font_size": 8,
+        "max_font_size": 48,
+    }
+    graph = {
+        "layout": Node(
+            op_name="gfx:packed_text_layout",
+            params=layout_params,
+            deps=[],
+        ),
+        "label": Node(
+            op_name="gfx:packed_text",
+            params={
+                **layout_params,
+                "color": (255, 0, 0, 255),
+                "layout": ref("layout"),
+            },
+            deps=["layout"],
+        ),
+    }
+
+    results = executor.execute(graph, ["layout", "label"])
+
+    layout = results["layout"]
+    assert set(layout) == {"font_size", "lines", "request"}
+    assert 8 <= layout["font_size"] <= 48
+    assert all(isinstance(line, str) for line in layout["lines"])
+
+    expected = packed_text(color=(255, 0, 0, 255), **layout_params)
+    assert results["label"].image.tobytes() == expected.image.tobytes()
+
+
+@pytest.mark.parametrize(
+    "layout",
+    [
+        {"font_size": 12, "lines": ["a"]},
+        {"font_size": 0, "lines": ["a"], "request": "0" * 64},
+        {"font_size": 12, "lines": [], "request": "0" * 64},
+        {"font_size": 12, "lines": ["a", 3], "request": "0" * 64},
+    ],
+)
+def test_packed_text_invalid_layout(test_font_family: str, layout):
+    """Test that malformed layout dicts raise ValueError."""
+    with pytest.raises(ValueError, match="layout"):
+        packed_text(text="a", size=(40, 40), font=test_font_family, layout=layout)
+
+
+def test_packed_text_rejects_layout_for_other_params(test_font_family: str):
+    """A layout computed for other text, size or sizing params is rejected."""
+    params = {"text": "Spare ribs", "size": (90, 60), "font": test_font_family}
+    layout = packed_text_layout(**params)
+
+    packed_text(layout=layout, **params)
+    for changed in ({"text": "Spare rib"}, {"size": (91, 60)}, {"line_gap": 2}):
+        with pytest.raises(ValueError, match="layout was computed for different"):
+            packed_text(layout=layout, **{**params, **changed})
+
+
+def test_packed_text_layout_cache_does_not_pin_font_blob(test_font_family: str):
+    """Cached layouts keep the font's hash, not the BlobArtifact bytes."""
+    info = FontRegistry().find_font(test_font_family)
+    blob = BlobArtifact(data=info.path.read_bytes(), content_type="font/ttf")
+    blob_ref = weakref.ref(blob)
+    params = {"text": "Blob font", "size": (80, 40)}
+    first = packed_text_layout(font=blob, **params)
+
+    del blob
+    gc.collect()
+
+    assert blob_ref() is None
+    copy = BlobArtifact(data=info.path.read_bytes(), content_type="font/ttf")
+    misses = _cached_layout.cache_info().misses
+    assert packed_text_layout(font=copy, **params) == first
+    assert _cached_layout.cache_info().misses == misses
+
+
+@pytest.mark.parametrize(
+    "changed",
+    [
+        {"weight": [700]},
+        {"weight": "bold"},
+        {"weight": 1000},
+        {"style": ["italic"]},
+        {"style": "oblique"},
+    ],
+)
+def test_packed_text_invalid_weight_or_style(test_font_family: str, changed):
+    """Mistyped or unhashable weight/style raise ValueError before caching."""
+    params = {"text": "a", "size": (40, 40), "font": test_font_family}
+    with pytest.raises(ValueError, match="weight|style"):
+        packed_text_layout(**params, **changed)
+    with pytest.raises(ValueError, match="weight|style"):
+        packed_text(**params, **changed)
@@ -0,0 +1,69 @@
+"""Tests for the size-aware memory store."""
+
+import pytest
+from PIL import Image
+
+from invariant_gfx.artifacts import BlobArtifact, ImageArtifact
+from invariant_gfx.store import artifact_nbytes, sized_memory_store
+
+
+def _image(size: int) -> ImageArtifact:
+    return ImageArtifact(Image.new("RGBA", (size, size), (255, 0, 0, 255)))
+
+
+class TestArtifactNbytes:
+    """Tests for artifact_nbytes."""
+
+    def test_uses_artifact_nbytes(self):
+        """Artifacts exposing nbytes are weighed by it."""
+        assert artifact_nbytes(_image(8)) == 8 * 8 * 4
+        assert artifact_nbytes(BlobArtifact(b"abc", "text/plain")) == 3
+
+    def test_falls_back_to_getsizeof(self):
+        """Other cacheable values still get a positive weight."""
+        assert artifact_nbytes(12345) > 0
+
+
+class TestSizedMemoryStore:
+    """Tests for sized_memory_store."""
+
+    def test_evicts_by_bytes(self):
+        """A large artifact evicts small ones once the byte budget is exceeded."""
+        store = sized_memory_store(max_bytes=64 * 64 * 4 + 3 * 16 * 16 * 4)
+        for i in range(3):
+            store.put("gfx:glyph", f"g{i}", _image(16))
+        store.put("gfx:canvas", "big", _image(64))
+
+        assert store.exists("gfx:canvas", "big")
+        assert sum(store.exists("gfx:glyph", f"g{i}") for i in range(3)) == 3
+
+        store.put("gfx:canvas", "big2", _image(32))
+
+        assert not store.exists("gfx:glyph", "g0")
+        assert store.exists("gfx:canvas", "big2")
+
+    def test_many_small_artifacts_fit(self):
+        """Entry count is not the bound: many glyphs fit where one canvas would."""
+        store = sized_memory_store(max_bytes=64 * 64 * 4)
+        for i in range(16):
+            store.put("gfx:glyph", f"g{i}", _image(16))
+
+        assert all(store.exists("gfx:glyph", f"g{i}") for i in range(16))
+
+    def test_oversized_artifact_not_cached(self):
+        """An artifact larger than the whole budget is skipped, not an error."""
+        store = sized_memory_store(max_bytes=100, cache="lfu")
+        store.put("gfx:canvas", "big", _image(64))
+
+        assert not store.exists("gfx:canvas", "big")
+
+    @pytest.mark.parametrize("max_bytes", [0, -1, 1.5, True])
+    def test_invalid_max_bytes(self, max_bytes):
+        """max_bytes must be a positive int."""
+        with pytest.raises(ValueError, match="max_bytes must be a positive int"):
+            sized_memory_store(max_bytes=max_bytes)
+
+    def test_invalid_cache(self):
+        """Unknown cache policy raises ValueError."""
+        with pytest.raises(ValueError, match="cache must be 'lru' or 'lfu'"):
+            sized_memory_store(max_bytes=100, cache="fifo")  # type: ignore[arg-type]